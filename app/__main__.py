@@ -1,6 +1,108 @@
+"""
+API Server Entry Point.
+
+``python -m app`` runs a single development server that reloads on code
+changes. ``python -m app --workers N`` runs the production server instead: N
+uvicorn worker processes share the listening socket and keep their in-process
+caches consistent through the invalidation bus (app.invalidation).
+
+Both first run the database migrations and load the sample data (see
+app.migrate) once, in this process, before any worker starts; the workers only
+check the schema revision. ``--no-migrate`` skips the step for deployments
+that run ``python -m app.migrate`` separately.
+
+Usage:
+    python -m app
+    python -m app --workers 4 [--keep-alive 5] [--backlog 2048]
+        [--host 0.0.0.0] [--port 8547] [--access-log] [--no-migrate]
+
+Author: AI Assistant
+"""
+
+import argparse
+import os
+import socket
+import sys
+
 import uvicorn
+from uvicorn.supervisors import Multiprocess
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app", host="0.0.0.0", port=8547, reload=True, reload_dirs=["app"]
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """
+    Bind the listening socket shared by the workers.
+
+    The socket is created with an explicit IPPROTO_TCP protocol: asyncio only
+    enables TCP_NODELAY on connections accepted from such sockets, and without
+    it every keep-alive response waits ~40 ms for a delayed ACK (the socket
+    uvicorn binds for its own multi-worker mode leaves the protocol at 0).
+
+    Args:
+        host: Interface to listen on
+        port: Port to listen on
+
+    Returns:
+        socket.socket: The bound, inheritable socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the restaurant booking API server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8547)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes; enables production mode (no reload)")
+    parser.add_argument("--keep-alive", type=int, default=5,
+                        help="Seconds an idle keep-alive connection stays open")
+    parser.add_argument("--backlog", type=int, default=2048,
+                        help="Pending connections the listening socket queues")
+    parser.add_argument("--access-log", action="store_true",
+                        help="Log every request (off in production mode)")
+    parser.add_argument("--no-migrate", action="store_true",
+                        help="Do not migrate the database before starting")
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if not args.no_migrate:
+        # Once, here, so workers never race on the schema
+        from app.database import get_engine
+        from app.migrate import migrate
+        migrate()
+        get_engine().dispose()
+
+    if args.workers is None:
+        uvicorn.run(
+            "app.main:app", host=args.host, port=args.port, reload=True, reload_dirs=["app"]
+        )
+        return 0
+
+    # Read by every worker's settings: turns on the invalidation bus
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        access_log=args.access_log,
     )
+    server = uvicorn.Server(config)
+    sock = bind_socket(args.host, args.port)
+    if args.workers == 1:
+        server.run(sockets=[sock])
+    else:
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Historical Booking and Slot Archive.
+
+Moves bookings and availability slots whose date is older than the retention
+window from the live tables into ``bookings_archive`` and
+``availability_slots_archive``, so the tables every request touches only hold
+recent and upcoming rows. Rows keep their ids, so references and list cursors
+stay valid, and booking lookups and lists fall back to the archive.
+
+Rows are moved per restaurant in bounded batches; each batch is one
+INSERT ... SELECT plus one DELETE in its own transaction, found through the
+(restaurant_id, date) prefix of the live indexes.
+
+Usage:
+    python -m app.archive [--booking-retention-days 90] [--slot-retention-days 30]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import dispose_engines, get_async_session_factory, get_engine
+from app.migrate import check_schema
+from app.models import ArchivedBooking, ArchivedSlot, AvailabilitySlot, Booking, Restaurant
+
+# Rows moved per transaction, so archiving never holds the write lock for long
+ARCHIVE_BATCH_SIZE = 5000
+
+
+async def _move_batches(
+    db: AsyncSession, live, archive, date_column, restaurant_id: int, before: date
+) -> int:
+    """Move a restaurant's rows dated before ``before`` from ``live`` to ``archive``."""
+    # Live and archive models share their columns through a mixin
+    names = [column.key for column in live.__table__.columns]
+    moved = 0
+    while True:
+        batch = (
+            select(live.id)
+            .where(live.restaurant_id == restaurant_id, date_column < before)
+            .limit(ARCHIVE_BATCH_SIZE)
+        )
+        ids = list(await db.scalars(batch))
+        if not ids:
+            return moved
+        await db.execute(
+            insert(archive).from_select(
+                names,
+                select(*[getattr(live, name) for name in names]).where(live.id.in_(ids))
+            )
+        )
+        await db.execute(
+            delete(live).where(live.id.in_(ids)).execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        moved += len(ids)
+        if len(ids) < ARCHIVE_BATCH_SIZE:
+            return moved
+        # Let request handlers run between batches
+        await asyncio.sleep(0)
+
+
+async def archive_past_bookings(db: AsyncSession, restaurant_id: int, before: date) -> int:
+    """
+    Move a restaurant's bookings with a visit before ``before`` to the archive.
+
+    By then every such booking is finished (completed, cancelled or a past
+    confirmed visit), so nothing changes them any more.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+        before: First visit date to keep live
+
+    Returns:
+        int: Number of bookings archived
+    """
+    return await _move_batches(
+        db, Booking, ArchivedBooking, Booking.visit_date, restaurant_id, before
+    )
+
+
+async def archive_past_slots(db: AsyncSession, restaurant_id: int, before: date) -> int:
+    """
+    Move a restaurant's availability slots dated before ``before`` to the archive.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+        before: First slot date to keep live
+
+    Returns:
+        int: Number of slots archived
+    """
+    return await _move_batches(
+        db, AvailabilitySlot, ArchivedSlot, AvailabilitySlot.date, restaurant_id, before
+    )
+
+
+def archive_cutoffs(
+    today: date, booking_retention_days: int, slot_retention_days: int
+) -> Tuple[date, date]:
+    """
+    First booking visit date and slot date to keep live.
+
+    Bookings are never archived while their slot is still live, so the slot
+    counters always match the live confirmed bookings.
+
+    Returns:
+        tuple: (bookings_before, slots_before)
+    """
+    slots_before = today - timedelta(days=slot_retention_days)
+    bookings_before = min(today - timedelta(days=booking_retention_days), slots_before)
+    return bookings_before, slots_before
+
+
+async def run_archive(
+    session_factory: async_sessionmaker,
+    today: Optional[date] = None,
+    booking_retention_days: Optional[int] = None,
+    slot_retention_days: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Archive old bookings and slots of every restaurant once.
+
+    Args:
+        session_factory: Factory for async sessions
+        today: Current date (default: today)
+        booking_retention_days: Override of settings.booking_retention_days
+        slot_retention_days: Override of settings.slot_retention_days
+
+    Returns:
+        dict: Bookings and slots archived
+    """
+    today = today or date.today()
+    if booking_retention_days is None:
+        booking_retention_days = settings.booking_retention_days
+    if slot_retention_days is None:
+        slot_retention_days = settings.slot_retention_days
+
+    bookings_before, slots_before = archive_cutoffs(
+        today, booking_retention_days, slot_retention_days
+    )
+
+    totals = {"bookings": 0, "slots": 0}
+    async with session_factory() as db:
+        restaurant_ids = list(await db.scalars(select(Restaurant.id)))
+        for restaurant_id in restaurant_ids:
+            totals["bookings"] += await archive_past_bookings(db, restaurant_id, bookings_before)
+            totals["slots"] += await archive_past_slots(db, restaurant_id, slots_before)
+    return totals
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--booking-retention-days", type=int, default=None)
+    parser.add_argument("--slot-retention-days", type=int, default=None)
+    args = parser.parse_args()
+
+    with get_engine().connect() as connection:
+        check_schema(connection)
+
+    async def archive() -> Dict[str, int]:
+        try:
+            return await run_archive(
+                get_async_session_factory(),
+                booking_retention_days=args.booking_retention_days,
+                slot_retention_days=args.slot_retention_days
+            )
+        finally:
+            await dispose_engines()
+
+    totals = asyncio.run(archive())
+    print(f"Archived {totals['bookings']} booking(s) and {totals['slots']} slot(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
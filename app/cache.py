@@ -0,0 +1,213 @@
+"""
+In-Process Availability Cache.
+
+This module provides a bounded LRU cache with a time-to-live for availability
+search results. Entries are keyed by (restaurant id, visit date, party size)
+and are invalidated per (restaurant id, visit date) whenever a booking
+mutation touches a slot on that date.
+
+A search that misses reads the date's generation before querying and passes
+it to ``set``; if an invalidation bumped the generation while the query was
+running, the result may predate the mutation and is not stored.
+
+Author: AI Assistant
+"""
+
+import threading
+import time as timer
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+CacheKey = Tuple[int, date, int]
+
+
+class AvailabilityCache:
+    """
+    Bounded LRU + TTL cache for availability search results.
+
+    Attributes:
+        enabled (bool): When False every lookup misses and nothing is stored,
+            which allows A/B benchmarking against the uncached path
+        max_entries (int): Maximum number of cached searches
+        ttl_seconds (float): Lifetime of a cached search in seconds
+        hits (int): Lookups served from the cache
+        misses (int): Lookups that found no fresh entry
+        evictions (int): Entries dropped because the cache was full or expired
+        invalidations (int): Entries dropped by booking mutations
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 30.0,
+        enabled: bool = True
+    ) -> None:
+        self.enabled = enabled
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        # Secondary index so a (restaurant, date) invalidation does not scan
+        self._keys_by_date: Dict[Tuple[int, date], Set[CacheKey]] = {}
+        # Generation of each invalidated (restaurant, date), drawn from one
+        # counter; dates never invalidated are at the generation of the last clear
+        self._counter = 0
+        self._generations: Dict[Tuple[int, date], int] = {}
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+
+    def get(self, restaurant_id: int, visit_date: date, party_size: int) -> Optional[Any]:
+        """
+        Look up a cached search result.
+
+        Args:
+            restaurant_id: The restaurant id
+            visit_date: The searched visit date
+            party_size: The searched party size
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        key = (restaurant_id, visit_date, party_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= timer.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def generation(self, restaurant_id: int, visit_date: date) -> int:
+        """
+        Get the invalidation generation of a restaurant's date.
+
+        Read it before running the query whose result will be passed to ``set``.
+
+        Args:
+            restaurant_id: The restaurant id
+            visit_date: The searched visit date
+
+        Returns:
+            int: A number that grows whenever the date is invalidated
+        """
+        with self._lock:
+            return self._generations.get((restaurant_id, visit_date), self._cleared_at)
+
+    def set(
+        self,
+        restaurant_id: int,
+        visit_date: date,
+        party_size: int,
+        value: Any,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Store a search result, evicting the least recently used entry if full.
+
+        Args:
+            restaurant_id: The restaurant id
+            visit_date: The searched visit date
+            party_size: The searched party size
+            value: The result to cache
+            generation: The date's ``generation()`` read before the query; the
+                result is dropped if the date was invalidated since
+        """
+        if not self.enabled or self.max_entries <= 0:
+            return
+
+        key = (restaurant_id, visit_date, party_size)
+        with self._lock:
+            current = self._generations.get((restaurant_id, visit_date), self._cleared_at)
+            if generation is not None and generation != current:
+                return
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (timer.monotonic() + self.ttl_seconds, value)
+            self._keys_by_date.setdefault((restaurant_id, visit_date), set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, restaurant_id: int, visit_date: date) -> None:
+        """
+        Drop every cached search for a restaurant on a given date.
+
+        Args:
+            restaurant_id: The restaurant id
+            visit_date: The date whose slots changed
+        """
+        with self._lock:
+            self._counter += 1
+            self._generations[(restaurant_id, visit_date)] = self._counter
+            keys = self._keys_by_date.pop((restaurant_id, visit_date), set())
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_date.clear()
+            # Every date moves to a new generation, so searches in flight
+            # cannot store what they read before the clear
+            self._counter += 1
+            self._cleared_at = self._counter
+            self._generations.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hit, miss, eviction and invalidation counts plus current size
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        """Remove a key from the entries and the date index (lock held)."""
+        self._entries.pop(key, None)
+        date_key = key[:2]
+        keys = self._keys_by_date.get(date_key)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_date[date_key]
+
+
+availability_cache = AvailabilityCache(
+    max_entries=settings.availability_cache_max_entries,
+    ttl_seconds=settings.availability_cache_ttl_seconds,
+    enabled=settings.availability_cache_enabled,
+)
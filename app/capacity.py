@@ -0,0 +1,346 @@
+"""
+Slot Capacity Accounting.
+
+Each availability slot carries its own capacity (``table_capacity`` parties and
+``covers_capacity`` seats) and maintained counters of what is booked
+(``booked_tables``, ``booked_covers``). Booking handlers change the counters
+with guarded UPDATE statements, so a slot can never be overbooked even under
+concurrent requests, and availability is read from the slot row instead of
+counting bookings.
+
+``available`` is now only the restaurant's open/closed switch for a slot;
+bookings no longer flip it.
+
+Run ``python -m app.capacity`` to check the counters against the bookings
+table, and ``python -m app.capacity --repair`` to recount drifted slots.
+
+Author: AI Assistant
+"""
+
+import sys
+from datetime import date, time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import ColumnElement, and_, func, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import AvailabilitySlot, Booking
+
+# Reasons a claim can fail, returned to callers so each endpoint keeps its
+# own error messages
+SLOT_MISSING = "missing"
+PARTY_TOO_LARGE = "party_size"
+SLOT_FULL = "full"
+INVALID_PARTY_SIZE = "invalid_party_size"
+
+# Smallest party a slot can be claimed for; a zero or negative party would
+# take a table for nobody or hand covers back to the slot
+MIN_PARTY_SIZE = 1
+
+
+def slot_has_room(slot: AvailabilitySlot, party_size: int) -> bool:
+    """
+    Check in Python whether a loaded slot can take one more party.
+
+    Args:
+        slot: The availability slot
+        party_size: Number of people in the party
+
+    Returns:
+        bool: True if the slot is open and has a free table and enough covers
+    """
+    return (
+        bool(slot.available)
+        and party_size <= slot.max_party_size
+        and slot.booked_tables < slot.table_capacity
+        and slot.booked_covers + party_size <= slot.covers_capacity
+    )
+
+
+def has_room_clause(party_size: int) -> ColumnElement[bool]:
+    """
+    SQL counterpart of ``slot_has_room`` for use in WHERE clauses and aggregates.
+
+    Args:
+        party_size: Number of people in the party
+
+    Returns:
+        ColumnElement: True for slots that can take one more party
+    """
+    return and_(
+        AvailabilitySlot.available.is_(True),
+        AvailabilitySlot.max_party_size >= party_size,
+        AvailabilitySlot.booked_tables < AvailabilitySlot.table_capacity,
+        AvailabilitySlot.booked_covers + party_size <= AvailabilitySlot.covers_capacity
+    )
+
+
+def _slot_where(restaurant_id: int, visit_date: date, visit_time: time):
+    return (
+        AvailabilitySlot.restaurant_id == restaurant_id,
+        AvailabilitySlot.date == visit_date,
+        AvailabilitySlot.time == visit_time,
+    )
+
+
+async def _failure_reason(
+    db: AsyncSession, restaurant_id: int, visit_date: date, visit_time: time, party_size: int
+) -> str:
+    """Explain why a guarded slot UPDATE matched no row."""
+    max_party_size = await db.scalar(
+        select(AvailabilitySlot.max_party_size).where(
+            *_slot_where(restaurant_id, visit_date, visit_time)
+        )
+    )
+    if max_party_size is None:
+        return SLOT_MISSING
+    if party_size > max_party_size:
+        return PARTY_TOO_LARGE
+    return SLOT_FULL
+
+
+async def claim_slot(
+    db: AsyncSession,
+    restaurant_id: int,
+    visit_date: date,
+    visit_time: time,
+    party_size: int
+) -> Optional[str]:
+    """
+    Take one table and ``party_size`` covers from a slot, if it has room.
+
+    The check and the increment are one conditional UPDATE, so two concurrent
+    requests cannot both take the last table.
+
+    Args:
+        db: Async database session (the claim joins its transaction)
+        restaurant_id: The restaurant id
+        visit_date: Slot date
+        visit_time: Slot time
+        party_size: Number of people in the party
+
+    Returns:
+        str or None: None on success, otherwise INVALID_PARTY_SIZE,
+        SLOT_MISSING, PARTY_TOO_LARGE or SLOT_FULL
+    """
+    if party_size < MIN_PARTY_SIZE:
+        return INVALID_PARTY_SIZE
+    claim = await db.execute(
+        update(AvailabilitySlot)
+        .where(
+            *_slot_where(restaurant_id, visit_date, visit_time),
+            has_room_clause(party_size)
+        )
+        .values(
+            booked_tables=AvailabilitySlot.booked_tables + 1,
+            booked_covers=AvailabilitySlot.booked_covers + party_size
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if claim.rowcount == 1:
+        return None
+    return await _failure_reason(db, restaurant_id, visit_date, visit_time, party_size)
+
+
+async def release_slot(
+    db: AsyncSession,
+    restaurant_id: int,
+    visit_date: date,
+    visit_time: time,
+    party_size: int
+) -> None:
+    """
+    Give back the table and covers a confirmed booking held on a slot.
+
+    Args:
+        db: Async database session (the release joins its transaction)
+        restaurant_id: The restaurant id
+        visit_date: Slot date
+        visit_time: Slot time
+        party_size: Party size of the booking being released
+    """
+    await db.execute(
+        update(AvailabilitySlot)
+        .where(*_slot_where(restaurant_id, visit_date, visit_time))
+        .values(
+            booked_tables=func.max(AvailabilitySlot.booked_tables - 1, 0),
+            booked_covers=func.max(AvailabilitySlot.booked_covers - party_size, 0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def resize_claim(
+    db: AsyncSession,
+    restaurant_id: int,
+    visit_date: date,
+    visit_time: time,
+    old_party_size: int,
+    new_party_size: int
+) -> Optional[str]:
+    """
+    Adjust the covers a booking holds on its slot after a party size change.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+        visit_date: Slot date
+        visit_time: Slot time
+        old_party_size: Party size currently counted on the slot
+        new_party_size: Requested party size
+
+    Returns:
+        str or None: None on success, otherwise INVALID_PARTY_SIZE,
+        PARTY_TOO_LARGE or SLOT_FULL (SLOT_MISSING if the slot no longer exists)
+    """
+    if new_party_size < MIN_PARTY_SIZE:
+        return INVALID_PARTY_SIZE
+    delta = new_party_size - old_party_size
+    conditions = list(_slot_where(restaurant_id, visit_date, visit_time))
+    if delta > 0:
+        conditions += [
+            AvailabilitySlot.max_party_size >= new_party_size,
+            AvailabilitySlot.booked_covers + delta <= AvailabilitySlot.covers_capacity,
+        ]
+    resized = await db.execute(
+        update(AvailabilitySlot)
+        .where(*conditions)
+        .values(booked_covers=func.max(AvailabilitySlot.booked_covers + delta, 0))
+        .execution_options(synchronize_session=False)
+    )
+    if resized.rowcount == 1:
+        return None
+    return await _failure_reason(db, restaurant_id, visit_date, visit_time, new_party_size)
+
+
+def _confirmed_totals():
+    """Subquery of confirmed booking count and covers per (restaurant, date, time)."""
+    return (
+        select(
+            Booking.restaurant_id,
+            Booking.visit_date,
+            Booking.visit_time,
+            func.count(Booking.id).label("tables"),
+            func.sum(Booking.party_size).label("covers"),
+        )
+        .where(Booking.status == "confirmed")
+        .group_by(Booking.restaurant_id, Booking.visit_date, Booking.visit_time)
+        .subquery()
+    )
+
+
+def find_counter_drift(connection: Connection) -> List[Dict[str, Any]]:
+    """
+    List slots whose booked counters disagree with their confirmed bookings.
+
+    One pass over availability_slots joined to a single grouped scan of the
+    bookings index, so it is cheap enough to run on a live database.
+
+    Args:
+        connection: A sync connection
+
+    Returns:
+        list: One dict per drifted slot with the stored and actual counters
+    """
+    totals = _confirmed_totals()
+    actual_tables = func.coalesce(totals.c.tables, 0)
+    actual_covers = func.coalesce(totals.c.covers, 0)
+    rows = connection.execute(
+        select(
+            AvailabilitySlot.id,
+            AvailabilitySlot.restaurant_id,
+            AvailabilitySlot.date,
+            AvailabilitySlot.time,
+            AvailabilitySlot.booked_tables,
+            actual_tables.label("actual_tables"),
+            AvailabilitySlot.booked_covers,
+            actual_covers.label("actual_covers"),
+        )
+        .outerjoin(totals, and_(
+            totals.c.restaurant_id == AvailabilitySlot.restaurant_id,
+            totals.c.visit_date == AvailabilitySlot.date,
+            totals.c.visit_time == AvailabilitySlot.time,
+        ))
+        .where(or_(
+            AvailabilitySlot.booked_tables != actual_tables,
+            AvailabilitySlot.booked_covers != actual_covers,
+        ))
+        .order_by(AvailabilitySlot.restaurant_id, AvailabilitySlot.date, AvailabilitySlot.time)
+    )
+    return [row._asdict() for row in rows]
+
+
+def recount_slot_counters(
+    connection: Connection, slot_ids: Optional[Iterable[int]] = None
+) -> int:
+    """
+    Recompute booked_tables/booked_covers from confirmed bookings.
+
+    The recount is a single UPDATE, so it is atomic with respect to concurrent
+    booking writes.
+
+    Args:
+        connection: A sync connection inside a transaction
+        slot_ids: Only recount these slots (default: every slot)
+
+    Returns:
+        int: Number of slot rows updated
+    """
+    confirmed_on_slot = (
+        Booking.restaurant_id == AvailabilitySlot.restaurant_id,
+        Booking.visit_date == AvailabilitySlot.date,
+        Booking.visit_time == AvailabilitySlot.time,
+        Booking.status == "confirmed",
+    )
+    statement = update(AvailabilitySlot).values(
+        booked_tables=(
+            select(func.count(Booking.id)).where(*confirmed_on_slot).scalar_subquery()
+        ),
+        booked_covers=(
+            select(func.coalesce(func.sum(Booking.party_size), 0))
+            .where(*confirmed_on_slot)
+            .scalar_subquery()
+        ),
+    )
+    if slot_ids is not None:
+        statement = statement.where(AvailabilitySlot.id.in_(list(slot_ids)))
+    return connection.execute(statement).rowcount
+
+
+def main() -> int:
+    """Check the slot counters and optionally repair drift (``python -m app.capacity``)."""
+    import argparse
+
+    from app.database import get_engine
+
+    parser = argparse.ArgumentParser(
+        description="Check availability slot counters against confirmed bookings."
+    )
+    parser.add_argument(
+        "--repair", action="store_true", help="Recount the drifted slots"
+    )
+    args = parser.parse_args()
+
+    with get_engine().begin() as connection:
+        drift = find_counter_drift(connection)
+        for slot in drift:
+            print(
+                f"slot {slot['id']} (restaurant {slot['restaurant_id']}, "
+                f"{slot['date']} {slot['time']}): "
+                f"tables {slot['booked_tables']} != {slot['actual_tables']}, "
+                f"covers {slot['booked_covers']} != {slot['actual_covers']}"
+            )
+        if not drift:
+            print("Slot counters are consistent")
+            return 0
+        if not args.repair:
+            print(f"{len(drift)} slot(s) drifted; run with --repair to fix them")
+            return 1
+        repaired = recount_slot_counters(connection, [slot["id"] for slot in drift])
+        print(f"Repaired {repaired} slot(s)")
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Application Configuration.
+
+This module collects runtime settings for the restaurant booking mock API.
+Every setting can be overridden with an environment variable so the same code
+can run in development, benchmarks and production.
+
+Author: AI Assistant
+"""
+
+import os
+from dataclasses import dataclass, fields
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """
+    Read a boolean flag from the environment.
+
+    Args:
+        name: Environment variable name
+        default: Value used when the variable is unset
+
+    Returns:
+        bool: True for "1", "true", "yes" or "on" (case-insensitive)
+    """
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class Settings:
+    """
+    Runtime settings for the API.
+
+    Attributes:
+        database_url (str): SQLAlchemy URL of the sync engine (DATABASE_URL)
+        sqlite_profile (str): SQLite tuning profile, "production" or "baseline"
+            (SQLITE_PROFILE)
+        sqlite_busy_timeout_ms (int): How long a connection waits for a lock
+            before failing with "database is locked" (SQLITE_BUSY_TIMEOUT_MS)
+        db_pool_size (int): Pooled connections kept open per engine (DB_POOL_SIZE)
+        db_max_overflow (int): Extra connections allowed under bursts (DB_MAX_OVERFLOW)
+        db_pool_timeout_seconds (float): How long to wait for a pooled connection
+            (DB_POOL_TIMEOUT_SECONDS)
+        availability_cache_enabled (bool): Serve repeated availability searches
+            from the in-process cache (AVAILABILITY_CACHE)
+        availability_cache_max_entries (int): Maximum cached searches before the
+            least recently used entry is evicted (AVAILABILITY_CACHE_MAX_ENTRIES)
+        availability_cache_ttl_seconds (float): Lifetime of a cached search
+            (AVAILABILITY_CACHE_TTL_SECONDS)
+        reference_block_size (int): Booking reference sequence numbers each
+            worker reserves per database round trip (REFERENCE_BLOCK_SIZE)
+        booking_reference_secret (str): Key of the permutation that turns
+            sequence numbers into booking references; must be set, and kept,
+            in production (BOOKING_REFERENCE_SECRET)
+        metrics_enabled (bool): Record per-route request and SQL metrics for
+            GET /metrics (METRICS)
+        server_timing_enabled (bool): Add a Server-Timing header with total
+            and database time to every response (SERVER_TIMING)
+        slot_horizon_enabled (bool): Run the background job that extends and
+            prunes availability slots (SLOT_HORIZON)
+        slot_horizon_days (int): Days ahead that slots are kept generated
+            (SLOT_HORIZON_DAYS)
+        slot_retention_days (int): Days past slots stay in the live table
+            before being archived (SLOT_RETENTION_DAYS)
+        booking_retention_days (int): Days past bookings stay in the live
+            table before being archived (BOOKING_RETENTION_DAYS)
+        slot_horizon_interval_seconds (float): Time between job runs
+            (SLOT_HORIZON_INTERVAL_SECONDS)
+        slot_horizon_batch_days (int): Days of slots written per transaction,
+            bounding how long the job holds the write lock
+            (SLOT_HORIZON_BATCH_DAYS)
+        slot_template_times (str): Comma-separated HH:MM times used for
+            restaurants without opening-hours templates (SLOT_TEMPLATE_TIMES)
+        workers (int): API worker processes serving the database
+            (WEB_CONCURRENCY, set by ``python -m app --workers``)
+        invalidation_bus_enabled (bool): Broadcast cache invalidations to the
+            other workers through the change log; on by default with more than
+            one worker (INVALIDATION_BUS)
+        invalidation_poll_seconds (float): How often each worker polls the
+            change log (INVALIDATION_POLL_SECONDS)
+        invalidation_retention_seconds (float): Age after which change-log
+            rows are deleted (INVALIDATION_RETENTION_SECONDS)
+        fast_json_enabled (bool): Encode listing and search responses with
+            orjson, skipping FastAPI's jsonable_encoder (FAST_JSON)
+        idempotency_enabled (bool): Honour ``Idempotency-Key`` headers on
+            booking creation and cancellation (IDEMPOTENCY)
+        idempotency_ttl_seconds (float): How long a key's stored response is
+            replayed (IDEMPOTENCY_TTL_SECONDS)
+        idempotency_wait_seconds (float): How long a duplicate request waits
+            for the one in flight before answering 409 (IDEMPOTENCY_WAIT_SECONDS)
+        write_queue_enabled (bool): Apply booking writes in group-committed
+            batches from one writer task (WRITE_QUEUE)
+        write_queue_batch_size (int): Most writes committed together
+            (WRITE_QUEUE_BATCH_SIZE)
+        write_queue_max_linger_ms (float): How long the writer waits for more
+            writes to fill a batch (WRITE_QUEUE_MAX_LINGER_MS)
+    """
+
+    database_url: str = "sqlite:///./restaurant_booking.db"
+    sqlite_profile: str = "production"
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    availability_cache_enabled: bool = True
+    availability_cache_max_entries: int = 1024
+    availability_cache_ttl_seconds: float = 30.0
+    reference_block_size: int = 1000
+    booking_reference_secret: str = ""
+    metrics_enabled: bool = True
+    server_timing_enabled: bool = False
+    slot_horizon_enabled: bool = True
+    slot_horizon_days: int = 30
+    slot_retention_days: int = 30
+    booking_retention_days: int = 90
+    slot_horizon_interval_seconds: float = 86400.0
+    slot_horizon_batch_days: int = 7
+    slot_template_times: str = "12:00,12:30,13:00,13:30,19:00,19:30,20:00,20:30"
+    workers: int = 1
+    invalidation_bus_enabled: bool = False
+    invalidation_poll_seconds: float = 0.2
+    invalidation_retention_seconds: float = 300.0
+    fast_json_enabled: bool = False
+    idempotency_enabled: bool = True
+    idempotency_ttl_seconds: float = 86400.0
+    idempotency_wait_seconds: float = 30.0
+    write_queue_enabled: bool = False
+    write_queue_batch_size: int = 32
+    write_queue_max_linger_ms: float = 0.0
+
+    def __post_init__(self) -> None:
+        """
+        Reject values the background jobs cannot run with.
+
+        Raises:
+            ValueError: If slot_horizon_batch_days is less than 1
+        """
+        if self.slot_horizon_batch_days < 1:
+            raise ValueError(
+                f"SLOT_HORIZON_BATCH_DAYS must be at least 1, got {self.slot_horizon_batch_days}"
+            )
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Build settings from environment variables, falling back to defaults.
+
+        Returns:
+            Settings: The resolved settings
+        """
+        workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+        return cls(
+            database_url=os.getenv("DATABASE_URL", cls.database_url),
+            sqlite_profile=os.getenv("SQLITE_PROFILE", cls.sqlite_profile),
+            sqlite_busy_timeout_ms=int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            db_pool_timeout_seconds=float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")),
+            availability_cache_enabled=_env_flag("AVAILABILITY_CACHE", True),
+            availability_cache_max_entries=int(
+                os.getenv("AVAILABILITY_CACHE_MAX_ENTRIES", "1024")
+            ),
+            availability_cache_ttl_seconds=float(
+                os.getenv("AVAILABILITY_CACHE_TTL_SECONDS", "30")
+            ),
+            reference_block_size=int(os.getenv("REFERENCE_BLOCK_SIZE", "1000")),
+            booking_reference_secret=os.getenv("BOOKING_REFERENCE_SECRET", ""),
+            metrics_enabled=_env_flag("METRICS", True),
+            server_timing_enabled=_env_flag("SERVER_TIMING", False),
+            slot_horizon_enabled=_env_flag("SLOT_HORIZON", True),
+            slot_horizon_days=int(os.getenv("SLOT_HORIZON_DAYS", "30")),
+            slot_retention_days=int(os.getenv("SLOT_RETENTION_DAYS", "30")),
+            booking_retention_days=int(os.getenv("BOOKING_RETENTION_DAYS", "90")),
+            slot_horizon_interval_seconds=float(
+                os.getenv("SLOT_HORIZON_INTERVAL_SECONDS", "86400")
+            ),
+            slot_horizon_batch_days=int(os.getenv("SLOT_HORIZON_BATCH_DAYS", "7")),
+            slot_template_times=os.getenv("SLOT_TEMPLATE_TIMES", cls.slot_template_times),
+            workers=workers,
+            invalidation_bus_enabled=_env_flag("INVALIDATION_BUS", workers > 1),
+            invalidation_poll_seconds=float(os.getenv("INVALIDATION_POLL_SECONDS", "0.2")),
+            invalidation_retention_seconds=float(
+                os.getenv("INVALIDATION_RETENTION_SECONDS", "300")
+            ),
+            fast_json_enabled=_env_flag("FAST_JSON", False),
+            idempotency_enabled=_env_flag("IDEMPOTENCY", True),
+            idempotency_ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+            idempotency_wait_seconds=float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30")),
+            write_queue_enabled=_env_flag("WRITE_QUEUE", False),
+            write_queue_batch_size=int(os.getenv("WRITE_QUEUE_BATCH_SIZE", "32")),
+            write_queue_max_linger_ms=float(os.getenv("WRITE_QUEUE_MAX_LINGER_MS", "0")),
+        )
+
+
+settings = Settings.from_env()
+
+
+def configure(new_settings: Settings) -> None:
+    """
+    Replace the process-wide settings.
+
+    Modules hold on to ``settings`` by name, so its fields are updated in
+    place rather than the object rebound.
+
+    Args:
+        new_settings: The settings to apply
+    """
+    for field in fields(Settings):
+        setattr(settings, field.name, getattr(new_settings, field.name))
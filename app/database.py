@@ -2,28 +2,228 @@
 Database Configuration and Session Management.
 
 This module sets up the SQLite database connection, session management,
-and declarative base for the restaurant booking mock API.
+and declarative base for the restaurant booking mock API. Request handlers use
+the async engine and sessions (aiosqlite driver) so database calls do not block
+the event loop; the sync engine is kept for scripts and data initialization.
+
+The shared engines and session factories are built on first use from the
+current settings, not at import, so ``reset_engines()`` can point them at
+another database (e.g. an in-memory one per test, see ``app.main.create_app``).
+
+Both engines are built from a named SQLite tuning profile (SQLITE_PROFILE).
+The "production" profile switches to WAL journaling with tuned pragmas and a
+sized connection pool; "baseline" keeps the driver defaults.
 
 Author: AI Assistant
 """
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Dict, Generator
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+)
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 
-# SQLite database URL - creates file in project root
-SQLALCHEMY_DATABASE_URL = "sqlite:///./restaurant_booking.db"
+from app.config import settings
+
+# Named SQLite tuning profiles. "pragmas" are applied to every new DBAPI
+# connection; "pooled" enables the sized connection pool from settings.
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "baseline": {
+        "pragmas": {},
+        "pooled": False,
+    },
+    "production": {
+        "pragmas": {
+            # Readers no longer block on the writer and vice versa
+            "journal_mode": "WAL",
+            # Durable at checkpoints; no fsync on every commit in WAL mode
+            "synchronous": "NORMAL",
+            # Negative values are KiB: 64 MiB page cache per connection
+            "cache_size": -64000,
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "MEMORY",
+        },
+        "pooled": True,
+    },
+}
+
+
+def _is_memory_database(url: str) -> bool:
+    """Return True for SQLite URLs that point at an in-memory database."""
+    database = make_url(url).database
+    return not database or database == ":memory:"
+
+
+def apply_sqlite_pragmas(engine: Engine, profile: str) -> None:
+    """
+    Apply a profile's PRAGMAs to every new connection of an engine.
+
+    The busy timeout is always set so that writers wait for the lock instead
+    of failing immediately with "database is locked".
+
+    Args:
+        engine: The sync engine (use ``AsyncEngine.sync_engine`` for async engines)
+        profile: Name of an entry in SQLITE_PROFILES
+    """
+    if engine.dialect.name != "sqlite":
+        return
+
+    pragmas = dict(SQLITE_PROFILES[profile]["pragmas"])
+    pragmas["busy_timeout"] = settings.sqlite_busy_timeout_ms
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def _pool_options(url: str, profile: str, poolclass: type) -> Dict[str, Any]:
+    """Build pool keyword arguments for a profile (in-memory databases keep theirs)."""
+    if not SQLITE_PROFILES[profile]["pooled"] or _is_memory_database(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+
+
+def build_engine(url: str, profile: str = "baseline") -> Engine:
+    """
+    Create a sync engine tuned with the given SQLite profile.
+
+    Args:
+        url: SQLAlchemy database URL
+        profile: Name of an entry in SQLITE_PROFILES
+
+    Returns:
+        Engine: The configured engine
+    """
+    sync_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # Required for SQLite threading
+        **_pool_options(url, profile, QueuePool)
+    )
+    apply_sqlite_pragmas(sync_engine, profile)
+    return sync_engine
+
+
+def build_async_engine(
+    url: str, profile: str = "baseline", pooled: bool = True
+) -> AsyncEngine:
+    """
+    Create an async (aiosqlite) engine tuned with the given SQLite profile.
+
+    Args:
+        url: SQLAlchemy database URL using the sync ``sqlite://`` scheme
+        profile: Name of an entry in SQLITE_PROFILES
+        pooled: False to open a new connection per checkout and close it on
+            return (NullPool), so the engine holds nothing open between uses
+
+    Returns:
+        AsyncEngine: The configured async engine
+    """
+    async_url = url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    if pooled:
+        pool_options = _pool_options(url, profile, AsyncAdaptedQueuePool)
+    else:
+        pool_options = {"poolclass": NullPool}
+    new_engine = create_async_engine(async_url, **pool_options)
+    apply_sqlite_pragmas(new_engine.sync_engine, profile)
+    return new_engine
+
+
+# Shared engines and session factories, built on first use
+_shared: Dict[str, Any] = {}
+
+
+def get_engine() -> Engine:
+    """
+    Get the shared sync engine, creating it from the settings on first use.
+
+    The database URL (DATABASE_URL) defaults to a file in the project root.
+
+    Returns:
+        Engine: The sync engine
+    """
+    if "engine" not in _shared:
+        _shared["engine"] = build_engine(settings.database_url, settings.sqlite_profile)
+    return _shared["engine"]
 
-# Create SQLAlchemy engine with SQLite-specific configuration
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Required for SQLite threading
-)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_session_factory() -> sessionmaker:
+    """Get the factory of sync sessions bound to the shared sync engine."""
+    if "sessions" not in _shared:
+        _shared["sessions"] = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _shared["sessions"]
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the shared async engine used by the API routers, creating it on first use.
+
+    Returns:
+        AsyncEngine: The async engine
+    """
+    if "async_engine" not in _shared:
+        _shared["async_engine"] = build_async_engine(
+            settings.database_url, settings.sqlite_profile
+        )
+    return _shared["async_engine"]
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    Get the factory of async sessions bound to the shared async engine.
+
+    Objects stay loaded after commit so handlers can serialize them without
+    another query.
+    """
+    if "async_sessions" not in _shared:
+        _shared["async_sessions"] = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _shared["async_sessions"]
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the shared engines that were built."""
+    if "async_engine" in _shared:
+        await _shared["async_engine"].dispose()
+    if "engine" in _shared:
+        _shared["engine"].dispose()
+
+
+def reset_engines() -> None:
+    """
+    Forget the shared engines so the next use builds them from the current
+    settings. Call ``dispose_engines()`` first to close their connections.
+    """
+    _shared.clear()
+
+
+# Module attributes kept for scripts (``from app.database import engine``);
+# each resolves to the shared object at the time it is imported
+_LEGACY_NAMES: Dict[str, Callable[[], Any]] = {
+    "engine": get_engine,
+    "SessionLocal": get_session_factory,
+    "async_engine": get_async_engine,
+    "AsyncSessionLocal": get_async_session_factory,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LEGACY_NAMES:
+        return _LEGACY_NAMES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Create declarative base for all models
 Base = declarative_base()
@@ -48,8 +248,30 @@ def get_db() -> Generator[Session, None, None]:
             pass
         ```
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for FastAPI.
+
+    Creates a new async database session for each request and ensures
+    it's properly closed after the request completes.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+
+    Example:
+        Use as a FastAPI dependency:
+        ```python
+        @app.get("/example")
+        async def example_endpoint(db: AsyncSession = Depends(get_async_db)):
+            result = await db.execute(select(Restaurant))
+        ```
+    """
+    async with get_async_session_factory()() as db:
+        yield db
@@ -0,0 +1,152 @@
+"""
+HTTP Caching for Read Endpoints.
+
+Clients that poll (the owner dashboard above all) revalidate with
+``If-None-Match`` and get an empty 304 when nothing changed. Each route
+checks its validator with the cheapest query that can answer it, before any
+ORM object is loaded or any JSON is built:
+
+- a booking's ETag comes from its id and ``updated_at``;
+- the owner list's ETag comes from the restaurant's ``booking_versions`` row,
+  which every booking change bumps in its own transaction;
+- cancellation reasons never change at runtime, so they are served from an
+  in-memory snapshot of the pre-serialized JSON with a long max-age.
+
+Author: AI Assistant
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BookingVersion, CancellationReason
+
+# Bookings hold customer details: only the client may cache them, and it must
+# revalidate before every reuse
+PRIVATE_REVALIDATE = "private, no-cache"
+# Reference data that only changes with a deployment
+PUBLIC_LONG_LIVED = "public, max-age=86400"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against the current ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix added by a proxy still matches.
+
+    Args:
+        if_none_match: The header value, or None if absent
+        etag: The current strong ETag, quoted
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (value.strip() for value in if_none_match.split(","))
+    return etag in (value[2:] if value.startswith("W/") else value for value in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 response carrying the validator and cache policy."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def booking_etag(booking_id: int, updated_at: Optional[datetime]) -> str:
+    """
+    Strong ETag of one booking.
+
+    Every change to a booking bumps ``updated_at`` and customers are never
+    modified after creation, so id and ``updated_at`` identify the response.
+    """
+    stamp = updated_at.strftime("%Y%m%d%H%M%S%f") if updated_at else "0"
+    return f'"b{booking_id}.{stamp}"'
+
+
+def booking_list_etag(restaurant_id: int, version: int) -> str:
+    """Strong ETag of a restaurant's owner booking list at a booking version."""
+    return f'"l{restaurant_id}.{version}"'
+
+
+async def booking_version(db: AsyncSession, restaurant_id: int) -> int:
+    """
+    Read a restaurant's booking version (0 before its first change).
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+
+    Returns:
+        int: The current version
+    """
+    version = await db.scalar(
+        select(BookingVersion.version).where(BookingVersion.restaurant_id == restaurant_id)
+    )
+    return version or 0
+
+
+async def bump_booking_version(db: AsyncSession, restaurant_id: int) -> None:
+    """
+    Mark a restaurant's bookings as changed.
+
+    Call in the transaction that changes the bookings, before ``commit()``,
+    so the new version becomes visible exactly with the change.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+    """
+    upsert = insert(BookingVersion).values(restaurant_id=restaurant_id, version=1)
+    await db.execute(upsert.on_conflict_do_update(
+        index_elements=[BookingVersion.restaurant_id],
+        set_={"version": BookingVersion.version + 1}
+    ))
+
+
+class CancellationReasonSnapshot:
+    """
+    Pre-serialized cancellation reasons shared by all requests in the process.
+
+    Attributes:
+        body (bytes): The JSON response body, or None before loading
+        etag (str): Strong ETag derived from the body
+    """
+
+    def __init__(self) -> None:
+        self.body: Optional[bytes] = None
+        self.etag: Optional[str] = None
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        Read the reasons once and keep the serialized response.
+
+        Args:
+            db: Async database session
+        """
+        reasons = (
+            await db.scalars(select(CancellationReason).order_by(CancellationReason.id))
+        ).all()
+        rows: List[dict] = [
+            {"id": r.id, "reason": r.reason, "description": r.description} for r in reasons
+        ]
+        # Same encoding as FastAPI's JSONResponse
+        body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"r{hashlib.sha256(body).hexdigest()[:16]}"'
+        self.body = body
+
+    def clear(self) -> None:
+        """Forget the snapshot; the next request reloads it."""
+        self.body = self.etag = None
+
+
+# Shared snapshot used by the booking router
+cancellation_reasons = CancellationReasonSnapshot()
@@ -0,0 +1,436 @@
+"""
+Idempotency Keys for Booking Writes.
+
+Channel partners retry booking creation and cancellation when a request times
+out. A request sent with an ``Idempotency-Key`` header runs at most once per
+key; the outcome is stored in the ``idempotency_keys`` table and replayed:
+
+- The first request with a key inserts the key's row, runs, and stores its
+  response in the row.
+- A retry with the same key and the same request (method, path, credentials
+  and fields) gets the stored response, marked ``Idempotent-Replayed: true``.
+  Form bodies are compared by their parsed fields, so a retry whose client
+  picked a new multipart boundary or reordered the fields is the same request.
+  It is answered before routing, so it reads no restaurant, slot or customer.
+- A duplicate arriving while the first request still runs waits for it: on
+  an asyncio future in the same worker, by polling the row across workers.
+  After IDEMPOTENCY_WAIT_SECONDS it gets 409.
+- Reusing a key for a different request gets 422.
+
+Only final outcomes are stored: successes and the 400/404 answers of the
+booking rules. Other responses (authentication, validation, conflicts and
+server errors) release the key so the client can retry. Rows expire after
+IDEMPOTENCY_TTL_SECONDS; each worker deletes expired rows at most once a
+minute.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time as timer
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+
+from app.models import IdempotencyKey
+
+# The endpoints that honour the header (POST only)
+IDEMPOTENT_PATHS = re.compile(
+    r"^/api/ConsumerApi/v1/Restaurant/[^/]+/(?:BookingWithStripeToken|Booking/[^/]+/Cancel)$"
+)
+KEY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+MAX_KEY_LENGTH = 255
+
+# Error answers of the booking rules, final like a success
+STORED_ERROR_STATUSES = {400, 404}
+
+# Bodies fingerprinted by their parsed fields rather than their bytes
+FORM_MEDIA_TYPES = {"application/x-www-form-urlencoded", "multipart/form-data"}
+
+# How often a duplicate checks a key held by another worker
+POLL_SECONDS = 0.05
+# A key in flight this many wait periods is abandoned (its worker died)
+ABANDONED_AFTER_WAITS = 2
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+class StoredResponse(NamedTuple):
+    """A response as stored for a key."""
+
+    status_code: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyError(Exception):
+    """A keyed request that cannot run or be replayed."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def is_final(status_code: int) -> bool:
+    """Return True for responses that are stored and replayed."""
+    return 200 <= status_code < 300 or status_code in STORED_ERROR_STATUSES
+
+
+async def form_fields(scope, body: bytes) -> Optional[List[Tuple[str, bytes]]]:
+    """
+    Parse a form body into sorted (name, value) pairs.
+
+    Returns:
+        list: The fields, uploaded files by their content, or None if the
+            body does not parse as the form its content type announces
+    """
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if body_sent:
+            return {"type": "http.disconnect"}
+        body_sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    try:
+        async with Request(scope, receive).form() as form:
+            fields = []
+            for name, value in form.multi_items():
+                if isinstance(value, UploadFile):
+                    fields.append((name, await value.read()))
+                else:
+                    fields.append((name, value.encode()))
+    except Exception:
+        return None
+    return sorted(fields)
+
+
+async def request_hash(scope, body: bytes) -> str:
+    """
+    Fingerprint what a key may only be used for.
+
+    Form bodies are hashed as their sorted fields with the bare media type,
+    since the multipart boundary in the body and the Content-Type header is
+    chosen afresh by the client on every attempt. Other bodies are hashed
+    as they are.
+
+    Args:
+        scope: The ASGI HTTP scope
+        body: The complete request body
+
+    Returns:
+        str: SHA-256 hex digest of method, path, query, credentials and body
+    """
+    headers = dict(scope["headers"])
+    content_type = headers.get(b"content-type", b"")
+    media_type = content_type.split(b";", 1)[0].strip().lower()
+    fields = None
+    if media_type.decode("latin-1") in FORM_MEDIA_TYPES:
+        fields = await form_fields(scope, body)
+    if fields is None:
+        payload = [content_type, body]
+    else:
+        payload = [media_type]
+        for name, value in fields:
+            payload += [name.encode(), value]
+    digest = hashlib.sha256()
+    for part in [
+        scope["method"].encode(),
+        scope["path"].encode(),
+        scope["query_string"],
+        headers.get(b"authorization", b""),
+        *payload,
+    ]:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+async def read_body(receive) -> bytes:
+    """Read the complete request body from an ASGI receive channel."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def send_response(send, stored: StoredResponse) -> None:
+    await send({
+        "type": "http.response.start", "status": stored.status_code, "headers": stored.headers
+    })
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+def error_response(error: IdempotencyError) -> StoredResponse:
+    """Build a JSON error response shaped like FastAPI's HTTPException answers."""
+    body = json.dumps({"detail": error.detail}).encode()
+    return StoredResponse(error.status_code, [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ], body)
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI middleware running keyed booking writes at most once per key.
+
+    Args:
+        app: The wrapped ASGI application
+        session_factory: Factory of async sessions for the key table
+        ttl_seconds: How long a stored response is replayed
+        wait_seconds: How long a duplicate waits for the request in flight
+            before answering 409
+    """
+
+    def __init__(
+        self,
+        app,
+        session_factory: async_sessionmaker,
+        ttl_seconds: float = 86400.0,
+        wait_seconds: float = 30.0
+    ) -> None:
+        self.app = app
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        # Keys in flight in this worker: key -> (request hash, future of the
+        # stored response, or of None when the key was released)
+        self._in_flight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._last_prune = 0.0
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not IDEMPOTENT_PATHS.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+        raw_key = dict(scope["headers"]).get(KEY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = raw_key.decode("latin-1").strip()
+        body = await read_body(receive)
+        try:
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise IdempotencyError(
+                    400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+                )
+            stored = await self.claim(key, await request_hash(scope, body))
+        except IdempotencyError as error:
+            await send_response(send, error_response(error))
+            return
+        if stored is not None:
+            await send_response(send, stored._replace(
+                headers=stored.headers + [REPLAYED_HEADER]
+            ))
+            return
+
+        await self.run(key, scope, body, receive, send)
+
+    async def run(self, key: str, scope, body: bytes, receive, send) -> None:
+        """Run the request that claimed a key and store or release the key."""
+        status_code = 500
+        headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+        complete = False
+        body_sent = False
+
+        async def replay_body():
+            nonlocal body_sent
+            if body_sent:
+                # Only a disconnect can follow the body
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code, headers, complete
+            # Captured before sending, so the outcome is stored even if the
+            # client has gone away by now
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_body, send_wrapper)
+        finally:
+            stored = None
+            if complete and is_final(status_code):
+                stored = StoredResponse(status_code, headers, b"".join(chunks))
+            await self.finish(key, stored)
+
+    async def claim(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Claim a key for a request, or get the response to replay for it.
+
+        Args:
+            key: The idempotency key
+            fingerprint: The request's ``request_hash``
+
+        Returns:
+            StoredResponse: The stored response, or None if the caller now
+                holds the key and must run the request and call ``finish()``
+
+        Raises:
+            IdempotencyError: 422 if the key was used for another request,
+                409 if its request is still in flight after the wait
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_seconds
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None:
+                owner_fingerprint, future = in_flight
+                if owner_fingerprint != fingerprint:
+                    raise key_reused()
+                try:
+                    stored = await asyncio.wait_for(
+                        asyncio.shield(future), max(0.0, deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    raise still_in_flight() from None
+                if stored is not None:
+                    return stored
+                # Released without a final outcome: try to run it here
+                continue
+
+            self._in_flight[key] = (fingerprint, loop.create_future())
+            try:
+                row = await self._insert_or_get(key, fingerprint)
+            except BaseException:
+                self._resolve(key, None)
+                raise
+            if row is None:
+                return None
+            # Held by another worker, or done
+            self._resolve(key, None)
+            if row.request_hash != fingerprint:
+                raise key_reused()
+            if row.status_code is not None:
+                return StoredResponse(
+                    row.status_code,
+                    [(name.encode("latin-1"), value.encode("latin-1"))
+                     for name, value in json.loads(row.headers)],
+                    row.body,
+                )
+            if loop.time() >= deadline:
+                raise still_in_flight()
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def finish(self, key: str, stored: Optional[StoredResponse]) -> None:
+        """
+        Store the outcome of a claimed key, or release the key without one.
+
+        Args:
+            key: The idempotency key
+            stored: The final response, or None to release the key
+        """
+        try:
+            async with self.session_factory() as db:
+                if stored is None:
+                    await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+                else:
+                    await db.execute(
+                        update(IdempotencyKey)
+                        .where(IdempotencyKey.key == key)
+                        .values(
+                            status_code=stored.status_code,
+                            headers=json.dumps([
+                                [name.decode("latin-1"), value.decode("latin-1")]
+                                for name, value in stored.headers
+                            ]),
+                            body=stored.body,
+                        )
+                    )
+                if timer.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                    self._last_prune = timer.monotonic()
+                    await db.execute(delete(IdempotencyKey).where(
+                        IdempotencyKey.created_at < self._expired_before()
+                    ))
+                await db.commit()
+        finally:
+            self._resolve(key, stored)
+
+    async def _insert_or_get(self, key: str, fingerprint: str):
+        """
+        Insert a key's row, or read the live row that holds the key.
+
+        Returns:
+            Row: The existing row's request_hash, status_code, headers and
+                body, or None if the row was inserted (the key is claimed)
+        """
+        async with self.session_factory() as db:
+            while True:
+                try:
+                    await db.execute(insert(IdempotencyKey).values(
+                        key=key, request_hash=fingerprint, created_at=datetime.utcnow()
+                    ))
+                    await db.commit()
+                    return None
+                except IntegrityError:
+                    await db.rollback()
+                row = (await db.execute(
+                    select(
+                        IdempotencyKey.request_hash, IdempotencyKey.status_code,
+                        IdempotencyKey.headers, IdempotencyKey.body,
+                        IdempotencyKey.created_at,
+                    ).where(IdempotencyKey.key == key)
+                )).one_or_none()
+                if row is None:
+                    # Released in between; claim it
+                    continue
+                abandoned = (
+                    row.status_code is None
+                    and row.created_at < datetime.utcnow()
+                    - timedelta(seconds=self.wait_seconds * ABANDONED_AFTER_WAITS)
+                )
+                if row.created_at >= self._expired_before() and not abandoned:
+                    return row
+                # An expired key, or one whose worker died mid-request, is free
+                await db.execute(delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.created_at == row.created_at
+                ))
+                await db.commit()
+
+    def _expired_before(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def _resolve(self, key: str, stored: Optional[StoredResponse]) -> None:
+        """Hand a key's outcome to the duplicates waiting in this worker."""
+        in_flight = self._in_flight.pop(key, None)
+        if in_flight is not None and not in_flight[1].done():
+            in_flight[1].set_result(stored)
+
+
+def key_reused() -> IdempotencyError:
+    return IdempotencyError(
+        422, "Idempotency-Key was already used for a different request"
+    )
+
+
+def still_in_flight() -> IdempotencyError:
+    return IdempotencyError(
+        409, "A request with this Idempotency-Key is still in progress; retry later"
+    )
@@ -1,31 +1,47 @@
 """
 Database Initialization Module.
 
-This module handles database table creation and population with sample data
-for the restaurant booking mock API. It sets up realistic test data including
-restaurants, availability slots, and cancellation reasons.
+This module populates the database with sample data for the restaurant
+booking mock API. It sets up realistic test data including restaurants,
+availability slots, and cancellation reasons. The schema itself is created by
+the migrations (see app.migrate), which also call ``init_sample_data``.
 
 Author: AI Assistant
 """
 
 import random
 from datetime import time, datetime, timedelta
-
-from app.database import engine, SessionLocal
-from app.models import Base, Restaurant, AvailabilitySlot, CancellationReason
-
-
-def create_tables() -> None:
-    """
-    Create all database tables based on SQLAlchemy models.
-
-    This function creates the database schema by calling SQLAlchemy's
-    metadata.create_all() method.
-    """
-    Base.metadata.create_all(bind=engine)
-
-
-def init_sample_data() -> None:
+from typing import Optional
+
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.database import get_session_factory
+from app.models import Restaurant, AvailabilitySlot, CancellationReason
+
+# Predefined cancellation reasons, shared with the bulk seeding CLI
+CANCELLATION_REASONS = [
+    {
+        "id": 1,
+        "reason": "Customer Request",
+        "description": "Customer requested cancellation"
+    },
+    {
+        "id": 2,
+        "reason": "Restaurant Closure",
+        "description": "Restaurant temporarily closed"
+    },
+    {
+        "id": 3,
+        "reason": "Weather",
+        "description": "Cancelled due to weather conditions"
+    },
+    {"id": 4, "reason": "Emergency", "description": "Emergency cancellation"},
+    {"id": 5, "reason": "No Show", "description": "Customer did not show up"}
+]
+
+
+def init_sample_data(bind: Optional[Connection] = None) -> None:
     """
     Initialize database with sample data for testing.
 
@@ -37,10 +53,14 @@ def init_sample_data() -> None:
     - 30 days of availability slots with lunch and dinner times
     - 5 predefined cancellation reasons
 
+    Args:
+        bind: Connection to load the data on, joining its transaction
+            (default: a session on the shared sync engine)
+
     Raises:
         Exception: If database operations fail (logged and rolled back)
     """
-    db = SessionLocal()
+    db = Session(bind=bind) if bind is not None else get_session_factory()()
 
     try:
         # Check if data already exists
@@ -87,27 +107,7 @@ def init_sample_data() -> None:
                 db.add(slot)
 
         # Create sample cancellation reasons
-        cancellation_reasons = [
-            {
-                "id": 1,
-                "reason": "Customer Request",
-                "description": "Customer requested cancellation"
-            },
-            {
-                "id": 2,
-                "reason": "Restaurant Closure",
-                "description": "Restaurant temporarily closed"
-            },
-            {
-                "id": 3,
-                "reason": "Weather",
-                "description": "Cancelled due to weather conditions"
-            },
-            {"id": 4, "reason": "Emergency", "description": "Emergency cancellation"},
-            {"id": 5, "reason": "No Show", "description": "Customer did not show up"}
-        ]
-
-        for reason_data in cancellation_reasons:
+        for reason_data in CANCELLATION_REASONS:
             reason = CancellationReason(**reason_data)
             db.add(reason)
 
@@ -122,8 +122,8 @@ def init_sample_data() -> None:
 
 
 if __name__ == "__main__":
-    print("Creating database tables...")
-    create_tables()
-    print("Initializing sample data...")
-    init_sample_data()
+    # Kept for existing scripts: same as `python -m app.migrate`
+    from app.migrate import migrate
+    print("Migrating database and initializing sample data...")
+    migrate()
     print("Database setup complete!")
@@ -0,0 +1,215 @@
+"""
+Cross-Worker Cache Invalidation Bus.
+
+The availability cache and the restaurant directory live in each API worker's
+memory. With several workers, a booking written by one worker must also drop
+the entries cached by the others. Writers add a ``cache_invalidations`` row in
+the same transaction as their change, so a change is broadcast exactly when it
+commits; every worker polls the table for rows newer than the last id it has
+seen (one primary-key range scan, usually empty) and applies them to its own
+caches.
+
+Ids increase in commit order because SQLite serializes writers, and the table
+uses AUTOINCREMENT so ids are never reused after old rows are pruned. If a
+worker falls so far behind that rows it has not seen were pruned, it clears
+its caches rather than serve stale entries.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import availability_cache
+from app.config import settings
+from app.models import CacheInvalidation, Restaurant
+from app.restaurants import restaurant_directory
+
+logger = logging.getLogger(__name__)
+
+AVAILABILITY = "availability"
+RESTAURANTS = "restaurants"
+
+# Old change-log rows are pruned once every this many polls
+PRUNE_EVERY_POLLS = 100
+
+
+class InvalidationBus:
+    """
+    Change-log publisher and poller shared by all requests in a worker.
+
+    Attributes:
+        enabled (bool): When False nothing is written or polled (one worker)
+        poll_interval_seconds (float): Time between polls
+        retention_seconds (float): Age after which change-log rows are pruned
+        last_seen_id (int): Newest change-log id already applied
+        polls (int): Polls run
+        applied (int): Changes from other workers applied to the caches
+        resets (int): Full cache clears after missing pruned changes
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        poll_interval_seconds: float = 0.2,
+        retention_seconds: float = 300.0
+    ) -> None:
+        self.enabled = enabled
+        self.poll_interval_seconds = poll_interval_seconds
+        self.retention_seconds = retention_seconds
+        self.last_seen_id = 0
+        self.polls = 0
+        self.applied = 0
+        self.resets = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, db: AsyncSession, restaurant_id: int, *visit_dates: date) -> None:
+        """
+        Broadcast that a restaurant's availability changed on some dates.
+
+        The rows are added to the session, so they commit (or roll back) with
+        the change itself. Call before ``commit()``; the local cache is still
+        invalidated directly after the commit.
+
+        Args:
+            db: Async session holding the change
+            restaurant_id: The restaurant id
+            *visit_dates: Dates whose slots changed
+        """
+        if not self.enabled:
+            return
+        origin = os.getpid()
+        db.add_all([
+            CacheInvalidation(
+                kind=AVAILABILITY, restaurant_id=restaurant_id,
+                visit_date=visit_date, origin=origin
+            )
+            for visit_date in set(visit_dates)
+        ])
+
+    async def start(self, session_factory: async_sessionmaker) -> None:
+        """
+        Skip the existing change log and start polling on the running loop.
+
+        Args:
+            session_factory: Factory for async sessions
+        """
+        if not self.enabled or self._task is not None:
+            return
+        async with session_factory() as db:
+            self.last_seen_id = await db.scalar(select(func.max(CacheInvalidation.id))) or 0
+        self._task = asyncio.create_task(self._loop(session_factory), name="invalidation-bus")
+
+    async def stop(self) -> None:
+        """Cancel the polling loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def poll(self, db: AsyncSession) -> int:
+        """
+        Apply every change committed by other workers since the last poll.
+
+        Args:
+            db: Async database session
+
+        Returns:
+            int: Number of changes applied
+        """
+        rows = (await db.execute(
+            select(
+                CacheInvalidation.id, CacheInvalidation.kind, CacheInvalidation.restaurant_id,
+                CacheInvalidation.visit_date, CacheInvalidation.origin
+            )
+            .where(CacheInvalidation.id > self.last_seen_id)
+            .order_by(CacheInvalidation.id)
+        )).all()
+        self.polls += 1
+        if not rows:
+            return 0
+
+        if rows[0].id > self.last_seen_id + 1:
+            # Changes this worker never saw were pruned
+            availability_cache.clear()
+            restaurant_directory.clear()
+            self.resets += 1
+
+        origin = os.getpid()
+        applied = 0
+        for row in rows:
+            if row.origin != origin:
+                if row.kind == AVAILABILITY:
+                    availability_cache.invalidate(row.restaurant_id, row.visit_date)
+                elif row.kind == RESTAURANTS:
+                    restaurant_directory.clear()
+                applied += 1
+        self.last_seen_id = rows[-1].id
+        self.applied += applied
+        return applied
+
+    async def prune(self, db: AsyncSession) -> None:
+        """Delete change-log rows older than the retention window."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+        await db.execute(delete(CacheInvalidation).where(CacheInvalidation.created_at < cutoff))
+        await db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get bus counters for this worker.
+
+        Returns:
+            dict: Poll, applied and reset counts plus the last seen change id
+        """
+        return {
+            "enabled": self.enabled,
+            "worker_pid": os.getpid(),
+            "last_seen_id": self.last_seen_id,
+            "polls": self.polls,
+            "applied": self.applied,
+            "resets": self.resets,
+        }
+
+    async def _loop(self, session_factory: async_sessionmaker) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                async with session_factory() as db:
+                    await self.poll(db)
+                    if self.polls % PRUNE_EVERY_POLLS == 0:
+                        await self.prune(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep polling; the next poll picks up from last_seen_id
+                logger.exception("Cache invalidation poll failed")
+
+
+# Shared bus used by the API routers
+invalidation_bus = InvalidationBus(
+    enabled=settings.invalidation_bus_enabled,
+    poll_interval_seconds=settings.invalidation_poll_seconds,
+    retention_seconds=settings.invalidation_retention_seconds,
+)
+
+
+@event.listens_for(Restaurant, "after_insert")
+@event.listens_for(Restaurant, "after_update")
+@event.listens_for(Restaurant, "after_delete")
+def _restaurant_changed(mapper, connection, target) -> None:
+    """Broadcast restaurant row changes so other workers drop their directory."""
+    if invalidation_bus.enabled:
+        connection.execute(
+            insert(CacheInvalidation.__table__).values(
+                kind=RESTAURANTS, origin=os.getpid(), created_at=datetime.utcnow()
+            )
+        )
@@ -5,90 +5,195 @@ A complete FastAPI-based mock server that simulates a restaurant booking system.
 This server provides realistic endpoints for availability checking, booking creation,
 booking management, and cancellation operations.
 
+The application is built by ``create_app()``, which takes its own settings so
+tests can run an app on an in-memory database or with the caches off. Importing
+this module is cheap: FastAPI, the routers and the database engines are loaded
+when an application is built, and the default ``app`` (what
+``uvicorn app.main:app`` serves) is built on first access.
+
 Author: AI Assistant
 Version: 1.0.0
 """
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from app.routers import availability, booking
-from app.database import engine
-from app.models import Base
-import app.init_db as init_db
-
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="Restaurant Booking Mock API",
-    description=(
-        "A complete mock restaurant booking management system built with FastAPI "
-        "and SQLite. Provides realistic endpoints for testing applications."
-    ),
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:5173"],  # or ["*"] for all origins
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API routers
-app.include_router(availability.router)
-app.include_router(booking.router)
-
-
-@app.on_event("startup")
-async def startup_event() -> None:
-    """
-    Initialize database with sample data on application startup.
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
 
-    This function is called once when the FastAPI application starts.
-    It ensures the database contains sample restaurant data and availability slots.
-    """
-    init_db.init_sample_data()
+from app.config import Settings, configure, settings
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-@app.get("/", summary="API Information", tags=["Root"])
-async def root() -> dict:
+logger = logging.getLogger(__name__)
+
+
+def create_app(app_settings: Optional[Settings] = None, migrate: bool = False) -> "FastAPI":
     """
-    Get API information and available endpoints.
+    Build the API application.
+
+    The shared in-process state (caches, restaurant directory, invalidation
+    bus, metrics) is reset and configured from the settings, so each app
+    starts clean. Only one app should be running at a time in a process.
+
+    Args:
+        app_settings: Settings for this app; they replace the process-wide
+            settings and the shared engines are rebuilt from them (default:
+            keep the settings read from the environment)
+        migrate: Migrate the database and load the sample data on startup,
+            on the app's own engine (needed for in-memory databases, which
+            exist on one engine only). Deployments run ``python -m
+            app.migrate`` once instead, before the workers start.
 
     Returns:
-        dict: API metadata including version and available endpoint URLs.
+        FastAPI: The application
+
+    Example:
+        An isolated app for a test:
+        ```python
+        test_app = create_app(
+            Settings(database_url="sqlite://", availability_cache_enabled=False),
+            migrate=True,
+        )
+        async with test_app.router.lifespan_context(test_app):
+            ...
+        ```
     """
-    return {
-        "message": "Restaurant Booking Mock API",
-        "version": "1.0.0",
-        "description": "Mock restaurant booking system for testing applications",
-        "endpoints": {
-            "availability_search": (
-                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
-                "AvailabilitySearch"
-            ),
-            "create_booking": (
-                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
-                "BookingWithStripeToken"
-            ),
-            "cancel_booking": (
-                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
-                "{booking_reference}/Cancel"
-            ),
-            "get_booking": (
-                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
-                "{booking_reference}"
-            ),
-            "update_booking": (
-                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
-                "{booking_reference}"
-            ),
-            "docs": "/docs",
-            "redoc": "/redoc"
-        }
-    }
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from app.cache import availability_cache
+    from app.database import (
+        dispose_engines, get_async_engine, get_async_session_factory, reset_engines
+    )
+    from app.http_cache import cancellation_reasons
+    from app.idempotency import IdempotencyMiddleware
+    from app.invalidation import invalidation_bus
+    from app.metrics import MetricsMiddleware, instrument_engine, metrics
+    from app.migrate import check_schema, run_migrations
+    from app import responses
+    from app.references import reset_allocators
+    from app.restaurants import restaurant_directory
+    from app.routers import availability, batch, booking, root
+    from app.slot_horizon import SlotHorizonJob
+    from app.write_queue import write_queue
+
+    if app_settings is not None:
+        configure(app_settings)
+        reset_engines()
+    if settings.fast_json_enabled and responses.orjson is None:
+        logger.warning(
+            "FAST_JSON is on but orjson is not installed: responses are encoded with "
+            "stdlib json (pip install orjson)"
+        )
+    if not settings.booking_reference_secret:
+        logger.warning(
+            "BOOKING_REFERENCE_SECRET is not set: booking references use the public "
+            "development key and can be enumerated"
+        )
+
+    availability_cache.enabled = settings.availability_cache_enabled
+    availability_cache.max_entries = settings.availability_cache_max_entries
+    availability_cache.ttl_seconds = settings.availability_cache_ttl_seconds
+    availability_cache.clear()
+    invalidation_bus.enabled = settings.invalidation_bus_enabled
+    invalidation_bus.poll_interval_seconds = settings.invalidation_poll_seconds
+    invalidation_bus.retention_seconds = settings.invalidation_retention_seconds
+    write_queue.enabled = settings.write_queue_enabled
+    write_queue.max_batch_size = settings.write_queue_batch_size
+    write_queue.max_linger_ms = settings.write_queue_max_linger_ms
+    metrics.enabled = settings.metrics_enabled
+    metrics.clear()
+    restaurant_directory.clear()
+    cancellation_reasons.clear()
+    reset_allocators()
+
+    sessions = get_async_session_factory()
+    # Keeps availability slots generated ahead and archives old slots and bookings
+    slot_horizon_job = SlotHorizonJob(sessions, settings.slot_horizon_interval_seconds)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+        """
+        Prepare the in-process state on startup and release it on shutdown.
+
+        This runs once in every worker. Unless the app was built with
+        ``migrate=True`` it does not create or migrate the schema (``python -m
+        app.migrate`` does, once, before the workers start); it only checks
+        the database is at the expected revision. It then loads the
+        restaurant directory used to resolve restaurant names and the
+        cancellation reason snapshot, and starts the background jobs that
+        keep slots generated ahead and, with several workers, apply cache
+        invalidations from the other workers, and with WRITE_QUEUE=on the
+        writer task that group-commits booking writes.
+
+        Raises:
+            RuntimeError: If the database has not been migrated
+        """
+        async with get_async_engine().begin() as connection:
+            if migrate:
+                await connection.run_sync(run_migrations)
+            await connection.run_sync(check_schema)
+        async with sessions() as db:
+            await restaurant_directory.load(db)
+            await cancellation_reasons.load(db)
+        await invalidation_bus.start(sessions)
+        await write_queue.start(sessions)
+        if settings.slot_horizon_enabled:
+            slot_horizon_job.start()
+        try:
+            yield
+        finally:
+            await slot_horizon_job.stop()
+            await write_queue.stop()
+            await invalidation_bus.stop()
+            await dispose_engines()
+
+    app = FastAPI(
+        title="Restaurant Booking Mock API",
+        description=(
+            "A complete mock restaurant booking management system built with FastAPI "
+            "and SQLite. Provides realistic endpoints for testing applications."
+        ),
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    app.state.slot_horizon_job = slot_horizon_job
+
+    # Innermost, so replayed responses still get fresh CORS headers
+    if settings.idempotency_enabled:
+        app.add_middleware(
+            IdempotencyMiddleware,
+            session_factory=sessions,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            wait_seconds=settings.idempotency_wait_seconds,
+        )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],  # or ["*"] for all origins
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Outermost middleware, so timings include CORS handling. Requests only
+    # use the async engine; the sync one is for scripts and is not built here.
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing_enabled)
+    instrument_engine(get_async_engine().sync_engine)
+
+    # Include API routers
+    app.include_router(root.router)
+    app.include_router(availability.router)
+    app.include_router(booking.router)
+    app.include_router(batch.router)
+    return app
+
+
+def __getattr__(name: str) -> Any:
+    # The default app is built on first access (``uvicorn app.main:app``)
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
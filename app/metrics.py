@@ -0,0 +1,276 @@
+"""
+Request and SQL Metrics.
+
+This module records per-route request latency histograms, in-flight gauges,
+status code counters and, through SQLAlchemy cursor hooks, the number of SQL
+statements and database time spent by each request. ``render`` produces the
+Prometheus text exposition format served at ``GET /metrics``.
+
+Requests are labelled by their route template (e.g.
+``/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Bookings``) rather than the
+raw path, so the number of series stays bounded.
+
+Author: AI Assistant
+"""
+
+import contextvars
+import threading
+import time as timer
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+RouteKey = Tuple[str, str]
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of the request currently being handled."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Stats of the request handled by the current task; None outside a request
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def lines(self, name: str, labels: str) -> List[str]:
+        """Render the bucket, sum and count samples of this histogram."""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        cumulative += self.counts[-1]
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide request and SQL metrics.
+
+    Attributes:
+        enabled (bool): When False the middleware records nothing
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._durations: Dict[RouteKey, Histogram] = {}
+        self._db_durations: Dict[RouteKey, Histogram] = {}
+        self._queries: Dict[RouteKey, int] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+
+    def request_started(self, method: str) -> None:
+        """
+        Count a request as in flight.
+
+        The route is only known once routing has run, so the in-flight gauge
+        is labelled by method alone.
+
+        Args:
+            method: HTTP method
+        """
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 0) + 1
+
+    def request_finished(
+        self, key: RouteKey, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        """
+        Record a completed request.
+
+        Args:
+            key: (method, route template)
+            status: Response status code
+            seconds: Total handling time
+            stats: SQL activity of the request
+        """
+        with self._lock:
+            self._in_flight[key[0]] -= 1
+            self._statuses[key + (status,)] = self._statuses.get(key + (status,), 0) + 1
+            self._durations.setdefault(key, Histogram()).observe(seconds)
+            self._db_durations.setdefault(key, Histogram()).observe(stats.db_seconds)
+            self._queries[key] = self._queries.get(key, 0) + stats.queries
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text, ending with a newline
+        """
+        with self._lock:
+            lines = [
+                "# HELP http_requests_total Completed HTTP requests.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status), count in sorted(self._statuses.items()):
+                lines.append(
+                    f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}'
+                )
+
+            lines += [
+                "# HELP http_requests_in_flight Requests currently being handled.",
+                "# TYPE http_requests_in_flight gauge",
+            ]
+            for method, count in sorted(self._in_flight.items()):
+                lines.append(f'http_requests_in_flight{{method="{method}"}} {count}')
+
+            lines += [
+                "# HELP http_request_duration_seconds Request handling time.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self._durations.items()):
+                lines += histogram.lines("http_request_duration_seconds", _labels(method, route))
+
+            lines += [
+                "# HELP http_request_db_duration_seconds Time spent in SQL per request.",
+                "# TYPE http_request_db_duration_seconds histogram",
+            ]
+            for (method, route), histogram in sorted(self._db_durations.items()):
+                lines += histogram.lines(
+                    "http_request_db_duration_seconds", _labels(method, route)
+                )
+
+            lines += [
+                "# HELP http_request_db_queries_total SQL statements executed by requests.",
+                "# TYPE http_request_db_queries_total counter",
+            ]
+            for (method, route), count in sorted(self._queries.items()):
+                lines.append(
+                    f"http_request_db_queries_total{{{_labels(method, route)}}} {count}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        """Drop every recorded sample."""
+        with self._lock:
+            self._durations.clear()
+            self._db_durations.clear()
+            self._queries.clear()
+            self._statuses.clear()
+
+
+def _labels(method: str, route: str) -> str:
+    """Format method and route as escaped exposition labels."""
+    route = route.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return f'method="{method}",route="{route}"'
+
+
+# Shared registry used by the middleware and GET /metrics
+metrics = MetricsRegistry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _request_stats.get() is not None:
+        conn.info.setdefault("metrics_query_started", []).append(timer.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _request_stats.get()
+    started = conn.info.get("metrics_query_started")
+    if stats is None or not started:
+        return
+    stats.queries += 1
+    stats.db_seconds += timer.perf_counter() - started.pop()
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("metrics_query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attribute the SQL statements of an engine to the request running them.
+
+    Args:
+        engine: A sync engine (use ``AsyncEngine.sync_engine`` for async engines)
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request.
+
+    Args:
+        app: The wrapped ASGI application
+        registry: Where samples are recorded
+        server_timing: Add a ``Server-Timing`` header with total and DB time
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics, server_timing: bool = False):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not (self.registry.enabled or self.server_timing):
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = timer.perf_counter()
+        status = 500
+        if self.registry.enabled:
+            self.registry.request_started(scope["method"])
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (timer.perf_counter() - started) * 1000
+                    header = (
+                        f'app;dur={elapsed_ms:.1f}, '
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            if self.registry.enabled:
+                # FastAPI stores the matched route in the (shared) scope
+                route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+                self.registry.request_finished(
+                    (scope["method"], route), status, timer.perf_counter() - started, stats
+                )
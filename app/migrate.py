@@ -0,0 +1,163 @@
+"""
+Database Migrations.
+
+The schema is versioned with Alembic (app/migrations). Migrations run as a
+one-shot step before the API starts, never inside the request-serving
+processes: ``python -m app.migrate`` upgrades the database to the newest
+revision and loads the sample data into an empty database. Databases created
+before migrations existed are adopted by the first revision.
+
+API workers only check the revision at startup (one query, no Alembic
+import) and refuse to start on a database that has not been migrated.
+
+Usage:
+    python -m app.migrate [--revision head] [--no-sample-data]
+
+Author: AI Assistant
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+
+from app.database import get_engine
+
+# Newest revision in app/migrations/versions. Workers compare the database
+# against it without loading Alembic; ``migrate()`` checks it is current.
+SCHEMA_REVISION = "0003"
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+ALEMBIC_INI = os.path.join(os.path.dirname(APP_DIR), "alembic.ini")
+MIGRATIONS_DIR = os.path.join(APP_DIR, "migrations")
+
+
+def alembic_config():
+    """
+    Build the Alembic configuration, independent of the working directory.
+
+    Returns:
+        alembic.config.Config: Configuration pointing at app/migrations
+    """
+    # Imported here: Alembic is only needed by the migration step
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    return config
+
+
+def head_revision() -> str:
+    """Return the newest revision among the migration scripts."""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """
+    Read the revision a database is at.
+
+    Args:
+        connection: A sync connection
+
+    Returns:
+        str: The revision, or None for a database never migrated
+    """
+    try:
+        return connection.scalar(text("SELECT version_num FROM alembic_version"))
+    except OperationalError:
+        # No alembic_version table
+        connection.rollback()
+        return None
+
+
+def check_schema(connection: Connection) -> None:
+    """
+    Refuse to serve a database that is not at the expected revision.
+
+    Args:
+        connection: A sync connection (use ``AsyncConnection.run_sync`` from
+            async code)
+
+    Raises:
+        RuntimeError: If the database has not been migrated to SCHEMA_REVISION
+    """
+    revision = current_revision(connection)
+    if revision != SCHEMA_REVISION:
+        raise RuntimeError(
+            f"Database schema is at revision {revision or 'none'}, expected "
+            f"{SCHEMA_REVISION}; run `python -m app.migrate` first"
+        )
+
+
+def run_migrations(
+    connection: Connection, revision: str = "head", sample_data: bool = True
+) -> None:
+    """
+    Upgrade the database behind a connection and optionally load the sample data.
+
+    Both run in the connection's transaction. Use this directly where the
+    connection matters, e.g. for an in-memory database that only exists on
+    one engine (``AsyncConnection.run_sync(run_migrations)``).
+
+    Args:
+        connection: A sync connection
+        revision: Target revision
+        sample_data: Load the sample restaurant, slots and cancellation
+            reasons if the database has no restaurant yet
+
+    Raises:
+        RuntimeError: If SCHEMA_REVISION is not the newest migration
+    """
+    from alembic import command
+
+    head = head_revision()
+    if head != SCHEMA_REVISION:
+        raise RuntimeError(
+            f"SCHEMA_REVISION is {SCHEMA_REVISION} but the newest migration is {head}"
+        )
+    config = alembic_config()
+    config.attributes["connection"] = connection
+    command.upgrade(config, revision)
+
+    if sample_data:
+        from app.init_db import init_sample_data
+        init_sample_data(bind=connection)
+
+
+def migrate(revision: str = "head", sample_data: bool = True) -> None:
+    """
+    Upgrade the configured database and optionally load the sample data.
+
+    Args:
+        revision: Target revision
+        sample_data: Load the sample restaurant, slots and cancellation
+            reasons if the database has no restaurant yet
+
+    Raises:
+        RuntimeError: If SCHEMA_REVISION is not the newest migration
+    """
+    with get_engine().begin() as connection:
+        run_migrations(connection, revision, sample_data)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--revision", default="head", help="Target revision")
+    parser.add_argument("--no-sample-data", action="store_true",
+                        help="Do not load the sample data into an empty database")
+    args = parser.parse_args()
+
+    migrate(args.revision, sample_data=not args.no_sample_data)
+    with get_engine().connect() as connection:
+        print(f"Database at revision {current_revision(connection)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Alembic Migration Environment.
+
+Runs migrations on the database configured by DATABASE_URL, or on the
+connection passed in by ``app.migrate`` as ``config.attributes["connection"]``.
+SQLite cannot alter most constraints in place, so migrations run in batch mode
+(copy-and-move tables) when they change existing ones.
+
+Author: AI Assistant
+"""
+
+from alembic import context
+
+from app.database import Base, get_engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL as a script instead of running it."""
+    context.configure(
+        url=str(get_engine().url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run the migrations on a live connection."""
+    connection = context.config.attributes.get("connection")
+    if connection is not None:
+        _run(connection)
+        return
+    with get_engine().connect() as connection:
+        _run(connection)
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection, target_metadata=target_metadata, render_as_batch=True
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
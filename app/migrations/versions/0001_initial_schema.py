@@ -0,0 +1,253 @@
+"""Initial schema.
+
+Creates every table and index of the booking API. Databases created before
+migrations existed (by ``create_all`` at startup) are adopted instead: tables
+and indexes that already exist are kept, the slot capacity columns are added
+where missing, indexes replaced by better ones are dropped, and duplicate
+slots are removed before the unique slot index is built.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 00:43:49.596118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns added to availability_slots after its first release
+SLOT_CAPACITY_COLUMNS = ("table_capacity", "covers_capacity", "booked_tables", "booked_covers")
+
+# Indexes of pre-migration databases that later ones replaced
+SUPERSEDED_INDEXES = [
+    "ix_bookings_restaurant_visit_status",
+    "ix_availability_slots_restaurant_date_time",
+]
+
+# Per-slot totals of confirmed bookings, as app.capacity maintains them
+RECOUNT_SLOT_COUNTERS = """
+UPDATE availability_slots SET
+    booked_tables = (
+        SELECT count(*) FROM bookings
+        WHERE bookings.restaurant_id = availability_slots.restaurant_id
+          AND bookings.visit_date = availability_slots.date
+          AND bookings.visit_time = availability_slots.time
+          AND bookings.status = 'confirmed'),
+    booked_covers = (
+        SELECT coalesce(sum(bookings.party_size), 0) FROM bookings
+        WHERE bookings.restaurant_id = availability_slots.restaurant_id
+          AND bookings.visit_date = availability_slots.date
+          AND bookings.visit_time = availability_slots.time
+          AND bookings.status = 'confirmed')
+"""
+
+
+def _slot_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('time', sa.Time(), nullable=False),
+        sa.Column('max_party_size', sa.Integer(), nullable=True),
+        sa.Column('available', sa.Boolean(), nullable=True),
+        sa.Column('table_capacity', sa.Integer(), server_default='3', nullable=False),
+        sa.Column('covers_capacity', sa.Integer(), server_default='24', nullable=False),
+        sa.Column('booked_tables', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('booked_covers', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+def _booking_columns():
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('booking_reference', sa.String(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('visit_date', sa.Date(), nullable=False),
+        sa.Column('visit_time', sa.Time(), nullable=False),
+        sa.Column('party_size', sa.Integer(), nullable=False),
+        sa.Column('channel_code', sa.String(), nullable=False),
+        sa.Column('special_requests', sa.Text(), nullable=True),
+        sa.Column('is_leave_time_confirmed', sa.Boolean(), nullable=True),
+        sa.Column('room_number', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('cancellation_reason_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['customer_id'], ['customers.id'], ),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ]
+
+
+TABLES = {
+    'restaurants': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('microsite_name', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'customers': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('surname', sa.String(), nullable=True),
+        sa.Column('mobile_country_code', sa.String(), nullable=True),
+        sa.Column('mobile', sa.String(), nullable=True),
+        sa.Column('phone_country_code', sa.String(), nullable=True),
+        sa.Column('phone', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('receive_email_marketing', sa.Boolean(), nullable=True),
+        sa.Column('receive_sms_marketing', sa.Boolean(), nullable=True),
+        sa.Column('group_email_marketing_opt_in_text', sa.Text(), nullable=True),
+        sa.Column('group_sms_marketing_opt_in_text', sa.Text(), nullable=True),
+        sa.Column('receive_restaurant_email_marketing', sa.Boolean(), nullable=True),
+        sa.Column('receive_restaurant_sms_marketing', sa.Boolean(), nullable=True),
+        sa.Column('restaurant_email_marketing_opt_in_text', sa.Text(), nullable=True),
+        sa.Column('restaurant_sms_marketing_opt_in_text', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'cancellation_reasons': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('reason', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'reference_sequences': lambda: [
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('next_value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    ],
+    'cache_invalidations': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=20), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=True),
+        sa.Column('visit_date', sa.Date(), nullable=True),
+        sa.Column('origin', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+    'availability_slots': _slot_columns,
+    'availability_slots_archive': _slot_columns,
+    'bookings': _booking_columns,
+    'bookings_archive': _booking_columns,
+    'booking_versions': lambda: [
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('restaurant_id'),
+    ],
+    'slot_horizons': lambda: [
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('generated_through', sa.Date(), nullable=False),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('restaurant_id'),
+    ],
+    'slot_templates': lambda: [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('weekday', sa.Integer(), nullable=True),
+        sa.Column('time', sa.Time(), nullable=False),
+        sa.Column('max_party_size', sa.Integer(), nullable=False),
+        sa.Column('table_capacity', sa.Integer(), nullable=False),
+        sa.Column('covers_capacity', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    ],
+}
+
+# Live tables whose ids must never be reused once rows move to the archive
+AUTOINCREMENT_TABLES = {'cache_invalidations', 'availability_slots', 'bookings'}
+
+# (table, index name, columns, unique)
+INDEXES = [
+    ('restaurants', 'ix_restaurants_id', ['id'], False),
+    ('restaurants', 'ix_restaurants_name', ['name'], True),
+    ('restaurants', 'ix_restaurants_microsite_name', ['microsite_name'], True),
+    ('customers', 'ix_customers_id', ['id'], False),
+    ('customers', 'ix_customers_email', ['email'], False),
+    ('cancellation_reasons', 'ix_cancellation_reasons_id', ['id'], False),
+    ('cache_invalidations', 'ix_cache_invalidations_created_at', ['created_at'], False),
+    ('availability_slots', 'ix_availability_slots_id', ['id'], False),
+    ('availability_slots', 'uq_availability_slots_restaurant_date_time',
+     ['restaurant_id', 'date', 'time'], True),
+    ('availability_slots_archive', 'ix_availability_slots_archive_id', ['id'], False),
+    ('availability_slots_archive', 'ix_availability_slots_archive_restaurant_date',
+     ['restaurant_id', 'date'], False),
+    ('bookings', 'ix_bookings_id', ['id'], False),
+    ('bookings', 'ix_bookings_booking_reference', ['booking_reference'], True),
+    ('bookings', 'ix_bookings_restaurant_visit',
+     ['restaurant_id', 'visit_date', 'visit_time'], False),
+    ('bookings', 'ix_bookings_restaurant_status_visit',
+     ['restaurant_id', 'status', 'visit_date', 'visit_time'], False),
+    ('bookings_archive', 'ix_bookings_archive_id', ['id'], False),
+    ('bookings_archive', 'ix_bookings_archive_booking_reference', ['booking_reference'], True),
+    ('bookings_archive', 'ix_bookings_archive_restaurant_visit',
+     ['restaurant_id', 'visit_date', 'visit_time'], False),
+    ('slot_templates', 'ix_slot_templates_restaurant_id', ['restaurant_id'], False),
+]
+
+
+def _adopt_slot_table(inspector) -> None:
+    """Bring a pre-migration availability_slots table up to this revision."""
+    existing = {column['name'] for column in inspector.get_columns('availability_slots')}
+    missing = [name for name in SLOT_CAPACITY_COLUMNS if name not in existing]
+    if missing:
+        for column in _slot_columns():
+            if getattr(column, 'name', None) in missing:
+                op.add_column('availability_slots', column)
+        op.execute(RECOUNT_SLOT_COUNTERS)
+        # Bookings no longer close slots; only the owner does
+        op.execute("UPDATE availability_slots SET available = 1 WHERE booked_tables > 0")
+
+    slot_indexes = {index['name'] for index in inspector.get_indexes('availability_slots')}
+    if 'uq_availability_slots_restaurant_date_time' not in slot_indexes:
+        duplicates = op.get_bind().execute(sa.text(
+            "DELETE FROM availability_slots WHERE id NOT IN ("
+            "SELECT min(id) FROM availability_slots GROUP BY restaurant_id, date, time)"
+        )).rowcount
+        if duplicates:
+            op.execute(RECOUNT_SLOT_COUNTERS)
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing_tables = set(inspector.get_table_names())
+
+    for name, columns in TABLES.items():
+        if name not in existing_tables:
+            kwargs = {'sqlite_autoincrement': True} if name in AUTOINCREMENT_TABLES else {}
+            op.create_table(name, *columns(), **kwargs)
+    if 'availability_slots' in existing_tables:
+        _adopt_slot_table(inspector)
+
+    for name in SUPERSEDED_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    existing_indexes = {
+        index['name']
+        for table in existing_tables if table in TABLES
+        for index in inspector.get_indexes(table)
+    }
+    for table, name, columns, unique in INDEXES:
+        if name not in existing_indexes:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for table, name, columns, unique in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for name in reversed(list(TABLES)):
+        op.drop_table(name)
@@ -0,0 +1,45 @@
+"""Idempotency keys.
+
+Adds the table that stores the outcome of write requests sent with an
+``Idempotency-Key`` header. Databases whose tables were created from the
+models (``create_all``) may already have it; it is then kept.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 01:10:12.402518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if 'idempotency_keys' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('headers', sa.Text(), nullable=True),
+        sa.Column('body', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index(
+        'ix_idempotency_keys_created_at', 'idempotency_keys', ['created_at'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_idempotency_keys_created_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
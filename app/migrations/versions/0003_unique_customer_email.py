@@ -0,0 +1,55 @@
+"""Unique customer email.
+
+Makes ``ix_customers_email`` unique so bookings can upsert their customer by
+email. Customers that share an email are merged into the one with the lowest
+id first: their live and archived bookings move to it and the others are
+deleted. Customers without an email are left alone (NULLs never conflict).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 01:52:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Lowest customer id for each email, for every customer row that has one
+KEPT_CUSTOMER = (
+    "(SELECT min(kept.id) FROM customers AS kept WHERE kept.email = customers.email)"
+)
+
+
+def upgrade() -> None:
+    indexes = {
+        index['name']: index for index in sa.inspect(op.get_bind()).get_indexes('customers')
+    }
+    if indexes.get('ix_customers_email', {}).get('unique'):
+        return
+
+    for table in ('bookings', 'bookings_archive'):
+        op.execute(
+            f"UPDATE {table} SET customer_id = ("
+            f"SELECT {KEPT_CUSTOMER} FROM customers WHERE customers.id = {table}.customer_id"
+            f") WHERE customer_id IN ("
+            f"SELECT id FROM customers WHERE email IS NOT NULL AND id != {KEPT_CUSTOMER})"
+        )
+    op.execute(
+        f"DELETE FROM customers WHERE email IS NOT NULL AND id != {KEPT_CUSTOMER}"
+    )
+    if 'ix_customers_email' in indexes:
+        op.drop_index('ix_customers_email', table_name='customers')
+    op.create_index('ix_customers_email', 'customers', ['email'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customers_email', table_name='customers')
+    op.create_index('ix_customers_email', 'customers', ['email'], unique=False)
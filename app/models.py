@@ -12,7 +12,8 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Boolean, Date, Time, Text, ForeignKey
+    Column, Integer, String, DateTime, Boolean, Date, Time, Text, ForeignKey, Index,
+    LargeBinary
 )
 from sqlalchemy.orm import relationship
 
@@ -22,6 +23,10 @@ if TYPE_CHECKING:
     # Import for type hints only - avoids circular imports
     pass
 
+# Capacity given to new slots: three parties of up to eight people
+DEFAULT_TABLE_CAPACITY = 3
+DEFAULT_COVERS_CAPACITY = 24
+
 
 class Restaurant(Base):
     """
@@ -63,7 +68,7 @@ class Customer(Base):
         title (str): Customer title (Mr/Mrs/Ms/Dr)
         first_name (str): Customer's first name
         surname (str): Customer's surname
-        email (str): Customer's email address (indexed)
+        email (str): Customer's email address (unique, indexed)
         mobile (str): Customer's mobile phone number
         phone (str): Customer's landline phone number
         created_at (datetime): Timestamp when customer was created
@@ -80,7 +85,7 @@ class Customer(Base):
     mobile = Column(String)
     phone_country_code = Column(String)
     phone = Column(String)
-    email = Column(String, index=True)
+    email = Column(String, index=True, unique=True)
     receive_email_marketing = Column(Boolean, default=False)
     receive_sms_marketing = Column(Boolean, default=False)
     group_email_marketing_opt_in_text = Column(Text)
@@ -95,7 +100,27 @@ class Customer(Base):
     bookings = relationship("Booking", back_populates="customer")
 
 
-class Booking(Base):
+class BookingColumns:
+    """Columns shared by live bookings and the bookings archive."""
+
+    id = Column(Integer, primary_key=True, index=True)
+    booking_reference = Column(String, unique=True, index=True, nullable=False)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
+    visit_date = Column(Date, nullable=False)
+    visit_time = Column(Time, nullable=False)
+    party_size = Column(Integer, nullable=False)
+    channel_code = Column(String, nullable=False)
+    special_requests = Column(Text)
+    is_leave_time_confirmed = Column(Boolean, default=False)
+    room_number = Column(String)
+    status = Column(String, default="confirmed")  # confirmed, cancelled, completed
+    cancellation_reason_id = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class Booking(BookingColumns, Base):
     """
     Booking model representing restaurant reservations.
 
@@ -116,29 +141,49 @@ class Booking(Base):
     """
 
     __tablename__ = "bookings"
-
-    id = Column(Integer, primary_key=True, index=True)
-    booking_reference = Column(String, unique=True, index=True, nullable=False)
-    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
-    customer_id = Column(Integer, ForeignKey("customers.id"), nullable=False)
-    visit_date = Column(Date, nullable=False)
-    visit_time = Column(Time, nullable=False)
-    party_size = Column(Integer, nullable=False)
-    channel_code = Column(String, nullable=False)
-    special_requests = Column(Text)
-    is_leave_time_confirmed = Column(Boolean, default=False)
-    room_number = Column(String)
-    status = Column(String, default="confirmed")  # confirmed, cancelled, completed
-    cancellation_reason_id = Column(Integer)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        # Serves the owner list newest visit first (SQLite appends the id to
+        # every index, so the (visit_date, visit_time, id) order needs no sort),
+        # its keyset cursor and the archiver's range of past visits
+        Index("ix_bookings_restaurant_visit", "restaurant_id", "visit_date", "visit_time"),
+        # Serves the status-filtered owner list in the same order and the
+        # per-slot confirmed booking counts
+        Index(
+            "ix_bookings_restaurant_status_visit",
+            "restaurant_id", "status", "visit_date", "visit_time"
+        ),
+        # Never reuse the id of a booking moved to the archive
+        {"sqlite_autoincrement": True},
+    )
 
     # Relationships
     restaurant = relationship("Restaurant", back_populates="bookings")
     customer = relationship("Customer", back_populates="bookings")
 
 
-class AvailabilitySlot(Base):
+class SlotColumns:
+    """Columns shared by live availability slots and the slot archive."""
+
+    id = Column(Integer, primary_key=True, index=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    time = Column(Time, nullable=False)
+    max_party_size = Column(Integer, default=8)
+    available = Column(Boolean, default=True)
+    table_capacity = Column(
+        Integer, nullable=False,
+        default=DEFAULT_TABLE_CAPACITY, server_default=str(DEFAULT_TABLE_CAPACITY)
+    )
+    covers_capacity = Column(
+        Integer, nullable=False,
+        default=DEFAULT_COVERS_CAPACITY, server_default=str(DEFAULT_COVERS_CAPACITY)
+    )
+    booked_tables = Column(Integer, nullable=False, default=0, server_default="0")
+    booked_covers = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AvailabilitySlot(SlotColumns, Base):
     """
     Availability slot model defining when restaurants accept bookings.
 
@@ -151,19 +196,25 @@ class AvailabilitySlot(Base):
         date (date): Date of availability
         time (time): Time slot
         max_party_size (int): Maximum party size for this slot
-        available (bool): Whether the slot is available for booking
+        available (bool): Whether the restaurant has opened the slot for booking
+        table_capacity (int): Number of parties the slot can seat
+        covers_capacity (int): Number of people the slot can seat
+        booked_tables (int): Confirmed bookings on the slot (maintained counter)
+        booked_covers (int): People in confirmed bookings (maintained counter)
         created_at (datetime): Timestamp when slot was created
     """
 
     __tablename__ = "availability_slots"
-
-    id = Column(Integer, primary_key=True, index=True)
-    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False)
-    date = Column(Date, nullable=False)
-    time = Column(Time, nullable=False)
-    max_party_size = Column(Integer, default=8)
-    available = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        # Availability searches are one range scan of this index; a restaurant
+        # has at most one slot per date and time
+        Index(
+            "uq_availability_slots_restaurant_date_time",
+            "restaurant_id", "date", "time", unique=True
+        ),
+        # Never reuse the id of a slot moved to the archive
+        {"sqlite_autoincrement": True},
+    )
 
     # Relationships
     restaurant = relationship("Restaurant", back_populates="availability_slots")
@@ -188,3 +239,172 @@ class CancellationReason(Base):
     reason = Column(String, nullable=False)
     description = Column(Text)
 
+
+class ReferenceSequence(Base):
+    """
+    Named counter from which workers reserve blocks of sequence numbers.
+
+    Used by the booking reference generator so that references can be created
+    without querying the bookings table.
+
+    Attributes:
+        name (str): Sequence name (primary key)
+        next_value (int): First sequence number not yet reserved
+    """
+
+    __tablename__ = "reference_sequences"
+
+    name = Column(String, primary_key=True)
+    next_value = Column(Integer, nullable=False, default=0)
+
+
+class SlotTemplate(Base):
+    """
+    Opening-hours template row from which future availability slots are generated.
+
+    A restaurant's slots for a date are its template rows for that weekday
+    plus its rows with no weekday. Restaurants without templates use the
+    default times from settings (SLOT_TEMPLATE_TIMES).
+
+    Attributes:
+        id (int): Primary key identifier
+        restaurant_id (int): Foreign key to restaurant
+        weekday (int): 0 = Monday ... 6 = Sunday, or None for every day
+        time (time): Slot time
+        max_party_size (int): Maximum party size for generated slots
+        table_capacity (int): Parties each generated slot can seat
+        covers_capacity (int): People each generated slot can seat
+    """
+
+    __tablename__ = "slot_templates"
+
+    id = Column(Integer, primary_key=True)
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), nullable=False, index=True)
+    weekday = Column(Integer)
+    time = Column(Time, nullable=False)
+    max_party_size = Column(Integer, nullable=False, default=8)
+    table_capacity = Column(Integer, nullable=False, default=DEFAULT_TABLE_CAPACITY)
+    covers_capacity = Column(Integer, nullable=False, default=DEFAULT_COVERS_CAPACITY)
+
+
+class SlotHorizon(Base):
+    """
+    How far each restaurant's availability slots have been generated.
+
+    The slot horizon job only ever generates dates after ``generated_through``
+    and advances it in the same transaction, so it never rescans existing
+    slots and never creates a date twice, even with several workers.
+
+    Attributes:
+        restaurant_id (int): Restaurant (primary key)
+        generated_through (date): Last date slots were generated for
+    """
+
+    __tablename__ = "slot_horizons"
+
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    generated_through = Column(Date, nullable=False)
+
+
+class BookingVersion(Base):
+    """
+    Per-restaurant counter bumped by every booking change.
+
+    It is the validator of the owner booking list: the list's ETag changes
+    exactly when one of the restaurant's bookings is created, updated or
+    cancelled, so a revalidation is answered from this one row.
+
+    Attributes:
+        restaurant_id (int): Restaurant (primary key)
+        version (int): Number of booking changes so far
+    """
+
+    __tablename__ = "booking_versions"
+
+    restaurant_id = Column(Integer, ForeignKey("restaurants.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class CacheInvalidation(Base):
+    """
+    Change log that tells every API worker which cached data went stale.
+
+    Booking writes add a row in the same transaction as the change; each
+    worker polls for rows newer than the last one it saw and drops the matching
+    entries from its in-process caches (see app.invalidation).
+
+    Attributes:
+        id (int): Primary key, increasing in commit order
+        kind (str): "availability" or "restaurants"
+        restaurant_id (int): Restaurant whose availability changed
+        visit_date (date): Date whose availability changed
+        origin (int): Process id of the worker that wrote the change
+        created_at (datetime): When the change was written
+    """
+
+    __tablename__ = "cache_invalidations"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(20), nullable=False)
+    restaurant_id = Column(Integer, nullable=True)
+    visit_date = Column(Date, nullable=True)
+    origin = Column(Integer, nullable=False)
+    # Indexed for pruning
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class IdempotencyKey(Base):
+    """
+    Stored outcome of a write request sent with an ``Idempotency-Key`` header.
+
+    A row is written, with no response yet, when the first request with a key
+    starts; it then holds the response so retries with the same key are
+    answered from here without running the request again (see
+    app.idempotency). Rows expire after IDEMPOTENCY_TTL_SECONDS.
+
+    Attributes:
+        key (str): The client's idempotency key (primary key)
+        request_hash (str): SHA-256 of the request the key was first used for
+        status_code (int): Response status, or None while the request runs
+        headers (str): Response headers as a JSON list of [name, value] pairs
+        body (bytes): Response body
+        created_at (datetime): When the first request started
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    headers = Column(Text, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    # Indexed for expiry
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class ArchivedBooking(BookingColumns, Base):
+    """
+    Booking whose visit is older than the retention window.
+
+    Rows are moved here from ``bookings`` unchanged (same id and reference) by
+    the archiver, so the live table only holds recent and upcoming bookings.
+    Booking lookups and lists fall back to this table.
+    """
+
+    __tablename__ = "bookings_archive"
+    __table_args__ = (
+        # Serves the owner list fallback, newest visit first
+        Index("ix_bookings_archive_restaurant_visit", "restaurant_id", "visit_date", "visit_time"),
+    )
+
+    customer = relationship("Customer", viewonly=True)
+
+
+class ArchivedSlot(SlotColumns, Base):
+    """Availability slot older than the slot retention window, kept for reporting."""
+
+    __tablename__ = "availability_slots_archive"
+    __table_args__ = (
+        Index("ix_availability_slots_archive_restaurant_date", "restaurant_id", "date"),
+    )
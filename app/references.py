@@ -0,0 +1,267 @@
+"""
+Booking Reference Generation.
+
+This module turns sequence numbers into 7-character booking references without
+a database round trip per booking. Each worker reserves a block of sequence
+numbers from the ``reference_sequences`` table once, then encodes numbers from
+that block locally:
+
+- the sequence number is scrambled by a keyed pseudorandom permutation of
+  [0, 36^6): a Feistel network whose round function is keyed BLAKE2b (a
+  MAC, like HMAC but about three times faster here) keyed with
+  BOOKING_REFERENCE_SECRET. Without the secret, references seen so far
+  do not reveal which references were issued before or after them
+- the result is written as 6 base-36 characters (A-Z, 0-9)
+- a 7th check character catches any single mistyped character
+
+Because the permutation is a bijection and blocks never overlap, references
+cannot collide with each other; the unique constraint on
+``bookings.booking_reference`` remains the safety net for legacy references.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import hashlib
+import string
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import settings
+from app.database import _is_memory_database, build_async_engine
+from app.models import ReferenceSequence
+
+ALPHABET = string.ascii_uppercase + string.digits
+BASE = len(ALPHABET)
+PAYLOAD_LENGTH = 6
+SPACE = BASE ** PAYLOAD_LENGTH  # 2,176,782,336 distinct references
+# The Feistel network works on two halves of three base-36 digits each;
+# SPACE == HALF * HALF, so every round is a bijection of [0, SPACE) and no
+# cycle walking is needed
+HALF = BASE ** (PAYLOAD_LENGTH // 2)
+FEISTEL_ROUNDS = 8
+
+# Key used when BOOKING_REFERENCE_SECRET is unset; public, so development only
+DEVELOPMENT_SECRET = "development-only-booking-reference-secret"
+
+# Check character weights are coprime to 36 so every single-character
+# substitution changes the checksum
+CHECK_WEIGHTS = (1, 5, 7, 11, 13, 17)
+
+SEQUENCE_NAME = "booking_reference"
+
+
+@lru_cache(maxsize=8)
+def _round_key(secret: str) -> "hashlib.blake2b":
+    """BLAKE2b keyed with the secret (DEVELOPMENT_SECRET when empty), copied per round."""
+    key = hashlib.sha256((secret or DEVELOPMENT_SECRET).encode()).digest()
+    return hashlib.blake2b(key=key, digest_size=8, person=b"booking-ref")
+
+
+def _round_function(key: "hashlib.blake2b", round_number: int, half: int) -> int:
+    mac = key.copy()
+    mac.update(bytes((round_number,)) + half.to_bytes(2, "big"))
+    return int.from_bytes(mac.digest(), "big") % HALF
+
+
+def permute(sequence_number: int, secret: str) -> int:
+    """
+    Map a sequence number to its scrambled value with the keyed permutation.
+
+    Args:
+        sequence_number: A number in [0, SPACE)
+        secret: The BOOKING_REFERENCE_SECRET
+
+    Returns:
+        int: The scrambled value in [0, SPACE)
+    """
+    key = _round_key(secret)
+    left, right = divmod(sequence_number, HALF)
+    for round_number in range(FEISTEL_ROUNDS):
+        left, right = right, (left + _round_function(key, round_number, right)) % HALF
+    return left * HALF + right
+
+
+def unpermute(value: int, secret: str) -> int:
+    """
+    Invert ``permute``.
+
+    Args:
+        value: A scrambled value in [0, SPACE)
+        secret: The BOOKING_REFERENCE_SECRET it was scrambled with
+
+    Returns:
+        int: The sequence number
+    """
+    key = _round_key(secret)
+    left, right = divmod(value, HALF)
+    for round_number in reversed(range(FEISTEL_ROUNDS)):
+        left, right = (right - _round_function(key, round_number, left)) % HALF, left
+    return left * HALF + right
+
+
+def _check_character(payload: str) -> str:
+    """Compute the check character for a 6-character payload."""
+    total = sum(
+        weight * ALPHABET.index(char) for weight, char in zip(CHECK_WEIGHTS, payload)
+    )
+    return ALPHABET[total % BASE]
+
+
+def encode_reference(sequence_number: int) -> str:
+    """
+    Encode a sequence number as a 7-character booking reference.
+
+    Args:
+        sequence_number: A number in [0, 36^6)
+
+    Returns:
+        str: Six scrambled base-36 characters followed by a check character
+
+    Raises:
+        ValueError: If the sequence number is out of range
+    """
+    if not 0 <= sequence_number < SPACE:
+        raise ValueError("Booking reference sequence exhausted")
+
+    value = permute(sequence_number, settings.booking_reference_secret)
+    # Least significant digit first, so the fastest-changing digit leads
+    chars = []
+    for _ in range(PAYLOAD_LENGTH):
+        value, digit = divmod(value, BASE)
+        chars.append(ALPHABET[digit])
+    payload = "".join(chars)
+    return payload + _check_character(payload)
+
+
+def decode_reference(reference: str) -> Optional[int]:
+    """
+    Recover the sequence number behind a generated booking reference.
+
+    Args:
+        reference: A 7-character booking reference
+
+    Returns:
+        int or None: The sequence number, or None if the reference was not
+        produced by encode_reference (wrong length, alphabet or check character)
+    """
+    if len(reference) != PAYLOAD_LENGTH + 1 or any(c not in ALPHABET for c in reference):
+        return None
+    payload, check = reference[:PAYLOAD_LENGTH], reference[PAYLOAD_LENGTH]
+    if _check_character(payload) != check:
+        return None
+
+    value = 0
+    for char in reversed(payload):
+        value = value * BASE + ALPHABET.index(char)
+    return unpermute(value, settings.booking_reference_secret)
+
+
+class ReferenceAllocator:
+    """
+    Hands out booking references from locally reserved sequence blocks.
+
+    Attributes:
+        engine (AsyncEngine): Engine used only to reserve blocks
+        block_size (int): Sequence numbers reserved per database round trip
+    """
+
+    def __init__(self, engine: AsyncEngine, block_size: int) -> None:
+        self.engine = engine
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+
+    async def take(self, count: int = 1) -> List[str]:
+        """
+        Get ``count`` new booking references.
+
+        Must not be called while the caller's own session holds SQLite's write
+        lock, since reserving a block is a separate short write transaction.
+
+        Args:
+            count: Number of references needed
+
+        Returns:
+            list: Unique 7-character booking references
+        """
+        references: List[str] = []
+        async with self._lock:
+            while len(references) < count:
+                if self._next >= self._end:
+                    self._next, self._end = await _reserve_block(
+                        self.engine, max(self.block_size, count - len(references))
+                    )
+                stop = min(self._end, self._next + count - len(references))
+                references.extend(encode_reference(n) for n in range(self._next, stop))
+                self._next = stop
+        return references
+
+
+async def _reserve_block(engine: AsyncEngine, size: int) -> Tuple[int, int]:
+    """
+    Atomically reserve ``size`` sequence numbers in their own transaction.
+
+    Returns:
+        tuple: The reserved half-open range (start, end)
+    """
+    while True:
+        async with engine.begin() as conn:
+            end = await conn.scalar(
+                update(ReferenceSequence)
+                .where(ReferenceSequence.name == SEQUENCE_NAME)
+                .values(next_value=ReferenceSequence.next_value + size)
+                .returning(ReferenceSequence.next_value)
+            )
+            if end is not None:
+                return end - size, end
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    insert(ReferenceSequence).values(name=SEQUENCE_NAME, next_value=size)
+                )
+            return 0, size
+        except IntegrityError:
+            # Another worker created the row first; reserve from it instead
+            continue
+
+
+_allocators: Dict[str, ReferenceAllocator] = {}
+
+
+async def next_booking_references(db: AsyncSession, count: int = 1) -> List[str]:
+    """
+    Get new booking references for the database behind a session.
+
+    Args:
+        db: The request's async session (only its engine is used)
+        count: Number of references needed
+
+    Returns:
+        list: Unique 7-character booking references
+    """
+    url = db.bind.url.set(drivername="sqlite").render_as_string(hide_password=False)
+    allocator = _allocators.get(url)
+    if allocator is None:
+        # Blocks are reserved on their own unpooled connection so a request
+        # waiting for a block never competes with sessions for pool slots,
+        # and nothing is left open between blocks (or at shutdown)
+        engine = (db.bind if _is_memory_database(url)
+                  else build_async_engine(url, pooled=False))
+        allocator = _allocators.setdefault(
+            url, ReferenceAllocator(engine, settings.reference_block_size)
+        )
+    return await allocator.take(count)
+
+
+def reset_allocators() -> None:
+    """
+    Forget the per-database allocators, e.g. when the app is rebuilt on a new
+    in-memory database that happens to have the same URL.
+    """
+    _allocators.clear()
@@ -0,0 +1,86 @@
+"""
+Fast JSON Response Path.
+
+By default a handler's return value goes through FastAPI's
+``jsonable_encoder`` (a recursive walk that rebuilds every dict and converts
+dates one by one) and then stdlib ``json``. With FAST_JSON on, the listing and
+search endpoints instead return a prebuilt ``FastJSONResponse`` that encodes
+their plain dicts in one call with orjson, which handles ``date``, ``time``
+and ``datetime`` natively and produces the same JSON.
+
+orjson is pinned in requirements.txt. Where it is missing, the fast path
+still skips ``jsonable_encoder`` and encodes with stdlib ``json``, and the app
+logs a warning at startup.
+
+Author: AI Assistant
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(value: Any) -> str:
+    """Encode the date/time values stdlib ``json`` does not know."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode content the way FastAPI's default path would, in a single call.
+
+    Args:
+        content: Dicts, lists, strings, numbers, None, dates, times and datetimes
+
+    Returns:
+        bytes: UTF-8 JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with ``dumps`` instead of ``jsonable_encoder``."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_content(
+    content: Any,
+    response: Optional[Response] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Any:
+    """
+    Return a handler's JSON content through the configured path.
+
+    Args:
+        content: The response content (plain dicts and lists)
+        response: The handler's injected Response, which receives ``headers``
+            on the default path
+        headers: Extra response headers
+
+    Returns:
+        FastJSONResponse with FAST_JSON on, otherwise ``content`` unchanged
+        for FastAPI to encode
+    """
+    if settings.fast_json_enabled:
+        return FastJSONResponse(content, headers=headers)
+    if headers:
+        response.headers.update(headers)
+    return content
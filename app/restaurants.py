@@ -0,0 +1,154 @@
+"""
+In-Process Restaurant Directory.
+
+Every API route starts by resolving the ``restaurant_name`` path segment to a
+restaurant. Restaurants almost never change, so this module keeps an in-memory
+name -> RestaurantRef map that is loaded at startup, filled on a miss and
+cleared whenever a Restaurant row is inserted, updated or deleted through the
+ORM. Routes depend on ``get_restaurant`` instead of querying the table.
+
+Author: AI Assistant
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_db
+from app.models import Restaurant
+
+
+@dataclass(frozen=True)
+class RestaurantRef:
+    """
+    Immutable snapshot of the restaurant columns routes need.
+
+    Attributes:
+        id (int): Restaurant primary key
+        name (str): Restaurant name used in URLs
+        microsite_name (str): Microsite identifier
+    """
+
+    id: int
+    name: str
+    microsite_name: str
+
+
+class RestaurantDirectory:
+    """
+    Name -> RestaurantRef map shared by all requests in the process.
+
+    Attributes:
+        enabled (bool): When False every lookup goes to the database, which
+            allows A/B benchmarking against the uncached path
+        hits (int): Lookups served from memory
+        misses (int): Lookups that needed a query
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._by_name: Dict[str, RestaurantRef] = {}
+        self._lock = threading.Lock()
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        Replace the map with every restaurant in the database.
+
+        Args:
+            db: Async database session
+        """
+        rows = await db.execute(
+            select(Restaurant.id, Restaurant.name, Restaurant.microsite_name)
+        )
+        by_name = {row.name: RestaurantRef(*row) for row in rows}
+        with self._lock:
+            self._by_name = by_name
+
+    async def resolve(self, db: AsyncSession, name: str) -> Optional[RestaurantRef]:
+        """
+        Find a restaurant by name, querying the database only on a miss.
+
+        Unknown names are not remembered, so a restaurant added later is
+        found on its first request.
+
+        Args:
+            db: Async database session
+            name: Restaurant name from the URL
+
+        Returns:
+            RestaurantRef or None: The restaurant, or None if it does not exist
+        """
+        if self.enabled:
+            restaurant = self._by_name.get(name)
+            if restaurant is not None:
+                self.hits += 1
+                return restaurant
+
+        self.misses += 1
+        row = (await db.execute(
+            select(Restaurant.id, Restaurant.name, Restaurant.microsite_name)
+            .where(Restaurant.name == name)
+        )).first()
+        if row is None:
+            return None
+
+        restaurant = RestaurantRef(*row)
+        if self.enabled:
+            with self._lock:
+                self._by_name[name] = restaurant
+        return restaurant
+
+    def clear(self) -> None:
+        """Forget every restaurant; the next lookups reload from the database."""
+        with self._lock:
+            self._by_name = {}
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get directory counters.
+
+        Returns:
+            dict: Hit and miss counts plus the number of known restaurants
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._by_name)}
+
+
+# Shared directory used by the API routers
+restaurant_directory = RestaurantDirectory()
+
+
+@event.listens_for(Restaurant, "after_insert")
+@event.listens_for(Restaurant, "after_update")
+@event.listens_for(Restaurant, "after_delete")
+def _restaurant_changed(mapper, connection, target) -> None:
+    """Drop the directory when a restaurant row changes through the ORM."""
+    restaurant_directory.clear()
+
+
+async def get_restaurant(
+    restaurant_name: str,
+    db: AsyncSession = Depends(get_async_db)
+) -> RestaurantRef:
+    """
+    Resolve the ``restaurant_name`` path parameter for a route.
+
+    Args:
+        restaurant_name: Restaurant name from the URL path
+        db: Async database session (the request's shared session)
+
+    Returns:
+        RestaurantRef: The restaurant
+
+    Raises:
+        HTTPException: 404 if no restaurant has that name
+    """
+    restaurant = await restaurant_directory.resolve(db, restaurant_name)
+    if restaurant is None:
+        raise HTTPException(status_code=404, detail="Restaurant not found")
+    return restaurant
@@ -7,17 +7,25 @@ including time slot availability checks and booking constraint validation.
 Author: AI Assistant
 """
 
-from datetime import date
-from typing import Dict, Any
+from datetime import date, timedelta
+from typing import Dict, Any, List
 
 from fastapi import APIRouter, Form, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import Restaurant, AvailabilitySlot, Booking
+from app.cache import availability_cache
+from app.capacity import MIN_PARTY_SIZE, has_room_clause, slot_has_room
+from app.database import get_async_db
+from app.models import AvailabilitySlot
+from app.responses import json_content
+from app.restaurants import RestaurantRef, get_restaurant
 
 router = APIRouter(prefix="/api/ConsumerApi/v1/Restaurant", tags=["availability"])
 
+# Longest window a single range search may cover, in days
+MAX_RANGE_DAYS = 90
+
 # Fixed mock bearer token for authentication
 MOCK_BEARER_TOKEN = (
     "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJ1bmlxdWVfbmFtZSI6ImFwcGVsbGErYXBpQHJlc2"
@@ -56,6 +64,94 @@ def verify_token(authorization: str = Header(...)) -> str:
     return token
 
 
+# Columns needed by slot_detail, for loading slots as rows instead of entities
+SLOT_DETAIL_COLUMNS = (
+    AvailabilitySlot.date, AvailabilitySlot.time, AvailabilitySlot.available,
+    AvailabilitySlot.max_party_size, AvailabilitySlot.table_capacity,
+    AvailabilitySlot.booked_tables, AvailabilitySlot.covers_capacity,
+    AvailabilitySlot.booked_covers,
+)
+
+
+def slot_availability_query(
+    restaurant_id: int,
+    visit_date: date,
+    party_size: int
+) -> Select:
+    """
+    Build the query for a day's slots that can seat the party size.
+
+    Bookings are not counted here: each slot row carries its capacity and
+    maintained booked counters, so a day is answered by a single scan of
+    availability_slots. Slots are selected as plain rows of
+    SLOT_DETAIL_COLUMNS, skipping ORM entity hydration.
+
+    Args:
+        restaurant_id: The restaurant id
+        visit_date: The date to search
+        party_size: Number of people in the party
+
+    Returns:
+        Select: Rows of SLOT_DETAIL_COLUMNS ordered by time
+    """
+    return (
+        select(*SLOT_DETAIL_COLUMNS)
+        .where(
+            AvailabilitySlot.restaurant_id == restaurant_id,
+            AvailabilitySlot.date == visit_date,
+            AvailabilitySlot.max_party_size >= party_size
+        )
+        .order_by(AvailabilitySlot.time)
+    )
+
+
+def slot_range_summary_query(
+    restaurant_id: int,
+    date_from: date,
+    date_to: date,
+    party_size: int
+) -> Select:
+    """
+    Build the grouped query summarising each day of a date range.
+
+    Args:
+        restaurant_id: The restaurant id
+        date_from: First date of the range
+        date_to: Last date of the range (inclusive)
+        party_size: Number of people in the party
+
+    Returns:
+        Select: (date, total_slots, available_slots, first_available_time)
+        rows ordered by date, only for days that have slots
+    """
+    has_room = has_room_clause(party_size)
+    return (
+        select(
+            AvailabilitySlot.date,
+            func.count(AvailabilitySlot.id).label("total_slots"),
+            func.sum(case((has_room, 1), else_=0)).label("available_slots"),
+            func.min(case((has_room, AvailabilitySlot.time))).label("first_available_time")
+        )
+        .where(
+            AvailabilitySlot.restaurant_id == restaurant_id,
+            AvailabilitySlot.date.between(date_from, date_to),
+            AvailabilitySlot.max_party_size >= party_size
+        )
+        .group_by(AvailabilitySlot.date)
+        .order_by(AvailabilitySlot.date)
+    )
+
+
+def slot_detail(slot: AvailabilitySlot, party_size: int) -> Dict[str, Any]:
+    """Serialize one slot (or a row of SLOT_DETAIL_COLUMNS) for the availability endpoints."""
+    return {
+        "time": slot.time.strftime("%H:%M:%S"),
+        "available": slot_has_room(slot, party_size),
+        "max_party_size": slot.max_party_size,
+        "current_bookings": slot.booked_tables
+    }
+
+
 @router.post(
     "/{restaurant_name}/AvailabilitySearch",
     summary="Search Available Time Slots",
@@ -64,67 +160,53 @@ def verify_token(authorization: str = Header(...)) -> str:
 async def availability_search(
     restaurant_name: str,
     VisitDate: date = Form(..., description="Visit date in YYYY-MM-DD format"),
-    PartySize: int = Form(..., description="Number of people in the party"),
+    PartySize: int = Form(
+        ..., ge=MIN_PARTY_SIZE, description="Number of people in the party"
+    ),
     ChannelCode: str = Form(..., description="Booking channel (e.g., 'ONLINE')"),
-    db: Session = Depends(get_db)
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ) -> Dict[str, Any]:
     """
     Search for available booking slots at a restaurant.
 
-    Retrieves available time slots for a specific restaurant, date, and party size.
-    The system checks base availability slots and current booking counts to determine
-    real-time availability.
+    Retrieves the time slots for a specific restaurant, date, and party size.
+    Each slot row carries its capacity and the ``booked_tables`` and
+    ``booked_covers`` counters that booking writes maintain, so availability
+    is read from the slots alone with one scan of the day's rows; bookings are
+    not counted. Results are served from the in-process availability cache when
+    possible; booking mutations invalidate the cached searches for the dates
+    they touch, and a result read while such a mutation committed is not
+    cached. The endpoint is open: no token is required.
 
     Args:
         restaurant_name: The name of the restaurant
         VisitDate: The desired visit date
-        PartySize: Number of people in the party
+        PartySize: Number of people in the party (at least 1)
         ChannelCode: The booking channel identifier
-        db: Database session dependency
-        token: Authentication token dependency
+        restaurant: The resolved restaurant
+        db: Async database session dependency
 
     Returns:
         Dict containing restaurant info and available time slots
 
     Raises:
         HTTPException: 404 if restaurant not found
-        HTTPException: 401 if authentication fails
     """
-    # Find restaurant by name
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-
-    # Get availability slots for the requested date
-    slots = db.query(AvailabilitySlot).filter(
-        AvailabilitySlot.restaurant_id == restaurant.id,
-        AvailabilitySlot.date == VisitDate,
-        AvailabilitySlot.max_party_size >= PartySize
-    ).all()
-
-    # Check for existing bookings at each slot time
-    available_slots = []
-    for slot in slots:
-        # Count existing bookings for this time slot
-        existing_bookings = db.query(Booking).filter(
-            Booking.restaurant_id == restaurant.id,
-            Booking.visit_date == VisitDate,
-            Booking.visit_time == slot.time,
-            Booking.status == "confirmed"
-        ).count()
-
-        # Simple logic: allow up to 3 bookings per time slot
-        max_bookings_per_slot = 3
-        is_available = slot.available and existing_bookings < max_bookings_per_slot
-
-        available_slots.append({
-            "time": slot.time.strftime("%H:%M:%S"),
-            "available": is_available,
-            "max_party_size": slot.max_party_size,
-            "current_bookings": existing_bookings
-        })
+    available_slots = availability_cache.get(restaurant.id, VisitDate, PartySize)
+    if available_slots is None:
+        # A booking committed while the query runs invalidates the date after
+        # this read, and the cache then refuses the possibly stale result
+        generation = availability_cache.generation(restaurant.id, VisitDate)
+        slots = await db.execute(
+            slot_availability_query(restaurant.id, VisitDate, PartySize)
+        )
+        available_slots = [slot_detail(slot, PartySize) for slot in slots]
+        availability_cache.set(
+            restaurant.id, VisitDate, PartySize, available_slots, generation
+        )
 
-    return {
+    return json_content({
         "restaurant": restaurant_name,
         "restaurant_id": restaurant.id,
         "visit_date": VisitDate,
@@ -132,4 +214,110 @@ async def availability_search(
         "channel_code": ChannelCode,
         "available_slots": available_slots,
         "total_slots": len(available_slots)
-    }
+    })
+
+
+@router.post(
+    "/{restaurant_name}/AvailabilitySearchRange",
+    summary="Search Availability Over a Date Range",
+    response_description="Per-day availability summary, optionally with slot detail"
+)
+async def availability_search_range(
+    restaurant_name: str,
+    DateFrom: date = Form(..., description="First date of the range in YYYY-MM-DD format"),
+    DateTo: date = Form(..., description="Last date of the range (inclusive)"),
+    PartySize: int = Form(
+        ..., ge=MIN_PARTY_SIZE, description="Number of people in the party"
+    ),
+    ChannelCode: str = Form(..., description="Booking channel (e.g., 'ONLINE')"),
+    IncludeSlots: bool = Form(False, description="Include per-slot detail for each day"),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """
+    Summarise availability for every day between DateFrom and DateTo.
+
+    Replaces one AvailabilitySearch call per day when filling a calendar or
+    looking for the next free table. The whole window is answered with a
+    single query: a grouped aggregate for the summary, or one scan of the
+    window's slots when IncludeSlots is set. Every day in the range is
+    returned, with zero counts for days without slots.
+
+    Args:
+        restaurant_name: The name of the restaurant
+        DateFrom: First date of the range
+        DateTo: Last date of the range (inclusive)
+        PartySize: Number of people in the party
+        ChannelCode: The booking channel identifier
+        IncludeSlots: Add the AvailabilitySearch slot list to each day
+        restaurant: The resolved restaurant
+        db: Async database session dependency
+
+    Returns:
+        Dict containing restaurant info and one summary per day
+
+    Raises:
+        HTTPException: 404 if restaurant not found
+        HTTPException: 400 if the range is reversed or longer than MAX_RANGE_DAYS
+    """
+    if DateTo < DateFrom:
+        raise HTTPException(status_code=400, detail="DateTo must not be before DateFrom")
+    day_count = (DateTo - DateFrom).days + 1
+    if day_count > MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days"
+        )
+
+    summaries: Dict[date, Dict[str, Any]] = {}
+    if IncludeSlots:
+        # Plain column rows: no ORM identity map work for a month of slots
+        slots = await db.execute(
+            select(*SLOT_DETAIL_COLUMNS)
+            .where(
+                AvailabilitySlot.restaurant_id == restaurant.id,
+                AvailabilitySlot.date.between(DateFrom, DateTo),
+                AvailabilitySlot.max_party_size >= PartySize
+            )
+            .order_by(AvailabilitySlot.date, AvailabilitySlot.time)
+        )
+        slots_by_date: Dict[date, List[Dict[str, Any]]] = {}
+        for slot in slots:
+            slots_by_date.setdefault(slot.date, []).append(slot_detail(slot, PartySize))
+        for slot_date, day_slots in slots_by_date.items():
+            open_times = [slot["time"] for slot in day_slots if slot["available"]]
+            summaries[slot_date] = {
+                "total_slots": len(day_slots),
+                "available_slots": len(open_times),
+                "first_available_time": open_times[0] if open_times else None,
+                "slots": day_slots
+            }
+    else:
+        rows = await db.execute(
+            slot_range_summary_query(restaurant.id, DateFrom, DateTo, PartySize)
+        )
+        for slot_date, total, available, first_time in rows:
+            summaries[slot_date] = {
+                "total_slots": total,
+                "available_slots": available,
+                "first_available_time": first_time.strftime("%H:%M:%S") if first_time else None
+            }
+
+    empty_day = {"total_slots": 0, "available_slots": 0, "first_available_time": None}
+    if IncludeSlots:
+        empty_day["slots"] = []
+    days = []
+    for offset in range(day_count):
+        visit_date = DateFrom + timedelta(days=offset)
+        days.append({"visit_date": visit_date, **summaries.get(visit_date, empty_day)})
+
+    return json_content({
+        "restaurant": restaurant_name,
+        "restaurant_id": restaurant.id,
+        "date_from": DateFrom,
+        "date_to": DateTo,
+        "party_size": PartySize,
+        "channel_code": ChannelCode,
+        "days": days,
+        "available_days": sum(1 for day in days if day["available_slots"])
+    })
@@ -0,0 +1,388 @@
+"""
+Batch Booking Router for Restaurant Booking API.
+
+This module handles bulk ingestion of bookings pushed by partner channels.
+A single request carries a JSON array or NDJSON stream of bookings which are
+validated against availability slots in bulk, linked to customers by email
+and inserted chunk by chunk, each chunk in one transaction.
+
+Author: AI Assistant
+"""
+
+import json
+from datetime import date, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import func, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import availability_cache
+from app.capacity import MIN_PARTY_SIZE
+from app.database import get_async_db
+from app.http_cache import bump_booking_version
+from app.invalidation import invalidation_bus
+from app.models import Customer, Booking, AvailabilitySlot
+from app.references import next_booking_references
+from app.restaurants import RestaurantRef, get_restaurant
+from app.routers.booking import CustomerData, verify_token
+
+router = APIRouter(prefix="/api/ConsumerApi/v1/Restaurant", tags=["booking"])
+
+MAX_CHUNK_SIZE = 1000
+# Most bookings one request may carry; larger imports are split by the caller
+MAX_BATCH_ITEMS = 10_000
+
+
+class BatchBookingItem(BaseModel):
+    VisitDate: date
+    VisitTime: time
+    PartySize: int = Field(ge=MIN_PARTY_SIZE)
+    ChannelCode: str
+    SpecialRequests: Optional[str] = None
+    IsLeaveTimeConfirmed: Optional[bool] = None
+    RoomNumber: Optional[str] = None
+    Customer: CustomerData = CustomerData()
+
+
+def parse_batch_body(body: bytes, content_type: str) -> List[Any]:
+    """
+    Decode a batch request body into a list of raw booking objects.
+
+    Args:
+        body: The raw request body
+        content_type: The request Content-Type header
+
+    Returns:
+        list: One decoded JSON value per booking
+
+    Raises:
+        HTTPException: 400 if the body is not a JSON array or valid NDJSON
+    """
+    try:
+        if "ndjson" in content_type or "jsonlines" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = json.loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=f"Malformed batch body: {exc}")
+
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Batch body must be a JSON array")
+    return items
+
+
+def customer_row(data: CustomerData) -> Dict[str, Any]:
+    """
+    Map customer fields from a batch item onto Customer columns.
+
+    Args:
+        data: Customer details from the batch item
+
+    Returns:
+        dict: Column values for a Customer insert
+    """
+    return {
+        "title": data.Title,
+        "first_name": data.FirstName,
+        "surname": data.Surname,
+        "mobile_country_code": data.MobileCountryCode,
+        "mobile": data.Mobile,
+        "phone_country_code": data.PhoneCountryCode,
+        "phone": data.Phone,
+        "email": data.Email,
+        "receive_email_marketing": data.ReceiveEmailMarketing or False,
+        "receive_sms_marketing": data.ReceiveSmsMarketing or False,
+        "group_email_marketing_opt_in_text": data.GroupEmailMarketingOptInText,
+        "group_sms_marketing_opt_in_text": data.GroupSmsMarketingOptInText,
+        "receive_restaurant_email_marketing": data.ReceiveRestaurantEmailMarketing or False,
+        "receive_restaurant_sms_marketing": data.ReceiveRestaurantSmsMarketing or False,
+        "restaurant_email_marketing_opt_in_text": data.RestaurantEmailMarketingOptInText,
+        "restaurant_sms_marketing_opt_in_text": data.RestaurantSmsMarketingOptInText,
+    }
+
+
+async def _resolve_customers(
+    db: AsyncSession,
+    items: List[Tuple[int, BatchBookingItem]]
+) -> Dict[int, int]:
+    """
+    Upsert the customer of every item in bulk.
+
+    Customers with an email are written with one multi-row INSERT ... ON
+    CONFLICT (email) DO UPDATE: existing ones take the item's marketing flags
+    and any name fields it carries, and when an email appears more than once
+    in the chunk its last item wins. Items without an email each get a new
+    customer, as in the single booking endpoint.
+
+    Returns:
+        dict: Item index -> customer id
+    """
+    rows_by_email: Dict[str, Dict[str, Any]] = {}
+    no_email: List[int] = []
+    for index, item in items:
+        if item.Customer.Email:
+            rows_by_email[item.Customer.Email] = customer_row(item.Customer)
+        else:
+            no_email.append(index)
+
+    ids_by_email: Dict[str, int] = {}
+    if rows_by_email:
+        upsert = insert(Customer)
+        new = upsert.excluded
+        rows = await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[Customer.email],
+                set_={
+                    # A partner that omits a name keeps the one on file
+                    "title": func.coalesce(new.title, Customer.title),
+                    "first_name": func.coalesce(new.first_name, Customer.first_name),
+                    "surname": func.coalesce(new.surname, Customer.surname),
+                    "receive_email_marketing": new.receive_email_marketing,
+                    "receive_sms_marketing": new.receive_sms_marketing,
+                    "receive_restaurant_email_marketing":
+                        new.receive_restaurant_email_marketing,
+                    "receive_restaurant_sms_marketing":
+                        new.receive_restaurant_sms_marketing,
+                }
+            ).returning(Customer.email, Customer.id),
+            list(rows_by_email.values())
+        )
+        ids_by_email = {email: customer_id for email, customer_id in rows}
+
+    no_email_ids: Dict[int, int] = {}
+    if no_email:
+        by_index = dict(items)
+        inserted = await db.execute(
+            insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+            [customer_row(by_index[index].Customer) for index in no_email]
+        )
+        no_email_ids = dict(zip(no_email, inserted.scalars()))
+
+    return {
+        index: (
+            ids_by_email[item.Customer.Email] if item.Customer.Email
+            else no_email_ids[index]
+        )
+        for index, item in items
+    }
+
+
+async def ingest_chunk(
+    db: AsyncSession,
+    restaurant: RestaurantRef,
+    items: List[Tuple[int, BatchBookingItem]]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Validate, claim slots and insert one chunk of bookings in one transaction.
+
+    Slot counters are read (and the write lock taken) with one UPDATE ...
+    RETURNING, capacity is allocated to items in request order and the new
+    counters are written back with one executemany UPDATE. An item only
+    succeeds if its slot still had a free table and enough covers, matching
+    the single booking endpoint.
+
+    Args:
+        db: Async database session
+        restaurant: The target restaurant
+        items: (request index, validated item) pairs
+
+    Returns:
+        dict: Request index -> per-item result
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    # Reserved before the slot claim takes the write lock; unused ones are skipped
+    references = await next_booking_references(db, len(items))
+    dates = {item.VisitDate for _, item in items}
+    # A no-op UPDATE ... RETURNING both reads the slot counters and takes the
+    # SQLite write lock, so nothing can claim these slots until the commit
+    # and the counters written back below are exact
+    slot_rows = await db.execute(
+        update(AvailabilitySlot)
+        .where(
+            AvailabilitySlot.restaurant_id == restaurant.id,
+            AvailabilitySlot.date.in_(dates)
+        )
+        .values(booked_tables=AvailabilitySlot.booked_tables)
+        .returning(
+            AvailabilitySlot.id, AvailabilitySlot.date, AvailabilitySlot.time,
+            AvailabilitySlot.available, AvailabilitySlot.max_party_size,
+            AvailabilitySlot.table_capacity, AvailabilitySlot.booked_tables,
+            AvailabilitySlot.covers_capacity, AvailabilitySlot.booked_covers
+        )
+        .execution_options(synchronize_session=False)
+    )
+    slots = {(row.date, row.time): row._asdict() for row in slot_rows}
+
+    # Items claim capacity in request order, like consecutive single bookings
+    accepted = []
+    touched = {}
+    for index, item in items:
+        slot = slots.get((item.VisitDate, item.VisitTime))
+        if slot is None:
+            results[index] = {
+                "status": "rejected",
+                "error": "No availability slot found for that date/time"
+            }
+        elif item.PartySize > slot["max_party_size"]:
+            results[index] = {
+                "status": "rejected",
+                "error": "Party size exceeds slot capacity"
+            }
+        elif (
+            not slot["available"]
+            or slot["booked_tables"] >= slot["table_capacity"]
+            or slot["booked_covers"] + item.PartySize > slot["covers_capacity"]
+        ):
+            results[index] = {
+                "status": "rejected",
+                "error": "Selected time slot is not available"
+            }
+        else:
+            slot["booked_tables"] += 1
+            slot["booked_covers"] += item.PartySize
+            touched[slot["id"]] = slot
+            accepted.append((index, item))
+
+    if touched:
+        # ORM bulk UPDATE by primary key: one executemany statement
+        await db.execute(
+            update(AvailabilitySlot),
+            [
+                {
+                    "id": slot["id"],
+                    "booked_tables": slot["booked_tables"],
+                    "booked_covers": slot["booked_covers"],
+                }
+                for slot in touched.values()
+            ]
+        )
+
+    if accepted:
+        customer_ids = await _resolve_customers(db, accepted)
+        booking_rows = [
+            {
+                "booking_reference": reference,
+                "restaurant_id": restaurant.id,
+                "customer_id": customer_ids[index],
+                "visit_date": item.VisitDate,
+                "visit_time": item.VisitTime,
+                "party_size": item.PartySize,
+                "channel_code": item.ChannelCode,
+                "special_requests": item.SpecialRequests,
+                "is_leave_time_confirmed": item.IsLeaveTimeConfirmed or False,
+                "room_number": item.RoomNumber,
+                "status": "confirmed",
+            }
+            for (index, item), reference in zip(accepted, references)
+        ]
+        try:
+            inserted = (await db.execute(
+                insert(Booking).returning(
+                    Booking.id, Booking.booking_reference, sort_by_parameter_order=True
+                ),
+                booking_rows
+            )).all()
+        except IntegrityError:
+            # A reference matched a legacy random reference; nothing was written
+            await db.rollback()
+            for index, _ in accepted:
+                results[index] = {
+                    "status": "rejected",
+                    "error": "Booking reference collision, please retry"
+                }
+            return results
+
+        for (index, _), (booking_id, reference) in zip(accepted, inserted):
+            results[index] = {
+                "status": "created",
+                "booking_reference": reference,
+                "booking_id": booking_id,
+                "customer_id": customer_ids[index],
+            }
+
+    if accepted:
+        await bump_booking_version(db, restaurant.id)
+    invalidation_bus.record(db, restaurant.id, *(item.VisitDate for _, item in accepted))
+    await db.commit()
+    for slot_date in {item.VisitDate for _, item in accepted}:
+        availability_cache.invalidate(restaurant.id, slot_date)
+    return results
+
+
+async def ingest_bookings(
+    db: AsyncSession,
+    restaurant: RestaurantRef,
+    raw_items: List[Any],
+    chunk_size: int = 500
+) -> List[Dict[str, Any]]:
+    """
+    Validate and ingest a batch of raw booking objects chunk by chunk.
+
+    Args:
+        db: Async database session
+        restaurant: The target restaurant
+        raw_items: Decoded JSON objects, one per booking
+        chunk_size: Number of bookings written per transaction
+
+    Returns:
+        list: One result per input item, in input order
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    valid: List[Tuple[int, BatchBookingItem]] = []
+    for index, raw in enumerate(raw_items):
+        try:
+            valid.append((index, BatchBookingItem.model_validate(raw)))
+        except ValidationError as exc:
+            results[index] = {
+                "status": "invalid",
+                "error": exc.errors(include_url=False, include_context=False)
+            }
+
+    for start in range(0, len(valid), chunk_size):
+        results.update(await ingest_chunk(db, restaurant, valid[start:start + chunk_size]))
+
+    return [{"index": index, **results[index]} for index in range(len(raw_items))]
+
+
+@router.post("/{restaurant_name}/Bookings/Batch")
+async def create_bookings_batch(
+    restaurant_name: str,
+    request: Request,
+    chunk_size: int = Query(500, ge=1, le=MAX_CHUNK_SIZE),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(verify_token),
+):
+    """
+    Create many bookings at once for partner/channel imports.
+
+    Body: a JSON array of booking objects, or NDJSON (one object per line) when
+    sent as ``application/x-ndjson``. Each object uses the same field names as
+    BookingWithStripeToken, with customer fields nested under ``Customer``.
+
+    Returns a per-item result list in input order; one item failing does not
+    affect the others. A body with more than MAX_BATCH_ITEMS bookings is
+    refused with 413 before any is written.
+    """
+    raw_items = parse_batch_body(
+        await request.body(), request.headers.get("content-type", "")
+    )
+    if len(raw_items) > MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {MAX_BATCH_ITEMS} bookings, "
+                   f"got {len(raw_items)}"
+        )
+    results = await ingest_bookings(db, restaurant, raw_items, chunk_size)
+    created = sum(1 for result in results if result["status"] == "created")
+
+    return {
+        "restaurant": restaurant_name,
+        "total": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
@@ -7,17 +7,37 @@ retrieval, updates, and cancellation of restaurant bookings.
 Author: AI Assistant
 """
 
-import random
-import string
+import base64
+import csv
+import io
+import json
 from datetime import date, time, datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Form, HTTPException, Depends, Header
+from fastapi import APIRouter, Form, HTTPException, Depends, Header, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from app.database import get_db
-from app.models import Restaurant, Customer, Booking, CancellationReason, AvailabilitySlot
+from sqlalchemy import Row, Select, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app.cache import availability_cache
+from app.capacity import (
+    INVALID_PARTY_SIZE, MIN_PARTY_SIZE, PARTY_TOO_LARGE, SLOT_MISSING, claim_slot,
+    release_slot, resize_claim
+)
+from app.database import get_async_db
+from app.http_cache import (
+    PRIVATE_REVALIDATE, PUBLIC_LONG_LIVED, booking_etag, booking_list_etag, booking_version,
+    bump_booking_version, cancellation_reasons, etag_matches, not_modified
+)
+from app.invalidation import invalidation_bus
+from app.models import ArchivedBooking, Customer, Booking, CancellationReason
+from app.references import next_booking_references
+from app.responses import json_content
+from app.restaurants import RestaurantRef, get_restaurant
+from app.write_queue import run_write
 
 
 router = APIRouter(prefix="/api/ConsumerApi/v1/Restaurant", tags=["booking"])
@@ -60,16 +80,6 @@ def verify_token(authorization: str = Header(...)) -> str:
     return token
 
 
-def generate_booking_reference() -> str:
-    """
-    Generate a unique 7-character alphanumeric booking reference.
-
-    Returns:
-        str: A unique booking reference code
-    """
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=7))
-
-
 class CustomerData(BaseModel):
     Title: Optional[str] = None
     FirstName: Optional[str] = None
@@ -89,12 +99,61 @@ class CustomerData(BaseModel):
     RestaurantSmsMarketingOptInText: Optional[str] = None
 
 
+async def move_booking_capacity(
+    db: AsyncSession,
+    restaurant_id: int,
+    booking: Booking,
+    new_date: date,
+    new_time: time,
+    new_party: int
+) -> None:
+    """
+    Update slot counters for a booking that changes slot and/or party size.
+
+    Must run before the booking's own fields are changed, inside a mutation
+    passed to ``run_write`` (which rolls the claim back if this raises).
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+        booking: The confirmed booking being updated
+        new_date: Requested visit date
+        new_time: Requested visit time
+        new_party: Requested party size
+
+    Raises:
+        HTTPException: 404 if the new slot does not exist, 400 if the party
+            is empty, too large for the slot or it has no room
+    """
+    if (new_date, new_time) != (booking.visit_date, booking.visit_time):
+        failure = await claim_slot(db, restaurant_id, new_date, new_time, new_party)
+        if not failure:
+            await release_slot(
+                db, restaurant_id, booking.visit_date, booking.visit_time, booking.party_size
+            )
+    elif new_party != booking.party_size:
+        failure = await resize_claim(
+            db, restaurant_id, new_date, new_time, booking.party_size, new_party
+        )
+    else:
+        return
+
+    if failure:
+        if failure == INVALID_PARTY_SIZE:
+            raise HTTPException(status_code=400, detail="Party size must be at least 1")
+        if failure == SLOT_MISSING:
+            raise HTTPException(status_code=404, detail="New time slot not found")
+        if failure == PARTY_TOO_LARGE:
+            raise HTTPException(status_code=400, detail="Party size exceeds slot capacity")
+        raise HTTPException(status_code=400, detail="That slot is no longer available")
+
+
 @router.post("/{restaurant_name}/BookingWithStripeToken")
 async def create_booking_with_stripe(
     restaurant_name: str,
     VisitDate: date = Form(...),
     VisitTime: time = Form(...),
-    PartySize: int = Form(...),
+    PartySize: int = Form(..., ge=MIN_PARTY_SIZE),
     ChannelCode: str = Form(...),
     SpecialRequests: Optional[str] = Form(None),
     IsLeaveTimeConfirmed: Optional[bool] = Form(None),
@@ -132,108 +191,112 @@ async def create_booking_with_stripe(
     RestaurantSmsMarketingOptInText: Optional[str] = Form(
         None, alias="Customer[RestaurantSmsMarketingOptInText]"
     ),
-    db: Session = Depends(get_db)
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new booking with Stripe payment token
+
+    The slot is claimed atomically and the whole booking is written in one commit.
     """
-    # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-    
-    # Check there is an available slot for this date/time
-    slot = db.query(AvailabilitySlot).filter(
-        AvailabilitySlot.restaurant_id == restaurant.id,
-        AvailabilitySlot.date == VisitDate,
-        AvailabilitySlot.time == VisitTime,
-    ).first()
-
-    if not slot:
-        raise HTTPException(status_code=400, detail="No availability slot found for that date/time")
-    if not slot.available:
-        raise HTTPException(status_code=400, detail="Selected time slot is not available")
-
-    # Create or find customer
-    customer = None
-    if Email:
-        customer = db.query(Customer).filter(Customer.email == Email).first()
-
-    if not customer:
-        customer = Customer(
-            title=Title,
-            first_name=FirstName,
-            surname=Surname,
-            mobile_country_code=MobileCountryCode,
-            mobile=Mobile,
-            phone_country_code=PhoneCountryCode,
-            phone=Phone,
-            email=Email,
-            receive_email_marketing=ReceiveEmailMarketing or False,
-            receive_sms_marketing=ReceiveSmsMarketing or False,
-            group_email_marketing_opt_in_text=GroupEmailMarketingOptInText,
-            group_sms_marketing_opt_in_text=GroupSmsMarketingOptInText,
-            receive_restaurant_email_marketing=ReceiveRestaurantEmailMarketing or False,
-            receive_restaurant_sms_marketing=ReceiveRestaurantSmsMarketing or False,
-            restaurant_email_marketing_opt_in_text=RestaurantEmailMarketingOptInText,
-            restaurant_sms_marketing_opt_in_text=RestaurantSmsMarketingOptInText
+    # Generate unique booking reference. This must happen before the slot
+    # claim takes the write lock; it only reaches the database once per block.
+    booking_reference = (await next_booking_references(db))[0]
+
+    async def create(db: AsyncSession) -> Dict[str, Any]:
+        # Take a table and the party's covers with a guarded UPDATE so concurrent
+        # requests cannot overbook the slot. The claim, customer and booking are
+        # committed together in a single transaction.
+        failure = await claim_slot(db, restaurant.id, VisitDate, VisitTime, PartySize)
+        if failure:
+            if failure == INVALID_PARTY_SIZE:
+                raise HTTPException(status_code=400, detail="Party size must be at least 1")
+            if failure == SLOT_MISSING:
+                raise HTTPException(
+                    status_code=400, detail="No availability slot found for that date/time"
+                )
+            if failure == PARTY_TOO_LARGE:
+                raise HTTPException(status_code=400, detail="Party size exceeds slot capacity")
+            raise HTTPException(status_code=400, detail="Selected time slot is not available")
+
+        # Create or find customer
+        customer = None
+        if Email:
+            customer = await db.scalar(select(Customer).where(Customer.email == Email))
+
+        if not customer:
+            customer = Customer(
+                title=Title,
+                first_name=FirstName,
+                surname=Surname,
+                mobile_country_code=MobileCountryCode,
+                mobile=Mobile,
+                phone_country_code=PhoneCountryCode,
+                phone=Phone,
+                email=Email,
+                receive_email_marketing=ReceiveEmailMarketing or False,
+                receive_sms_marketing=ReceiveSmsMarketing or False,
+                group_email_marketing_opt_in_text=GroupEmailMarketingOptInText,
+                group_sms_marketing_opt_in_text=GroupSmsMarketingOptInText,
+                receive_restaurant_email_marketing=ReceiveRestaurantEmailMarketing or False,
+                receive_restaurant_sms_marketing=ReceiveRestaurantSmsMarketing or False,
+                restaurant_email_marketing_opt_in_text=RestaurantEmailMarketingOptInText,
+                restaurant_sms_marketing_opt_in_text=RestaurantSmsMarketingOptInText
+            )
+            db.add(customer)
+
+        # Create booking; the customer is inserted first in the same flush
+        booking = Booking(
+            booking_reference=booking_reference,
+            restaurant_id=restaurant.id,
+            customer=customer,
+            visit_date=VisitDate,
+            visit_time=VisitTime,
+            party_size=PartySize,
+            channel_code=ChannelCode,
+            special_requests=SpecialRequests,
+            is_leave_time_confirmed=IsLeaveTimeConfirmed or False,
+            room_number=RoomNumber,
+            status="confirmed"
         )
-        db.add(customer)
-        db.commit()
-        db.refresh(customer)
-
-    # Generate unique booking reference
-    booking_reference = generate_booking_reference()
-    while db.query(Booking).filter(
-        Booking.booking_reference == booking_reference
-    ).first():
-        booking_reference = generate_booking_reference()
-
-    # Create booking
-    booking = Booking(
-        booking_reference=booking_reference,
-        restaurant_id=restaurant.id,
-        customer_id=customer.id,
-        visit_date=VisitDate,
-        visit_time=VisitTime,
-        party_size=PartySize,
-        channel_code=ChannelCode,
-        special_requests=SpecialRequests,
-        is_leave_time_confirmed=IsLeaveTimeConfirmed or False,
-        room_number=RoomNumber,
-        status="confirmed"
-    )
 
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
+        db.add(booking)
+        await bump_booking_version(db, restaurant.id)
+        invalidation_bus.record(db, restaurant.id, VisitDate)
+        try:
+            await db.flush()
+        except IntegrityError:
+            # Only possible if the reference matches a legacy random reference
+            raise HTTPException(
+                status_code=409, detail="Booking reference collision, please retry"
+            )
+
+        return {
+            "booking_reference": booking_reference,
+            "booking_id": booking.id,
+            "restaurant": restaurant_name,
+            "visit_date": VisitDate,
+            "visit_time": VisitTime,
+            "party_size": PartySize,
+            "channel_code": ChannelCode,
+            "special_requests": SpecialRequests,
+            "is_leave_time_confirmed": IsLeaveTimeConfirmed,
+            "room_number": RoomNumber,
+            "customer": {
+                "id": customer.id,
+                "title": customer.title,
+                "first_name": customer.first_name,
+                "surname": customer.surname,
+                "email": customer.email,
+                "mobile": customer.mobile
+            },
+            "status": "confirmed",
+            "created_at": booking.created_at
+        }
 
-    #  Mark the slot as taken
-    slot.available = False
-    db.commit()
-
-    return {
-        "booking_reference": booking_reference,
-        "booking_id": booking.id,
-        "restaurant": restaurant_name,
-        "visit_date": VisitDate,
-        "visit_time": VisitTime,
-        "party_size": PartySize,
-        "channel_code": ChannelCode,
-        "special_requests": SpecialRequests,
-        "is_leave_time_confirmed": IsLeaveTimeConfirmed,
-        "room_number": RoomNumber,
-        "customer": {
-            "id": customer.id,
-            "title": customer.title,
-            "first_name": customer.first_name,
-            "surname": customer.surname,
-            "email": customer.email,
-            "mobile": customer.mobile
-        },
-        "status": "confirmed",
-        "created_at": booking.created_at
-    }
+    response = await run_write(db, create)
+    availability_cache.invalidate(restaurant.id, VisitDate)
+    return response
 
 
 @router.post("/{restaurant_name}/Booking/{booking_reference}/Cancel")
@@ -243,7 +306,8 @@ async def cancel_booking(
     micrositeName: str = Form(...),
     bookingReference: str = Form(...),
     cancellationReasonId: int = Form(...),
-    db: Session = Depends(get_db)
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Cancel an existing booking
@@ -252,88 +316,108 @@ async def cancel_booking(
     if booking_reference != bookingReference:
         raise HTTPException(status_code=400, detail="Booking reference mismatch")
 
-    # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-
-    # Find booking
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
+    async def cancel(db: AsyncSession) -> Tuple[Dict[str, Any], date]:
+        # Find booking
+        booking = await db.scalar(select(Booking).where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        ))
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+
+        # Check if already cancelled
+        if booking.status == "cancelled":
+            raise HTTPException(status_code=400, detail="Booking is already cancelled")
+
+        # Validate cancellation reason
+        cancellation_reason = await db.scalar(select(CancellationReason).where(
+            CancellationReason.id == cancellationReasonId
+        ))
+        if not cancellation_reason:
+            raise HTTPException(status_code=400, detail="Invalid cancellation reason")
+
+        # Give the booking's table and covers back to its slot
+        if booking.status == "confirmed":
+            await release_slot(
+                db, restaurant.id, booking.visit_date, booking.visit_time, booking.party_size
+            )
+
+        # Update booking status
+        booking.status = "cancelled"
+        booking.cancellation_reason_id = cancellationReasonId
+        booking.updated_at = datetime.utcnow()
+        await bump_booking_version(db, restaurant.id)
+        invalidation_bus.record(db, restaurant.id, booking.visit_date)
+        await db.flush()
 
-    # Check if already cancelled
-    if booking.status == "cancelled":
-        raise HTTPException(status_code=400, detail="Booking is already cancelled")
-
-    # Validate cancellation reason
-    cancellation_reason = db.query(CancellationReason).filter(
-        CancellationReason.id == cancellationReasonId
-    ).first()
-    if not cancellation_reason:
-        raise HTTPException(status_code=400, detail="Invalid cancellation reason")
-
-    # Update booking status
-    booking.status = "cancelled"
-    booking.cancellation_reason_id = cancellationReasonId
-    booking.updated_at = datetime.utcnow()
-
-    # Free up the slot for that date/time
-    slot = db.query(AvailabilitySlot).filter(
-        AvailabilitySlot.restaurant_id == restaurant.id,
-        AvailabilitySlot.date == booking.visit_date,
-        AvailabilitySlot.time == booking.visit_time,
-    ).first()
-    if slot:
-        slot.available = True
-
-    db.commit()
-    db.refresh(booking)
+        return {
+            "booking_reference": booking_reference,
+            "booking_id": booking.id,
+            "restaurant": restaurant_name,
+            "microsite_name": micrositeName,
+            "cancellation_reason_id": cancellationReasonId,
+            "cancellation_reason": cancellation_reason.reason,
+            "status": "cancelled",
+            "cancelled_at": booking.updated_at,
+            "message": f"Booking {booking_reference} has been successfully cancelled"
+        }, booking.visit_date
 
-    return {
-        "booking_reference": booking_reference,
-        "booking_id": booking.id,
-        "restaurant": restaurant_name,
-        "microsite_name": micrositeName,
-        "cancellation_reason_id": cancellationReasonId,
-        "cancellation_reason": cancellation_reason.reason,
-        "status": "cancelled",
-        "cancelled_at": booking.updated_at,
-        "message": f"Booking {booking_reference} has been successfully cancelled"
-    }
+    response, visit_date = await run_write(db, cancel)
+    availability_cache.invalidate(restaurant.id, visit_date)
+    return response
 
 
 @router.get("/{restaurant_name}/Booking/{booking_reference}")
 async def get_booking(
     restaurant_name: str,
     booking_reference: str,
-    db: Session = Depends(get_db)
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get booking details by reference
+    Get booking details by reference, including archived bookings
+
+    Responses carry an ETag; a request whose If-None-Match still matches gets
+    an empty 304 after reading only the booking's id and updated_at.
     """
-    # Find restaurant
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
+    # Visits older than the retention window have been moved to the archive
+    models = (Booking, ArchivedBooking)
+    if if_none_match:
+        for model in models:
+            current = (await db.execute(select(model.id, model.updated_at).where(
+                model.booking_reference == booking_reference,
+                model.restaurant_id == restaurant.id
+            ))).first()
+            if current:
+                break
+        else:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        etag = booking_etag(*current)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, PRIVATE_REVALIDATE)
+        models = (model,)
 
     # Find booking with customer data
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
-    if not booking:
+    for model in models:
+        booking = await db.scalar(select(model).options(joinedload(model.customer)).where(
+            model.booking_reference == booking_reference,
+            model.restaurant_id == restaurant.id
+        ))
+        if booking:
+            break
+    else:
         raise HTTPException(status_code=404, detail="Booking not found")
+    response.headers["ETag"] = booking_etag(booking.id, booking.updated_at)
+    response.headers["Cache-Control"] = PRIVATE_REVALIDATE
 
     # Get cancellation reason if cancelled
     cancellation_reason = None
     if booking.status == "cancelled" and booking.cancellation_reason_id:
-        reason = db.query(CancellationReason).filter(
+        reason = await db.scalar(select(CancellationReason).where(
             CancellationReason.id == booking.cancellation_reason_id
-        ).first()
+        ))
         if reason:
             cancellation_reason = {
                 "id": reason.id,
@@ -374,208 +458,379 @@ async def update_booking(
     booking_reference: str,
     VisitDate: Optional[date] = Form(None),
     VisitTime: Optional[time] = Form(None),
-    PartySize: Optional[int] = Form(None),
+    PartySize: Optional[int] = Form(None, ge=MIN_PARTY_SIZE),
     SpecialRequests: Optional[str] = Form(None),
     IsLeaveTimeConfirmed: Optional[bool] = Form(None),
-    db: Session = Depends(get_db),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db),
     # NOTE: leave token off if customers can edit their booking too; keep it if you want owner-only
     # token: str = Depends(verify_token)
 ):
     """
-    Update an existing booking, enforcing slot availability rules:
-      - If date/time changes: target slot must exist AND be available
-      - Free old slot if no other confirmed bookings remain on it
-      - Mark new slot unavailable
+    Update an existing booking, enforcing slot capacity rules:
+      - If date/time changes: target slot must exist AND have room for the party
+      - The old slot gets its table and covers back
+      - If only the party size changes: the slot must have room for the extra covers
     """
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
+    async def update(db: AsyncSession) -> Tuple[Dict[str, Any], Tuple[date, ...]]:
+        booking = await db.scalar(select(Booking).where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        ))
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+
+        if booking.status == "cancelled":
+            raise HTTPException(status_code=400, detail="Cannot update cancelled booking")
+
+        # Track updates for response
+        updates: dict[str, Any] = {}
+        new_date = VisitDate if VisitDate is not None else booking.visit_date
+        new_time = VisitTime if VisitTime is not None else booking.visit_time
+        new_party = PartySize if PartySize is not None else booking.party_size
+
+        old_date = booking.visit_date
+        moving_slot = (new_date != booking.visit_date) or (new_time != booking.visit_time)
+
+        # Only confirmed bookings hold a table and covers in their slot
+        if booking.status == "confirmed":
+            await move_booking_capacity(
+                db, restaurant.id, booking, new_date, new_time, new_party
+            )
+
+        # Apply simple field updates
+        if VisitDate is not None and VisitDate != booking.visit_date:
+            booking.visit_date = VisitDate
+            updates["visit_date"] = VisitDate
+        if VisitTime is not None and VisitTime != booking.visit_time:
+            booking.visit_time = VisitTime
+            updates["visit_time"] = VisitTime
+        if PartySize is not None and PartySize != booking.party_size:
+            booking.party_size = PartySize
+            updates["party_size"] = PartySize
+        if SpecialRequests is not None and SpecialRequests != booking.special_requests:
+            booking.special_requests = SpecialRequests
+            updates["special_requests"] = SpecialRequests
+        if (IsLeaveTimeConfirmed is not None
+                and IsLeaveTimeConfirmed != booking.is_leave_time_confirmed):
+            booking.is_leave_time_confirmed = IsLeaveTimeConfirmed
+            updates["is_leave_time_confirmed"] = IsLeaveTimeConfirmed
+
+        stale_dates: Tuple[date, ...] = ()
+        if updates:
+            booking.updated_at = datetime.utcnow()
+            await bump_booking_version(db, restaurant.id)
+            if moving_slot or "party_size" in updates:
+                invalidation_bus.record(db, restaurant.id, old_date, new_date)
+                stale_dates = (old_date, new_date)
+            await db.flush()
+
+        return {
+            "booking_reference": booking_reference,
+            "booking_id": booking.id,
+            "restaurant": restaurant_name,
+            "updates": updates,
+            "status": "updated" if updates else "no_changes",
+            "updated_at": booking.updated_at,
+            "message": (
+                f"Booking {booking_reference} has been "
+                f"{'successfully updated' if updates else 'checked - no changes made'}"
+            )
+        }, stale_dates
+
+    response, stale_dates = await run_write(db, update)
+    for stale_date in stale_dates:
+        availability_cache.invalidate(restaurant.id, stale_date)
+    return response
+
+
+def encode_cursor(booking: Row) -> str:
+    """
+    Build the opaque list cursor pointing just past a booking.
 
-    if booking.status == "cancelled":
-        raise HTTPException(status_code=400, detail="Cannot update cancelled booking")
-
-    # Track updates for response
-    updates: dict[str, Any] = {}
-    new_date = VisitDate if VisitDate is not None else booking.visit_date
-    new_time = VisitTime if VisitTime is not None else booking.visit_time
-    new_party = PartySize if PartySize is not None else booking.party_size
-
-    moving_slot = (new_date != booking.visit_date) or (new_time != booking.visit_time)
-
-    # If moving, validate target slot and toggle availability flags
-    if moving_slot:
-        # Must have a defined target slot
-        new_slot = db.query(AvailabilitySlot).filter(
-            AvailabilitySlot.restaurant_id == restaurant.id,
-            AvailabilitySlot.date == new_date,
-            AvailabilitySlot.time == new_time
-        ).first()
-        if not new_slot:
-            raise HTTPException(status_code=404, detail="New time slot not found")
+    Args:
+        booking: The last booking row of a page
 
-        # Respect capacity: max party size and 'available' flag
-        if new_party > new_slot.max_party_size:
-            raise HTTPException(status_code=400, detail="Party size exceeds slot capacity")
+    Returns:
+        str: URL-safe cursor for the next page
+    """
+    raw = f"{booking.visit_date.isoformat()}|{booking.visit_time.isoformat()}|{booking.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-        # If you allow multiple bookings per slot, you’d check count here.
-        # For now, honor the boolean + any existing confirmed bookings rule.
-        existing_in_target = db.query(Booking).filter(
-            Booking.restaurant_id == restaurant.id,
-            Booking.visit_date == new_date,
-            Booking.visit_time == new_time,
-            Booking.status == "confirmed",
-            Booking.id != booking.id
-        ).count()
-
-        # With a boolean 'available', block if slot is marked unavailable OR already has any booking
-        if not new_slot.available or existing_in_target > 0:
-            raise HTTPException(status_code=400, detail="That slot is no longer available")
-
-        # Free old slot if it has no other confirmed bookings
-        old_slot = db.query(AvailabilitySlot).filter(
-            AvailabilitySlot.restaurant_id == restaurant.id,
-            AvailabilitySlot.date == booking.visit_date,
-            AvailabilitySlot.time == booking.visit_time
-        ).first()
-        if old_slot:
-            other_on_old = db.query(Booking).filter(
-                Booking.restaurant_id == restaurant.id,
-                Booking.visit_date == booking.visit_date,
-                Booking.visit_time == booking.visit_time,
-                Booking.status == "confirmed",
-                Booking.id != booking.id
-            ).count()
-            if other_on_old == 0:
-                old_slot.available = True
-
-        # Take the new slot
-        new_slot.available = False
-
-    # Apply simple field updates
-    if VisitDate is not None and VisitDate != booking.visit_date:
-        booking.visit_date = VisitDate
-        updates["visit_date"] = VisitDate
-    if VisitTime is not None and VisitTime != booking.visit_time:
-        booking.visit_time = VisitTime
-        updates["visit_time"] = VisitTime
-    if PartySize is not None and PartySize != booking.party_size:
-        booking.party_size = PartySize
-        updates["party_size"] = PartySize
-    if SpecialRequests is not None and SpecialRequests != booking.special_requests:
-        booking.special_requests = SpecialRequests
-        updates["special_requests"] = SpecialRequests
-    if (IsLeaveTimeConfirmed is not None
-            and IsLeaveTimeConfirmed != booking.is_leave_time_confirmed):
-        booking.is_leave_time_confirmed = IsLeaveTimeConfirmed
-        updates["is_leave_time_confirmed"] = IsLeaveTimeConfirmed
 
-    if updates:
-        booking.updated_at = datetime.utcnow()
-        db.commit()
-        db.refresh(booking)
+def decode_cursor(cursor: str) -> Tuple[date, time, int]:
+    """
+    Decode a list cursor into its (visit_date, visit_time, id) sort key.
+
+    Args:
+        cursor: Cursor returned in the X-Next-Cursor header
+
+    Returns:
+        tuple: The sort key of the last booking already returned
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        visit_date, visit_time, booking_id = raw.split("|")
+        return date.fromisoformat(visit_date), time.fromisoformat(visit_time), int(booking_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def booking_list_columns(model) -> Tuple:
+    """
+    Columns of the owner list for live or archived bookings.
 
+    The list is loaded as plain rows of these columns (the customer through an
+    outer join) rather than ORM entities, so no identity map or relationship
+    loading work is done per row.
+    """
+    return (
+        model.booking_reference, model.id, model.visit_date, model.visit_time,
+        model.party_size, model.status, model.created_at, model.updated_at,
+        Customer.id.label("customer_id"),
+        Customer.first_name.label("customer_first_name"),
+        Customer.surname.label("customer_surname"),
+        Customer.email.label("customer_email"),
+        Customer.mobile.label("customer_mobile"),
+    )
+
+
+def booking_list_row(b: Row, restaurant_name: str) -> Dict[str, Any]:
+    """Serialize a row of booking_list_columns for the owner dashboard table."""
     return {
-        "booking_reference": booking_reference,
-        "booking_id": booking.id,
+        "booking_reference": b.booking_reference,
+        "booking_id": b.id,
         "restaurant": restaurant_name,
-        "updates": updates,
-        "status": "updated" if updates else "no_changes",
-        "updated_at": booking.updated_at,
-        "message": (
-            f"Booking {booking_reference} has been "
-            f"{'successfully updated' if updates else 'checked - no changes made'}"
-        )
+        "visit_date": b.visit_date,
+        "visit_time": b.visit_time,
+        "party_size": b.party_size,
+        "status": b.status,
+        "customer": {
+            "id": b.customer_id,
+            "first_name": b.customer_first_name,
+            "surname": b.customer_surname,
+            "email": b.customer_email,
+            "mobile": b.customer_mobile,
+        },
+        "created_at": b.created_at,
+        "updated_at": b.updated_at,
     }
 
 
+# Column order of the CSV export; customer fields are flattened
+CSV_COLUMNS = [
+    "booking_reference", "booking_id", "restaurant", "visit_date", "visit_time",
+    "party_size", "status", "customer_id", "customer_first_name",
+    "customer_surname", "customer_email", "customer_mobile", "created_at", "updated_at",
+]
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows fetched from the database per round trip while exporting
+EXPORT_BATCH_SIZE = 500
+
+
+async def stream_booking_export(
+    db: AsyncSession,
+    queries: List[Select],
+    restaurant_name: str,
+    export_format: str
+) -> AsyncIterator[str]:
+    """
+    Yield a booking export chunk by chunk without loading all rows.
+
+    The export uses its own session on the request's engine so it does not
+    depend on the request session outliving the handler.
+
+    Args:
+        db: The request's async session (only its engine is used)
+        queries: Ordered booking queries exported one after the other (live
+            bookings, then the archive)
+        restaurant_name: Restaurant name written into every row
+        export_format: "ndjson" or "csv"
+
+    Yields:
+        str: Encoded lines, one batch of rows at a time
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    if export_format == "csv":
+        writer.writeheader()
+
+    async with AsyncSession(db.bind) as export_db:
+        for query in queries:
+            rows = await export_db.stream(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for partition in rows.partitions():
+                for b in partition:
+                    row = booking_list_row(b, restaurant_name)
+                    if export_format == "csv":
+                        customer = row.pop("customer")
+                        row.update({f"customer_{key}": value for key, value in customer.items()})
+                        writer.writerow({
+                            key: value.isoformat() if hasattr(value, "isoformat") else value
+                            for key, value in row.items()
+                        })
+                    else:
+                        buffer.write(
+                            json.dumps(row, default=lambda value: value.isoformat()) + "\n"
+                        )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def booking_list_query(
+    model,
+    restaurant_id: int,
+    status: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[Tuple[date, time, int]] = None
+) -> Select:
+    """
+    Build the owner list query for live or archived bookings.
+
+    Args:
+        model: Booking or ArchivedBooking
+        restaurant_id: The restaurant id
+        status: Only bookings with this status
+        date_from: Only visits on or after this date
+        date_to: Only visits on or before this date
+        after: Sort key of the last row already returned (keyset pagination)
+
+    Returns:
+        Select: Rows of booking_list_columns, newest visit first
+    """
+    q = (
+        select(*booking_list_columns(model))
+        .outerjoin(Customer, Customer.id == model.customer_id)
+        .where(model.restaurant_id == restaurant_id)
+    )
+    if status:
+        q = q.where(model.status == status)
+    if date_from:
+        q = q.where(model.visit_date >= date_from)
+    if date_to:
+        q = q.where(model.visit_date <= date_to)
+    if after:
+        q = q.where(tuple_(model.visit_date, model.visit_time, model.id) < tuple_(*after))
+    return q.order_by(model.visit_date.desc(), model.visit_time.desc(), model.id.desc())
+
+
 @router.get("/{restaurant_name}/Bookings")
 async def list_bookings(
     restaurant_name: str,
+    response: Response,
     status: Optional[str] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     limit: int = 100,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
+    if_none_match: Optional[str] = Header(None),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(verify_token),
 ):
     """
     List bookings for a restaurant (owner dashboard).
 
+    Bookings are ordered newest visit first by (visit_date, visit_time, id).
+
     Query params:
       - status: filter by booking status (e.g. "confirmed", "cancelled")
       - date_from, date_to: filter by visit_date range
-      - limit/offset: basic pagination
+      - limit: page size
+      - cursor: value of the previous page's X-Next-Cursor header; the next
+        page is found with an index seek instead of skipping rows
+      - offset: legacy pagination, ignored when a cursor is given
+      - format: "json" (default, one page), or "ndjson"/"csv" to stream every
+        matching booking from the cursor onwards as an export
+
+    Archived bookings follow the live ones, so paging (and exports) continue
+    seamlessly into history; the archive is only queried once the live
+    bookings are exhausted.
+
+    The ETag is the restaurant's booking version, so a dashboard poll with a
+    matching If-None-Match is answered with an empty 304 from one row.
     """
-    # Find restaurant
-    restaurant = (
-        db.query(Restaurant)
-        .filter(Restaurant.name == restaurant_name)
-        .first()
-    )
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
+    etag = booking_list_etag(restaurant.id, await booking_version(db, restaurant.id))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, PRIVATE_REVALIDATE)
+    cache_headers = {"ETag": etag, "Cache-Control": PRIVATE_REVALIDATE}
+
+    filters = dict(status=status, date_from=date_from, date_to=date_to)
+    after = decode_cursor(cursor) if cursor else None
+    live_query = booking_list_query(Booking, restaurant.id, after=after, **filters)
+
+    if format != "json":
+        archive_query = booking_list_query(ArchivedBooking, restaurant.id, after=after, **filters)
+        return StreamingResponse(
+            stream_booking_export(db, [live_query, archive_query], restaurant_name, format),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition":
+                    f'attachment; filename="{restaurant_name}-bookings.{format}"',
+                **cache_headers,
+            },
+        )
 
-    q = (
-        db.query(Booking)
-        .filter(Booking.restaurant_id == restaurant.id)
+    skip = offset if not cursor else 0
+    bookings = (await db.execute(live_query.offset(skip or None).limit(limit))).all()
+
+    if len(bookings) < limit:
+        # The live table is exhausted. Archived visits are all older than
+        # live ones, so the page continues in the archive.
+        archive_skip = 0
+        if bookings:
+            after = (bookings[-1].visit_date, bookings[-1].visit_time, bookings[-1].id)
+        elif skip:
+            live_total = await db.scalar(
+                select(func.count()).select_from(live_query.order_by(None).subquery())
+            )
+            archive_skip = skip - live_total
+        archive_query = booking_list_query(ArchivedBooking, restaurant.id, after=after, **filters)
+        bookings += (await db.execute(
+            archive_query.offset(archive_skip or None).limit(limit - len(bookings))
+        )).all()
+
+    # A full page may have more rows behind it
+    if bookings and len(bookings) == limit:
+        cache_headers["X-Next-Cursor"] = encode_cursor(bookings[-1])
+
+    return json_content(
+        [booking_list_row(b, restaurant_name) for b in bookings], response, cache_headers
     )
 
-    if status:
-        q = q.filter(Booking.status == status)
-
-    if date_from:
-        q = q.filter(Booking.visit_date >= date_from)
-
-    if date_to:
-        q = q.filter(Booking.visit_date <= date_to)
-
-    q = q.order_by(Booking.visit_date.desc(), Booking.visit_time.desc())
-
-    bookings = q.offset(offset).limit(limit).all()
-
-    # Serialize a compact row for the dashboard table
-    return [
-        {
-            "booking_reference": b.booking_reference,
-            "booking_id": b.id,
-            "restaurant": restaurant_name,
-            "visit_date": b.visit_date,
-            "visit_time": b.visit_time,
-            "party_size": b.party_size,
-            "status": b.status,
-            "customer": {
-                "id": b.customer.id if b.customer else None,
-                "first_name": b.customer.first_name if b.customer else None,
-                "surname": b.customer.surname if b.customer else None,
-                "email": b.customer.email if b.customer else None,
-                "mobile": b.customer.mobile if b.customer else None,
-            },
-            "created_at": b.created_at,
-            "updated_at": b.updated_at,
-        }
-        for b in bookings
-    ]
 
 @router.get("/{restaurant_name}/CancellationReasons")
 async def list_cancellation_reasons(
     restaurant_name: str,
-    db: Session = Depends(get_db)
+    if_none_match: Optional[str] = Header(None),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # verify restaurant exists (keeps the pattern consistent)
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-
-    reasons = db.query(CancellationReason).order_by(CancellationReason.id).all()
-    return [{"id": r.id, "reason": r.reason, "description": r.description} for r in reasons]
+    """
+    List the cancellation reasons from the in-memory snapshot
+    """
+    if cancellation_reasons.body is None:
+        await cancellation_reasons.load(db)
+    if etag_matches(if_none_match, cancellation_reasons.etag):
+        return not_modified(cancellation_reasons.etag, PUBLIC_LONG_LIVED)
+    return Response(
+        content=cancellation_reasons.body,
+        media_type="application/json",
+        headers={"ETag": cancellation_reasons.etag, "Cache-Control": PUBLIC_LONG_LIVED}
+    )
 
 @router.post("/{restaurant_name}/Booking/{booking_reference}/Update")
 async def update_booking(
@@ -583,70 +838,57 @@ async def update_booking(
     booking_reference: str,
     VisitDate: date = Form(...),
     VisitTime: time = Form(...),
-    PartySize: int = Form(...),
+    PartySize: int = Form(..., ge=MIN_PARTY_SIZE),
     SpecialRequests: str = Form(None),
-    db: Session = Depends(get_db),
+    restaurant: RestaurantRef = Depends(get_restaurant),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(verify_token)
 ):
-    # 1. Find restaurant & booking
-    restaurant = db.query(Restaurant).filter(Restaurant.name == restaurant_name).first()
-    if not restaurant:
-        raise HTTPException(status_code=404, detail="Restaurant not found")
-
-    booking = db.query(Booking).filter(
-        Booking.booking_reference == booking_reference,
-        Booking.restaurant_id == restaurant.id
-    ).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-    if booking.status == "cancelled":
-        raise HTTPException(status_code=400, detail="Cannot update a cancelled booking")
-
-    # 2. If moving to new slot, check availability
-    if booking.visit_date != VisitDate or booking.visit_time != VisitTime:
-        new_slot = db.query(AvailabilitySlot).filter(
-            AvailabilitySlot.restaurant_id == restaurant.id,
-            AvailabilitySlot.date == VisitDate,
-            AvailabilitySlot.time == VisitTime
-        ).first()
-        if not new_slot:
-            raise HTTPException(status_code=404, detail="New time slot not found")
-        if not new_slot.available:
-            raise HTTPException(status_code=400, detail="That slot is no longer available")
-
-        # Mark old slot as available (if no other confirmed bookings exist there)
-        old_slot = db.query(AvailabilitySlot).filter(
-            AvailabilitySlot.restaurant_id == restaurant.id,
-            AvailabilitySlot.date == booking.visit_date,
-            AvailabilitySlot.time == booking.visit_time
-        ).first()
-        if old_slot:
-            existing_old = db.query(Booking).filter(
-                Booking.restaurant_id == restaurant.id,
-                Booking.visit_date == booking.visit_date,
-                Booking.visit_time == booking.visit_time,
-                Booking.status == "confirmed",
-                Booking.id != booking.id
-            ).count()
-            if existing_old == 0:
-                old_slot.available = True
-
-        # Mark new slot as taken
-        new_slot.available = False
-
-    # 3. Update booking details
-    booking.visit_date = VisitDate
-    booking.visit_time = VisitTime
-    booking.party_size = PartySize
-    booking.special_requests = SpecialRequests
-    db.commit()
-    db.refresh(booking)
+    async def update(db: AsyncSession) -> Tuple[Dict[str, Any], Tuple[date, ...]]:
+        booking = await db.scalar(select(Booking).where(
+            Booking.booking_reference == booking_reference,
+            Booking.restaurant_id == restaurant.id
+        ))
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if booking.status == "cancelled":
+            raise HTTPException(status_code=400, detail="Cannot update a cancelled booking")
+
+        # 2. Move the booking's table and covers to the new slot / party size;
+        # only confirmed bookings hold any
+        old_date = booking.visit_date
+        slot_changed = (
+            booking.visit_date != VisitDate
+            or booking.visit_time != VisitTime
+            or booking.party_size != PartySize
+        )
+        if booking.status == "confirmed":
+            await move_booking_capacity(
+                db, restaurant.id, booking, VisitDate, VisitTime, PartySize
+            )
 
-    return {
-        "message": "Booking updated successfully",
-        "booking_reference": booking.booking_reference,
-        "visit_date": booking.visit_date,
-        "visit_time": booking.visit_time,
-        "party_size": booking.party_size,
-        "special_requests": booking.special_requests
-    }
+        # 3. Update booking details
+        booking.visit_date = VisitDate
+        booking.visit_time = VisitTime
+        booking.party_size = PartySize
+        booking.special_requests = SpecialRequests
+        await bump_booking_version(db, restaurant.id)
+        stale_dates: Tuple[date, ...] = ()
+        if slot_changed:
+            invalidation_bus.record(db, restaurant.id, old_date, VisitDate)
+            stale_dates = (old_date, VisitDate)
+        await db.flush()
+
+        return {
+            "message": "Booking updated successfully",
+            "booking_reference": booking.booking_reference,
+            "visit_date": booking.visit_date,
+            "visit_time": booking.visit_time,
+            "party_size": booking.party_size,
+            "special_requests": booking.special_requests
+        }, stale_dates
+
+    response, stale_dates = await run_write(db, update)
+    for stale_date in stale_dates:
+        availability_cache.invalidate(restaurant.id, stale_date)
+    return response
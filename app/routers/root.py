@@ -0,0 +1,120 @@
+"""
+Root Router for Restaurant Booking API.
+
+This module serves the API information document and the operational
+endpoints: statistics of the in-process caches and the write queue, and the
+Prometheus metrics.
+
+Author: AI Assistant
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.cache import availability_cache
+from app.invalidation import invalidation_bus
+from app.metrics import metrics
+from app.restaurants import restaurant_directory
+from app.write_queue import write_queue
+
+router = APIRouter(tags=["Root"])
+
+
+@router.get("/", summary="API Information")
+async def root() -> dict:
+    """
+    Get API information and available endpoints.
+
+    Returns:
+        dict: API metadata including version and available endpoint URLs.
+    """
+    return {
+        "message": "Restaurant Booking Mock API",
+        "version": "1.0.0",
+        "description": "Mock restaurant booking system for testing applications",
+        "endpoints": {
+            "availability_search": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
+                "AvailabilitySearch"
+            ),
+            "create_booking": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/"
+                "BookingWithStripeToken"
+            ),
+            "cancel_booking": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
+                "{booking_reference}/Cancel"
+            ),
+            "get_booking": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
+                "{booking_reference}"
+            ),
+            "update_booking": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Booking/"
+                "{booking_reference}"
+            ),
+            "create_bookings_batch": (
+                "/api/ConsumerApi/v1/Restaurant/{restaurant_name}/Bookings/Batch"
+            ),
+            "docs": "/docs",
+            "redoc": "/redoc"
+        }
+    }
+
+
+@router.get("/cache/availability", summary="Availability Cache Statistics")
+async def availability_cache_stats() -> dict:
+    """
+    Get counters for the in-process availability search cache.
+
+    Returns:
+        dict: Cache mode, size and hit/miss/eviction/invalidation counters.
+    """
+    return availability_cache.stats()
+
+
+@router.get("/cache/restaurants", summary="Restaurant Directory Statistics")
+async def restaurant_directory_stats() -> dict:
+    """
+    Get counters for the in-process restaurant name directory.
+
+    Returns:
+        dict: Hit/miss counters and the number of known restaurants.
+    """
+    return restaurant_directory.stats()
+
+
+@router.get("/cache/invalidations", summary="Invalidation Bus Statistics")
+async def invalidation_bus_stats() -> dict:
+    """
+    Get this worker's counters for the cross-worker invalidation bus.
+
+    Returns:
+        dict: Poll, applied and reset counts and the last change id seen.
+    """
+    return invalidation_bus.stats()
+
+
+@router.get("/cache/write-queue", summary="Write Queue Statistics")
+async def write_queue_stats() -> dict:
+    """
+    Get this worker's counters for the group commit write queue.
+
+    Returns:
+        dict: Whether the writer runs, batches committed, writes applied and
+            the mean batch size.
+    """
+    return write_queue.stats()
+
+
+@router.get("/metrics", summary="Prometheus Metrics")
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Get request latency, status code and SQL metrics.
+
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
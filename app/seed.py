@@ -0,0 +1,321 @@
+"""
+Bulk Seeding CLI.
+
+Generates a synthetic dataset at benchmark scale: N restaurants x D days x T
+slot times, M customers and B bookings, reproducibly from a fixed random seed.
+Rows are prepared in Python as tuples of database values and written with
+executemany of Core-compiled INSERTs in chunks, all inside one transaction,
+so a million slots and a million bookings load in well under a minute rather
+than the hours one ORM object at a time would take.
+
+Bookings are placed on random slots within each slot's capacity and the slots
+are written with matching booked counters, so the seeded database passes
+``python -m app.capacity`` without a repair.
+
+Usage:
+    python -m app.seed [--restaurants 10] [--days 30] [--times 8]
+        [--customers 1000] [--bookings 2000] [--seed 42] [--reset]
+
+    # ~1M slots and 1M bookings
+    python -m app.seed --restaurants 100 --days 365 --times 28 \\
+        --customers 200000 --bookings 1000000 --reset
+
+Author: AI Assistant
+"""
+
+import argparse
+import random
+import sys
+import time as timer
+from array import array
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Connection
+
+from app.database import get_engine
+from app.init_db import CANCELLATION_REASONS
+from app.migrate import migrate
+from app.models import (
+    Base, Restaurant, Customer, Booking, AvailabilitySlot, CancellationReason,
+    DEFAULT_TABLE_CAPACITY, DEFAULT_COVERS_CAPACITY
+)
+
+# Slot times start at 11:00 and are spaced 15 minutes apart
+FIRST_SLOT_MINUTE = 11 * 60
+SLOT_STEP_MINUTES = 15
+MAX_SLOT_TIMES = (24 * 60 - FIRST_SLOT_MINUTE) // SLOT_STEP_MINUTES
+
+FIRST_NAMES = ["Ada", "Ben", "Chloe", "Dev", "Ella", "Finn", "Grace", "Hugo", "Isla", "Jack"]
+SURNAMES = ["Smith", "Jones", "Taylor", "Brown", "Wilson", "Evans", "Patel", "Khan", "Wright"]
+CHANNELS = ["ONLINE", "ONLINE", "ONLINE", "PHONE", "PARTNER"]
+MAX_PARTY_SIZES = [4, 6, 8, 8, 10]
+
+# Share of slots the restaurant keeps closed and of bookings already cancelled
+CLOSED_SLOT_RATE = 0.05
+CANCELLED_RATE = 0.1
+
+
+def slot_times(count: int) -> List[time]:
+    """
+    Return ``count`` slot times from 11:00, 15 minutes apart.
+
+    Raises:
+        ValueError: If the times would run past midnight
+    """
+    if not 1 <= count <= MAX_SLOT_TIMES:
+        raise ValueError(f"times must be between 1 and {MAX_SLOT_TIMES}")
+    return [
+        time(minute // 60, minute % 60)
+        for minute in range(
+            FIRST_SLOT_MINUTE, FIRST_SLOT_MINUTE + count * SLOT_STEP_MINUTES, SLOT_STEP_MINUTES
+        )
+    ]
+
+
+def _chunks(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    """Group a row generator into lists of at most ``size`` rows."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk_insert(
+    connection: Connection,
+    model,
+    columns: Sequence[str],
+    rows: Iterable[Tuple],
+    chunk_size: int
+) -> None:
+    """
+    Write prepared rows with one executemany INSERT per chunk.
+
+    The INSERT is compiled once from the Core table and executed on the driver
+    with tuples that already hold database values, which skips SQLAlchemy's
+    per-row parameter processing (most of the cost at this scale).
+
+    Args:
+        connection: A sync connection inside the seeding transaction
+        model: The ORM model whose table receives the rows
+        columns: Column names, in the order of each row tuple
+        rows: Row tuples of bind-processed values (see ``_bind``)
+        chunk_size: Rows per executemany
+    """
+    compiled = insert(model.__table__).compile(dialect=connection.dialect, column_keys=columns)
+    if list(compiled.positiontup) != list(columns):
+        raise RuntimeError(f"Unexpected parameter order for {model.__tablename__}")
+    for chunk in _chunks(rows, chunk_size):
+        connection.exec_driver_sql(compiled.string, chunk)
+
+
+def _bind(connection: Connection, column, value: Any) -> Any:
+    """Convert one value the way SQLAlchemy would bind it for ``column``."""
+    processor = column.type.dialect_impl(connection.dialect).bind_processor(connection.dialect)
+    return processor(value) if processor else value
+
+
+def seed_database(
+    connection: Connection,
+    restaurants: int,
+    days: int,
+    times: int,
+    customers: int,
+    bookings: int,
+    seed: int = 42,
+    start_date: date = None,
+    chunk_size: int = 50000
+) -> Dict[str, int]:
+    """
+    Generate and insert a synthetic dataset into empty tables.
+
+    Args:
+        connection: A sync connection inside the seeding transaction
+        restaurants: Number of restaurants
+        days: Days of slots per restaurant, starting at ``start_date``
+        times: Slot times per day
+        customers: Number of customers
+        bookings: Number of bookings spread over the slots
+        seed: Random seed; the same arguments always produce the same data
+        start_date: First slot date (default: today)
+        chunk_size: Rows per executemany INSERT
+
+    Returns:
+        dict: Rows inserted per table, plus bookings that are confirmed
+    """
+    rng = random.Random(seed)
+    start_date = start_date or date.today()
+    created_at = datetime.utcnow()
+    day_dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    times_of_day = slot_times(times)
+    slots_per_restaurant = days * times
+    slot_count = restaurants * slots_per_restaurant
+
+    # Slot attributes first, so bookings can be placed within capacity
+    max_party = array("i", (rng.choice(MAX_PARTY_SIZES) for _ in range(slot_count)))
+    is_open = array("b", (rng.random() >= CLOSED_SLOT_RATE for _ in range(slot_count)))
+    booked_tables = array("i", bytes(4 * slot_count))
+    booked_covers = array("i", bytes(4 * slot_count))
+
+    placements = []
+    confirmed = 0
+    for _ in range(bookings):
+        slot = rng.randrange(slot_count)
+        party_size = rng.randint(1, min(6, max_party[slot]))
+        status = "cancelled" if rng.random() < CANCELLED_RATE else "confirmed"
+        if status == "confirmed":
+            if (
+                is_open[slot]
+                and booked_tables[slot] < DEFAULT_TABLE_CAPACITY
+                and booked_covers[slot] + party_size <= DEFAULT_COVERS_CAPACITY
+            ):
+                booked_tables[slot] += 1
+                booked_covers[slot] += party_size
+                confirmed += 1
+            else:
+                # No room left: keep the row as history rather than overbook
+                status = "cancelled"
+        placements.append((slot, party_size, status))
+
+    # Dates, times and timestamps are bound once per distinct value; every
+    # row then reuses the stored strings
+    created = _bind(connection, Restaurant.__table__.c.created_at, created_at)
+    slot_dates = [_bind(connection, AvailabilitySlot.__table__.c.date, day) for day in day_dates]
+    slot_clock = [_bind(connection, AvailabilitySlot.__table__.c.time, at) for at in times_of_day]
+
+    _bulk_insert(connection, Restaurant, ("id", "name", "microsite_name", "created_at"), (
+        (n + 1, f"SeedRestaurant{n + 1:05d}", f"SeedRestaurant{n + 1:05d}", created)
+        for n in range(restaurants)
+    ), chunk_size)
+
+    _bulk_insert(connection, AvailabilitySlot, (
+        "id", "restaurant_id", "date", "time", "max_party_size", "available",
+        "table_capacity", "covers_capacity", "booked_tables", "booked_covers", "created_at"
+    ), (
+        (
+            slot + 1,
+            slot // slots_per_restaurant + 1,
+            slot_dates[slot // times % days],
+            slot_clock[slot % times],
+            max_party[slot],
+            is_open[slot],
+            DEFAULT_TABLE_CAPACITY,
+            DEFAULT_COVERS_CAPACITY,
+            booked_tables[slot],
+            booked_covers[slot],
+            created,
+        )
+        for slot in range(slot_count)
+    ), chunk_size)
+
+    _bulk_insert(connection, Customer, (
+        "id", "first_name", "surname", "email", "receive_email_marketing",
+        "receive_sms_marketing", "receive_restaurant_email_marketing",
+        "receive_restaurant_sms_marketing", "created_at"
+    ), (
+        (
+            n + 1,
+            FIRST_NAMES[n % len(FIRST_NAMES)],
+            SURNAMES[n % len(SURNAMES)],
+            f"guest{n + 1}@example.com",
+            0, 0, 0, 0,
+            created,
+        )
+        for n in range(customers)
+    ), chunk_size)
+
+    _bulk_insert(connection, Booking, (
+        "id", "booking_reference", "restaurant_id", "customer_id", "visit_date",
+        "visit_time", "party_size", "channel_code", "is_leave_time_confirmed",
+        "status", "created_at", "updated_at"
+    ), (
+        (
+            n + 1,
+            # Longer than generated references, so the two never collide
+            f"S{n + 1:09d}",
+            slot // slots_per_restaurant + 1,
+            rng.randint(1, customers),
+            slot_dates[slot // times % days],
+            slot_clock[slot % times],
+            party_size,
+            CHANNELS[n % len(CHANNELS)],
+            0,
+            status,
+            created,
+            created,
+        )
+        for n, (slot, party_size, status) in enumerate(placements)
+    ), chunk_size)
+
+    if not connection.scalar(select(func.count()).select_from(CancellationReason)):
+        connection.execute(insert(CancellationReason.__table__), CANCELLATION_REASONS)
+
+    return {
+        "restaurants": restaurants,
+        "availability_slots": slot_count,
+        "customers": customers,
+        "bookings": bookings,
+        "confirmed_bookings": confirmed,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--restaurants", type=int, default=10)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--times", type=int, default=8)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="First slot date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--reset", action="store_true",
+                        help="Drop and recreate every table first")
+    args = parser.parse_args()
+
+    if args.bookings and not args.customers:
+        parser.error("--bookings needs at least one customer")
+    try:
+        slot_times(args.times)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    engine = get_engine()
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    migrate(sample_data=False)
+
+    started = timer.perf_counter()
+    with engine.begin() as connection:
+        if connection.scalar(select(func.count()).select_from(Restaurant)):
+            print("Database already has restaurants; rerun with --reset", file=sys.stderr)
+            return 1
+        # Building secondary indexes once after the load is much cheaper than
+        # maintaining them row by row
+        indexes = [index for table in Base.metadata.sorted_tables for index in table.indexes]
+        for index in indexes:
+            index.drop(bind=connection)
+        counts = seed_database(
+            connection, args.restaurants, args.days, args.times, args.customers,
+            args.bookings, seed=args.seed, start_date=args.start, chunk_size=args.chunk_size
+        )
+        for index in indexes:
+            index.create(bind=connection)
+    elapsed = timer.perf_counter() - started
+
+    for table, count in counts.items():
+        print(f"{table:>20}: {count}")
+    print(f"Seeded in {elapsed:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
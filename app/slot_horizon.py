@@ -0,0 +1,295 @@
+"""
+Rolling Availability Slot Horizon.
+
+Keeps every restaurant's availability slots generated a fixed number of days
+ahead and moves slots and bookings that are long past to the archive tables
+(see app.archive). A background task started with the application runs the
+job once at startup and then on an interval.
+
+The work is incremental: each restaurant's ``slot_horizons`` row records the
+last generated date, so a run only inserts the missing days (in batches of a
+few days per transaction), and archiving only touches the old end of the
+(restaurant_id, date) indexes. Advancing the horizon is a compare-and-set in
+the same transaction as the inserts, so repeated or concurrent runs never
+create a date twice; slots that already exist (e.g. added by hand) are kept
+as they are. A restaurant whose run fails is logged and skipped until the
+next run, so it cannot hold back the others.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import logging
+from datetime import date, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.archive import archive_cutoffs, archive_past_bookings, archive_past_slots
+from app.cache import availability_cache
+from app.config import settings
+from app.invalidation import invalidation_bus
+from app.models import (
+    AvailabilitySlot, Restaurant, SlotHorizon, SlotTemplate,
+    DEFAULT_TABLE_CAPACITY, DEFAULT_COVERS_CAPACITY
+)
+
+logger = logging.getLogger(__name__)
+
+
+def default_templates(times: str) -> List[Dict]:
+    """
+    Build every-day template rows from a comma-separated list of HH:MM times.
+
+    Args:
+        times: e.g. "12:00,12:30,19:00"
+
+    Returns:
+        list: Template dicts in the shape of SlotTemplate rows
+    """
+    return [
+        {
+            "weekday": None,
+            "time": time.fromisoformat(value.strip()),
+            "max_party_size": 8,
+            "table_capacity": DEFAULT_TABLE_CAPACITY,
+            "covers_capacity": DEFAULT_COVERS_CAPACITY,
+        }
+        for value in times.split(",") if value.strip()
+    ]
+
+
+async def load_templates(db: AsyncSession, restaurant_id: int) -> List[Dict]:
+    """
+    Load a restaurant's opening-hours templates, falling back to the defaults.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+
+    Returns:
+        list: Template dicts
+    """
+    rows = await db.execute(
+        select(
+            SlotTemplate.weekday, SlotTemplate.time, SlotTemplate.max_party_size,
+            SlotTemplate.table_capacity, SlotTemplate.covers_capacity
+        ).where(SlotTemplate.restaurant_id == restaurant_id)
+    )
+    templates = [row._asdict() for row in rows]
+    return templates or default_templates(settings.slot_template_times)
+
+
+def slots_for_day(restaurant_id: int, day: date, templates: List[Dict]) -> List[Dict]:
+    """Expand the templates that apply to ``day`` into slot rows."""
+    return [
+        {
+            "restaurant_id": restaurant_id,
+            "date": day,
+            "time": template["time"],
+            "max_party_size": template["max_party_size"],
+            "available": True,
+            "table_capacity": template["table_capacity"],
+            "covers_capacity": template["covers_capacity"],
+            "booked_tables": 0,
+            "booked_covers": 0,
+        }
+        for template in templates
+        if template["weekday"] is None or template["weekday"] == day.weekday()
+    ]
+
+
+async def _generated_through(db: AsyncSession, restaurant_id: int, today: date) -> date:
+    """
+    Read a restaurant's horizon, creating it on first use.
+
+    A restaurant that already has slots (e.g. from the sample data) starts at
+    its last slot date, found with one index seek.
+    """
+    horizon = await db.scalar(
+        select(SlotHorizon.generated_through).where(SlotHorizon.restaurant_id == restaurant_id)
+    )
+    if horizon is not None:
+        return horizon
+
+    last_slot = await db.scalar(
+        select(func.max(AvailabilitySlot.date)).where(
+            AvailabilitySlot.restaurant_id == restaurant_id
+        )
+    )
+    horizon = last_slot or today - timedelta(days=1)
+    try:
+        db.add(SlotHorizon(restaurant_id=restaurant_id, generated_through=horizon))
+        await db.commit()
+    except IntegrityError:
+        # Another worker created it first
+        await db.rollback()
+        horizon = await db.scalar(
+            select(SlotHorizon.generated_through)
+            .where(SlotHorizon.restaurant_id == restaurant_id)
+        )
+    return horizon
+
+
+async def extend_horizon(
+    db: AsyncSession,
+    restaurant_id: int,
+    today: date,
+    horizon_days: int,
+    batch_days: int
+) -> int:
+    """
+    Generate a restaurant's missing slots up to ``today + horizon_days``.
+
+    Args:
+        db: Async database session
+        restaurant_id: The restaurant id
+        today: Current date
+        horizon_days: Days ahead that must have slots
+        batch_days: Days written per transaction (at least 1)
+
+    Returns:
+        int: Number of slots inserted
+
+    Raises:
+        ValueError: If batch_days is less than 1
+    """
+    if batch_days < 1:
+        # A batch ending before it starts would never advance the horizon
+        raise ValueError(f"batch_days must be at least 1, got {batch_days}")
+    target = today + timedelta(days=horizon_days)
+    generated_through = await _generated_through(db, restaurant_id, today)
+    if generated_through >= target:
+        return 0
+
+    templates = await load_templates(db, restaurant_id)
+    inserted = 0
+    # Never backfill the past
+    start = max(generated_through + timedelta(days=1), today)
+    while generated_through < target:
+        batch_end = min(start + timedelta(days=batch_days - 1), target)
+        days = [start + timedelta(days=n) for n in range((batch_end - start).days + 1)]
+        rows = [row for day in days for row in slots_for_day(restaurant_id, day, templates)]
+
+        advanced = await db.execute(
+            update(SlotHorizon)
+            .where(
+                SlotHorizon.restaurant_id == restaurant_id,
+                SlotHorizon.generated_through == generated_through
+            )
+            .values(generated_through=batch_end)
+            .execution_options(synchronize_session=False)
+        )
+        if advanced.rowcount != 1:
+            # Another worker extended this restaurant meanwhile
+            await db.rollback()
+            return inserted
+        if rows:
+            # Core execution on the session's connection reports the rowcount
+            connection = await db.connection()
+            result = await connection.execute(
+                insert(AvailabilitySlot).on_conflict_do_nothing(index_elements=[
+                    AvailabilitySlot.restaurant_id, AvailabilitySlot.date,
+                    AvailabilitySlot.time
+                ]),
+                rows
+            )
+            inserted += result.rowcount
+        invalidation_bus.record(db, restaurant_id, *days)
+        await db.commit()
+
+        for day in days:
+            # A search beyond the old horizon may have cached an empty day
+            availability_cache.invalidate(restaurant_id, day)
+        generated_through = batch_end
+        start = batch_end + timedelta(days=1)
+        # Let request handlers run between batches
+        await asyncio.sleep(0)
+    return inserted
+
+
+async def run_slot_horizon(
+    session_factory: async_sessionmaker,
+    today: Optional[date] = None
+) -> Dict[str, int]:
+    """
+    Extend the slots of every restaurant, then archive its old slots and bookings.
+
+    Args:
+        session_factory: Factory for async sessions
+        today: Current date (default: today)
+
+    Returns:
+        dict: Slots generated, slots archived, bookings archived and
+        restaurants that failed
+    """
+    today = today or date.today()
+    bookings_before, slots_before = archive_cutoffs(
+        today, settings.booking_retention_days, settings.slot_retention_days
+    )
+    totals = {"generated": 0, "archived_slots": 0, "archived_bookings": 0, "failed": 0}
+    async with session_factory() as db:
+        restaurant_ids = list(await db.scalars(select(Restaurant.id)))
+        for restaurant_id in restaurant_ids:
+            try:
+                totals["generated"] += await extend_horizon(
+                    db, restaurant_id, today,
+                    settings.slot_horizon_days, settings.slot_horizon_batch_days
+                )
+                totals["archived_slots"] += await archive_past_slots(
+                    db, restaurant_id, slots_before
+                )
+                totals["archived_bookings"] += await archive_past_bookings(
+                    db, restaurant_id, bookings_before
+                )
+            except Exception:
+                # Committed batches stay; the next run resumes from the horizon
+                await db.rollback()
+                totals["failed"] += 1
+                logger.exception("Slot horizon failed for restaurant %s", restaurant_id)
+    return totals
+
+
+class SlotHorizonJob:
+    """
+    Background task that runs ``run_slot_horizon`` on an interval.
+
+    Args:
+        session_factory: Factory for async sessions
+        interval_seconds: Time between runs
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, interval_seconds: float) -> None:
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.last_run: Optional[Dict[str, int]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the loop on the running event loop; the first run is immediate."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="slot-horizon")
+
+    async def stop(self) -> None:
+        """Cancel the loop and wait for it to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                self.last_run = await run_slot_horizon(self.session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep the loop alive; the next run retries from the horizon
+                logger.exception("Slot horizon run failed")
+            await asyncio.sleep(self.interval_seconds)
@@ -0,0 +1,245 @@
+"""
+Group-Committed Booking Writes.
+
+SQLite has a single writer, so under a booking burst every request waits for
+the write lock and then pays for its own transaction and commit. With
+WRITE_QUEUE=on the booking mutations (create, cancel, update) do not run on
+the request's session: they go onto an in-process asyncio queue drained by
+one writer task, which applies them in micro-batches inside one transaction
+and commits once per batch (group commit).
+
+Each mutation runs in its own SAVEPOINT, so one that fails (slot full,
+booking not found) is rolled back alone and only its request gets the error;
+the rest of the batch commits. A request's future resolves after its batch
+committed, with its own result. A batch holds at most
+WRITE_QUEUE_BATCH_SIZE mutations; after taking the first one the writer
+waits up to WRITE_QUEUE_MAX_LINGER_MS for more.
+
+Handlers call ``run_write(db, mutation)``, which uses the queue while it is
+running and otherwise runs the mutation on the request's session and commits
+it, so the same mutation code serves both paths. A mutation must not commit
+or roll back; it raises to discard its changes. It runs in the context of
+the request that submitted it, so per-request SQL metrics still count it.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Mutation = Callable[[AsyncSession], Awaitable[Any]]
+# A queued mutation, the future of its request and the request's context
+Item = Tuple[Mutation, asyncio.Future, contextvars.Context]
+
+
+class WriteQueue:
+    """
+    Queue of booking mutations applied by a single writer task.
+
+    Attributes:
+        enabled (bool): When False ``start()`` does nothing and writes run on
+            the request's session
+        max_batch_size (int): Most mutations committed together
+        max_linger_ms (float): How long the writer waits for more mutations
+            after taking the first of a batch (0: only those already queued)
+        batches (int): Batches committed or failed
+        writes (int): Mutations applied, successful or not
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        max_batch_size: int = 32,
+        max_linger_ms: float = 0.0
+    ) -> None:
+        self.enabled = enabled
+        self.max_batch_size = max_batch_size
+        self.max_linger_ms = max_linger_ms
+        self.batches = 0
+        self.writes = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = True
+        self._session_factory: Optional[async_sessionmaker] = None
+
+    @property
+    def running(self) -> bool:
+        """True while the writer task accepts mutations."""
+        return self._task is not None and not self._closed
+
+    async def start(self, session_factory: async_sessionmaker) -> None:
+        """
+        Start the writer task and reset the counters (no-op when disabled or
+        already running).
+
+        Args:
+            session_factory: Factory of the writer's async sessions
+        """
+        if not self.enabled or self._task is not None:
+            return
+        self._session_factory = session_factory
+        self.batches = 0
+        self.writes = 0
+        self._queue = asyncio.Queue()
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop accepting mutations, apply those already queued, then stop the
+        writer task. Anything left unapplied fails with RuntimeError.
+        """
+        if self._task is None:
+            return
+        self._closed = True
+        self._queue.put_nowait(None)
+        try:
+            await self._task
+        finally:
+            queue, self._queue, self._task = self._queue, None, None
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None and not item[1].done():
+                    item[1].set_exception(RuntimeError("Write queue stopped"))
+
+    async def submit(self, mutation: Mutation) -> Any:
+        """
+        Queue a mutation and wait until its batch is committed.
+
+        Args:
+            mutation: Coroutine function applying the change to a session
+
+        Returns:
+            The mutation's result
+
+        Raises:
+            RuntimeError: If the queue is not running (stopped or never started)
+            Exception: What the mutation raised, or the commit error
+        """
+        if not self.running:
+            raise RuntimeError("Write queue is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((mutation, future, contextvars.copy_context()))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the writer's counters."""
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "batches": self.batches,
+            "writes": self.writes,
+            "mean_batch_size": round(self.writes / self.batches, 2) if self.batches else 0.0,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            batch, stopping = await self._next_batch()
+            if batch:
+                await self._apply(batch)
+            if stopping:
+                return
+
+    async def _next_batch(self) -> Tuple[List[Item], bool]:
+        """Take the next batch off the queue; the flag is True once stop() was called."""
+        loop = asyncio.get_running_loop()
+        item = await self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = loop.time() + self.max_linger_ms / 1000
+        while len(batch) < self.max_batch_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _apply(self, batch: List[Item]) -> None:
+        """Apply a batch in one transaction, each mutation in a savepoint, and commit once."""
+        outcomes: List[Tuple[asyncio.Future, Any, Optional[BaseException]]] = []
+        try:
+            async with self._session_factory() as db:
+                connection = await db.connection()
+                if connection.dialect.name == "sqlite":
+                    # Take the write lock up front; SQLite savepoints also
+                    # need the transaction to be open already
+                    await connection.exec_driver_sql("BEGIN IMMEDIATE")
+                for mutation, future, context in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        async with db.begin_nested():
+                            # Emits the SAVEPOINT here, outside the request's context
+                            await db.connection()
+                            # The task copies the context it is created in
+                            result = await context.run(asyncio.ensure_future, mutation(db))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                    else:
+                        outcomes.append((future, result, None))
+                await db.commit()
+        except Exception as exc:
+            logger.exception("Write batch of %d failed", len(batch))
+            outcomes = [(future, None, exc) for _, future, _ in batch]
+        self.batches += 1
+        self.writes += len(outcomes)
+        for future, result, error in outcomes:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+# Shared by all requests in the process
+write_queue = WriteQueue(
+    enabled=settings.write_queue_enabled,
+    max_batch_size=settings.write_queue_batch_size,
+    max_linger_ms=settings.write_queue_max_linger_ms,
+)
+
+
+async def run_write(db: AsyncSession, mutation: Mutation) -> Any:
+    """
+    Apply a booking mutation and commit it.
+
+    While the write queue runs, the mutation joins the next group commit on
+    the writer's session; otherwise (also once the queue is stopping) it runs
+    on the request's session, which is committed, or rolled back if the
+    mutation raises.
+
+    Args:
+        db: The request's async session
+        mutation: Coroutine function applying the change to a session
+
+    Returns:
+        The mutation's result, once committed
+    """
+    if write_queue.running:
+        return await write_queue.submit(mutation)
+    try:
+        result = await mutation(db)
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    return result
@@ -0,0 +1,8 @@
+"""
+Performance Benchmarks for the Restaurant Booking API.
+
+Standalone scripts that exercise the API against isolated in-memory databases.
+Each module can be run directly, e.g. ``python -m benchmarks.availability_queries``.
+
+Author: AI Assistant
+"""
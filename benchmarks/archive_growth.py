@@ -0,0 +1,236 @@
+"""
+Historical Archive Growth Benchmark.
+
+Builds the same hot data set (a month of upcoming slots and bookings) on top of
+growing amounts of history, and times the hot queries (owner list page 1, a
+status-filtered list page, a booking lookup and an availability search) twice
+per size: with the history still in the live tables, and after
+``app.archive.run_archive`` moved it out. It exits non-zero if the archived
+latencies grow with the history, or if archived bookings can no longer be
+found through the booking lookup and the owner list.
+
+Usage:
+    python -m benchmarks.archive_growth [--history 0,100000,400000]
+        [--hot-bookings 3000]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi import Response
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.archive import run_archive
+from app.cache import availability_cache
+from app.capacity import recount_slot_counters
+from app.config import settings
+from app.database import build_async_engine
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.restaurants import get_restaurant, restaurant_directory
+from app.routers.availability import availability_search
+from app.routers.booking import get_booking, list_bookings
+
+RESTAURANT_NAME = "LongMemoryBistro"
+SLOT_TIMES = [time(h, m) for h in range(12, 22) for m in (0, 15, 30, 45)]
+HOT_DAYS = 30
+CUSTOMERS = 2000
+REPEATS = 20
+
+# Latency after archiving may not grow by more than this between the smallest
+# and the largest history (single runs on a shared machine are noisy)
+MAX_GROWTH = 1.5
+NOISE_MS = 1.0
+
+
+def seed(database_url: str, history: int, hot_bookings: int) -> None:
+    """Insert the hot month plus ``history`` past bookings on past slots."""
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    today = date.today()
+    per_day = len(SLOT_TIMES) * 4
+    past_days = -(-history // per_day)
+    # History starts past the retention window, so all of it is archived
+    first_past = settings.booking_retention_days + 1
+    with engine.begin() as connection:
+        connection.execute(insert(Restaurant), [
+            {"id": 1, "name": RESTAURANT_NAME, "microsite_name": RESTAURANT_NAME}
+        ])
+        connection.execute(insert(Customer), [
+            {"first_name": "Guest", "surname": str(n), "email": f"guest{n}@example.com"}
+            for n in range(CUSTOMERS)
+        ])
+        connection.execute(insert(AvailabilitySlot), [
+            {"restaurant_id": 1, "date": today + timedelta(days=day), "time": slot_time}
+            for day in [*range(-first_past - past_days + 1, -first_past + 1), *range(HOT_DAYS)]
+            for slot_time in SLOT_TIMES
+        ])
+        rows = [
+            {
+                "booking_reference": f"P{n:08d}",
+                "restaurant_id": 1,
+                "customer_id": 1 + n % CUSTOMERS,
+                "visit_date": today - timedelta(days=first_past + n // per_day),
+                "visit_time": SLOT_TIMES[n % len(SLOT_TIMES)],
+                "party_size": 2,
+                "channel_code": "ONLINE",
+                "status": "cancelled" if n % 10 == 0 else "confirmed",
+            }
+            for n in range(history)
+        ] + [
+            {
+                "booking_reference": f"U{n:08d}",
+                "restaurant_id": 1,
+                "customer_id": 1 + n % CUSTOMERS,
+                "visit_date": today + timedelta(days=n % HOT_DAYS),
+                "visit_time": SLOT_TIMES[n // HOT_DAYS % len(SLOT_TIMES)],
+                "party_size": 2,
+                "channel_code": "ONLINE",
+                "status": "cancelled" if n % 10 == 0 else "confirmed",
+            }
+            for n in range(hot_bookings)
+        ]
+        for start in range(0, len(rows), 50000):
+            connection.execute(insert(Booking), rows[start:start + 50000])
+        recount_slot_counters(connection)
+    engine.dispose()
+
+
+async def list_page(db, status: str = None) -> List[Dict[str, Any]]:
+    """Owner list page 1, newest visits first."""
+    return await list_bookings(
+        RESTAURANT_NAME, Response(), restaurant=await get_restaurant(RESTAURANT_NAME, db),
+        status=status, date_from=None, date_to=None,
+        limit=100, offset=0, cursor=None, format="json", if_none_match=None,
+        db=db, token="benchmark"
+    )
+
+
+async def lookup(db, reference: str) -> Dict[str, Any]:
+    """Booking lookup by reference."""
+    return await get_booking(
+        RESTAURANT_NAME, reference, Response(), if_none_match=None,
+        restaurant=await get_restaurant(RESTAURANT_NAME, db), db=db
+    )
+
+
+async def search(db) -> Dict[str, Any]:
+    """Availability search for next week."""
+    return await availability_search(
+        RESTAURANT_NAME,
+        VisitDate=date.today() + timedelta(days=7),
+        PartySize=2,
+        ChannelCode="ONLINE",
+        restaurant=await get_restaurant(RESTAURANT_NAME, db),
+        db=db
+    )
+
+
+HOT_QUERIES: Dict[str, Callable] = {
+    "list page 1": lambda db: list_page(db),
+    "list cancelled": lambda db: list_page(db, status="cancelled"),
+    "get booking": lambda db: lookup(db, "U00000007"),
+    "availability": search,
+}
+
+
+async def best_of(session_factory, query: Callable) -> float:
+    """Best latency in ms over a few repeats, to smooth out noise."""
+    timings = []
+    for _ in range(REPEATS):
+        async with session_factory() as db:
+            started = timer.perf_counter()
+            await query(db)
+            timings.append((timer.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+async def measure(database_url: str, history: int) -> Dict[str, Dict[str, float]]:
+    """Time the hot queries before and after archiving; check archived lookups."""
+    engine = build_async_engine(database_url, settings.sqlite_profile)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        await restaurant_directory.load(db)
+
+    results = {}
+    results["live"] = {
+        name: await best_of(session_factory, query) for name, query in HOT_QUERIES.items()
+    }
+    async with session_factory() as db:
+        before_page = [row["booking_id"] for row in await list_page(db)]
+
+    moved = await run_archive(session_factory)
+    if moved["bookings"] != history:
+        raise AssertionError(f"archived {moved['bookings']} of {history} past bookings")
+
+    results["archived"] = {
+        name: await best_of(session_factory, query) for name, query in HOT_QUERIES.items()
+    }
+    async with session_factory() as db:
+        if [row["booking_id"] for row in await list_page(db)] != before_page:
+            raise AssertionError("list page 1 changed after archiving")
+        if history:
+            booking = await lookup(db, f"P{history - 1:08d}")
+            if booking["booking_reference"] != f"P{history - 1:08d}":
+                raise AssertionError("archived booking lookup returned the wrong booking")
+    await engine.dispose()
+    return results
+
+
+async def run(args: argparse.Namespace, workdir: str) -> int:
+    sizes = [int(size) for size in args.history.split(",")]
+    results = {}
+    for size in sizes:
+        database_url = f"sqlite:///{os.path.join(workdir, f'history{size}.db')}"
+        seed(database_url, size, args.hot_bookings)
+        try:
+            results[size] = await measure(database_url, size)
+        except AssertionError as exc:
+            print(f"FAIL: history {size}: {exc}", file=sys.stderr)
+            return 1
+
+    print(f"{'history':>8} {'query':>15} {'live ms':>9} {'archived ms':>12}")
+    for size in sizes:
+        for name in HOT_QUERIES:
+            live = results[size]["live"][name]
+            archived = results[size]["archived"][name]
+            print(f"{size:>8} {name:>15} {live:>9.2f} {archived:>12.2f}")
+
+    failures = []
+    smallest, largest = results[sizes[0]]["archived"], results[sizes[-1]]["archived"]
+    for name in HOT_QUERIES:
+        if largest[name] > smallest[name] * MAX_GROWTH + NOISE_MS:
+            failures.append(
+                f"{name}: {smallest[name]:.2f} ms -> {largest[name]:.2f} ms after archiving"
+            )
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: hot queries stay flat as history grows, archived bookings still found")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--history", default="0,100000,400000",
+                        help="Comma-separated numbers of past bookings")
+    parser.add_argument("--hot-bookings", type=int, default=3000)
+    args = parser.parse_args()
+    # Measure the database path, not the per-day cache
+    availability_cache.enabled = False
+
+    with tempfile.TemporaryDirectory() as workdir:
+        return asyncio.run(run(args, workdir))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
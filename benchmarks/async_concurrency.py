@@ -0,0 +1,170 @@
+"""
+Sync vs Async Database Session Concurrency Benchmark.
+
+Runs the availability search query from many concurrent clients inside one
+event loop, once through a blocking sync ``Session`` (how the routers used to
+call the database from ``async def`` handlers) and once through the
+``AsyncSession`` now used by the routers, both built with the configured
+SQLite profile (SQLITE_PROFILE). For each concurrency level it reports
+requests/sec, p50/p99 latency and the longest event-loop stall observed, which
+is where blocking calls hurt: while a sync query runs, no other request on the
+worker can make progress.
+
+Usage:
+    python -m benchmarks.async_concurrency [--clients 50 100 250 500]
+        [--requests-per-client 20]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Awaitable, Callable, Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import build_async_engine, build_engine
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.routers.availability import slot_availability_query
+
+DAYS = 30
+SLOT_TIMES = [time(h, m) for h in (12, 13, 19, 20) for m in (0, 30)]
+
+
+def seed(database_url: str) -> int:
+    """
+    Create the schema and seed one restaurant with a month of slots and bookings.
+
+    Returns:
+        int: The restaurant id
+    """
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        restaurant = Restaurant(name="ConcurrencyCafe", microsite_name="ConcurrencyCafe")
+        customer = Customer(first_name="Load", surname="Test", email="load@example.com")
+        session.add_all([restaurant, customer])
+        session.flush()
+
+        for day in range(DAYS):
+            visit_date = date.today() + timedelta(days=day)
+            for index, slot_time in enumerate(SLOT_TIMES):
+                session.add(AvailabilitySlot(
+                    restaurant_id=restaurant.id, date=visit_date, time=slot_time
+                ))
+                session.add(Booking(
+                    booking_reference=f"C{day:03d}{index:03d}",
+                    restaurant_id=restaurant.id,
+                    customer_id=customer.id,
+                    visit_date=visit_date,
+                    visit_time=slot_time,
+                    party_size=2,
+                    channel_code="ONLINE",
+                    status="confirmed"
+                ))
+        session.commit()
+        restaurant_id = restaurant.id
+    engine.dispose()
+    return restaurant_id
+
+
+async def watch_event_loop(stalls: List[float], stop: asyncio.Event) -> None:
+    """Record how late a 1 ms timer fires, i.e. how long the loop was blocked."""
+    while not stop.is_set():
+        started = timer.perf_counter()
+        await asyncio.sleep(0.001)
+        stalls.append(timer.perf_counter() - started - 0.001)
+
+
+async def drive(
+    handler: Callable[[date], Awaitable[None]],
+    clients: int,
+    requests_per_client: int
+) -> Dict[str, float]:
+    """
+    Run ``clients`` concurrent clients each issuing sequential requests.
+
+    Returns:
+        dict: Throughput, latency percentiles and maximum event-loop stall
+    """
+    latencies: List[float] = []
+    stalls: List[float] = []
+    stop = asyncio.Event()
+
+    async def client(offset: int) -> None:
+        for i in range(requests_per_client):
+            visit_date = date.today() + timedelta(days=(offset + i) % DAYS)
+            started = timer.perf_counter()
+            await handler(visit_date)
+            latencies.append(timer.perf_counter() - started)
+
+    watcher = asyncio.create_task(watch_event_loop(stalls, stop))
+    started = timer.perf_counter()
+    await asyncio.gather(*(client(n) for n in range(clients)))
+    elapsed = timer.perf_counter() - started
+    stop.set()
+    await watcher
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_stall_ms": max(stalls, default=0.0) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace, database_url: str, restaurant_id: int) -> None:
+    sync_engine = build_engine(database_url, settings.sqlite_profile)
+    sync_session_factory = sessionmaker(bind=sync_engine)
+    async_engine = build_async_engine(database_url, settings.sqlite_profile)
+    async_session_factory = async_sessionmaker(async_engine)
+
+    async def sync_handler(visit_date: date) -> None:
+        with sync_session_factory() as db:
+            db.execute(slot_availability_query(restaurant_id, visit_date, 2)).all()
+
+    async def async_handler(visit_date: date) -> None:
+        async with async_session_factory() as db:
+            (await db.execute(slot_availability_query(restaurant_id, visit_date, 2))).all()
+
+    print(
+        f"{'clients':>8} {'path':>6} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p99 ms':>8} {'max stall ms':>13}"
+    )
+    for clients in args.clients:
+        for name, handler in (("sync", sync_handler), ("async", async_handler)):
+            result = await drive(handler, clients, args.requests_per_client)
+            print(
+                f"{clients:>8} {name:>6} {result['rps']:>9.0f} {result['p50_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['max_stall_ms']:>13.1f}"
+            )
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--requests-per-client", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'concurrency.db')}"
+        restaurant_id = seed(database_url)
+        asyncio.run(run(args, database_url, restaurant_id))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
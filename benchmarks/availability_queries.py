@@ -0,0 +1,167 @@
+"""
+Availability Search Query-Count Regression Benchmark.
+
+Seeds an in-memory database with thousands of bookings, then runs the
+availability search endpoint against dates with increasing numbers of slots.
+The number of SQL statements per search must stay constant regardless of the
+slot count; the script exits non-zero if it does not. Pass ``--cache on`` to
+measure the same searches with the availability cache enabled, and
+``--directory off`` to resolve the restaurant with a query on every search
+instead of from the in-memory restaurant directory.
+
+Usage:
+    python -m benchmarks.availability_queries [--bookings 5000] [--repeat 50]
+        [--cache off] [--directory on]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time as timer
+from datetime import date, time, timedelta
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.cache import availability_cache
+from app.models import (
+    Base, Restaurant, Customer, Booking, AvailabilitySlot
+)
+from app.restaurants import get_restaurant, restaurant_directory
+from app.routers.availability import availability_search
+
+RESTAURANT_NAME = "BenchmarkBistro"
+SLOT_COUNTS = [1, 8, 32, 96]
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine."""
+
+    def __init__(self, engine) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+
+def slot_times(count: int) -> List[time]:
+    """Return ``count`` distinct slot times spaced five minutes apart."""
+    return [
+        time((10 + (i * 5) // 60) % 24, (i * 5) % 60)
+        for i in range(count)
+    ]
+
+
+def seed(session, total_bookings: int) -> int:
+    """
+    Seed one restaurant, one date per slot count and ``total_bookings`` bookings.
+
+    Returns:
+        int: The restaurant id
+    """
+    restaurant = Restaurant(name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME)
+    customer = Customer(first_name="Bench", surname="Mark", email="bench@example.com")
+    session.add_all([restaurant, customer])
+    session.flush()
+
+    base_date = date.today()
+    slots_by_date = {}
+    for offset, count in enumerate(SLOT_COUNTS):
+        visit_date = base_date + timedelta(days=offset)
+        times = slot_times(count)
+        slots_by_date[visit_date] = times
+        session.add_all([
+            AvailabilitySlot(
+                restaurant_id=restaurant.id, date=visit_date, time=slot_time,
+                max_party_size=8, available=True
+            )
+            for slot_time in times
+        ])
+
+    rng = random.Random(42)
+    dates = list(slots_by_date)
+    for i in range(total_bookings):
+        visit_date = rng.choice(dates)
+        session.add(Booking(
+            booking_reference=f"B{i:06d}",
+            restaurant_id=restaurant.id,
+            customer_id=customer.id,
+            visit_date=visit_date,
+            visit_time=rng.choice(slots_by_date[visit_date]),
+            party_size=2,
+            channel_code="ONLINE",
+            status=rng.choice(["confirmed", "confirmed", "cancelled"])
+        ))
+    session.commit()
+    return restaurant.id
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine)()
+    await session.run_sync(seed, args.bookings)
+    if restaurant_directory.enabled:
+        # Loaded at startup in the app
+        await restaurant_directory.load(session)
+    counter = QueryCounter(engine)
+
+    query_counts = {}
+    print(f"{'slots':>6} {'queries':>8} {'mean ms':>9}")
+    for offset, count in enumerate(SLOT_COUNTS):
+        visit_date = date.today() + timedelta(days=offset)
+        counter.count = 0
+        started = timer.perf_counter()
+        for _ in range(args.repeat):
+            result = await availability_search(
+                RESTAURANT_NAME,
+                restaurant=await get_restaurant(RESTAURANT_NAME, session),
+                VisitDate=visit_date,
+                PartySize=2,
+                ChannelCode="ONLINE",
+                db=session
+            )
+            session.expire_all()
+        elapsed = timer.perf_counter() - started
+        assert result["total_slots"] == count
+        query_counts[count] = counter.count / args.repeat
+        print(
+            f"{count:>6} {query_counts[count]:>8.1f} "
+            f"{elapsed / args.repeat * 1000:>9.2f}"
+        )
+
+    if len(set(query_counts.values())) != 1:
+        print("FAIL: query count grows with the number of slots", file=sys.stderr)
+        await engine.dispose()
+        return 1
+    print("OK: query count is constant")
+    if availability_cache.enabled:
+        print(f"cache: {availability_cache.stats()}")
+    print(f"restaurant directory: {restaurant_directory.stats()}")
+    await session.close()
+    await engine.dispose()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--cache", choices=["on", "off"], default="off")
+    parser.add_argument("--directory", choices=["on", "off"], default="on")
+    args = parser.parse_args()
+    restaurant_directory.enabled = args.directory == "on"
+    availability_cache.enabled = args.cache == "on"
+    availability_cache.clear()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
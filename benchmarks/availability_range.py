@@ -0,0 +1,180 @@
+"""
+Date-Range Availability Search Benchmark.
+
+Seeds a restaurant with a month of slots and bookings, then fills a 30-day
+calendar two ways: one ``AvailabilitySearch`` call per day, and a single
+``AvailabilitySearchRange`` call (summary only and with slot detail). It
+reports latency and SQL statements for each, and exits non-zero if the range
+search disagrees with the per-day searches or needs more than one query.
+
+Usage:
+    python -m benchmarks.availability_range [--days 30] [--bookings 3000]
+        [--repeat 20]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.cache import availability_cache
+from app.capacity import recount_slot_counters
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.restaurants import get_restaurant, restaurant_directory
+from app.routers.availability import availability_search, availability_search_range
+
+RESTAURANT_NAME = "CalendarCafe"
+SLOT_TIMES = [time(h, m) for h in range(12, 22) for m in (0, 15, 30, 45)]
+
+
+def seed(session, days: int, total_bookings: int) -> None:
+    """Seed one restaurant with ``days`` days of slots and random bookings."""
+    restaurant = Restaurant(name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME)
+    customer = Customer(first_name="Cal", surname="Endar", email="cal@example.com")
+    session.add_all([restaurant, customer])
+    session.flush()
+
+    rng = random.Random(7)
+    session.add_all([
+        AvailabilitySlot(
+            restaurant_id=restaurant.id,
+            date=date.today() + timedelta(days=day),
+            time=slot_time,
+            max_party_size=rng.choice([4, 6, 8]),
+            # A few slots closed by the restaurant
+            available=rng.random() > 0.05
+        )
+        for day in range(days)
+        for slot_time in SLOT_TIMES
+    ])
+    session.add_all([
+        Booking(
+            booking_reference=f"C{n:06d}",
+            restaurant_id=restaurant.id,
+            customer_id=customer.id,
+            visit_date=date.today() + timedelta(days=rng.randrange(days)),
+            visit_time=rng.choice(SLOT_TIMES),
+            party_size=rng.randint(1, 6),
+            channel_code="ONLINE",
+            status="confirmed"
+        )
+        for n in range(total_bookings)
+    ])
+    session.flush()
+    # Bulk-seeded bookings bypass the claim path, so fill the counters
+    recount_slot_counters(session.connection())
+    session.commit()
+
+
+async def per_day(session, days: int, party_size: int) -> List[Dict[str, Any]]:
+    """Fill the calendar with one AvailabilitySearch call per day."""
+    results = []
+    for day in range(days):
+        result = await availability_search(
+            RESTAURANT_NAME,
+            restaurant=await get_restaurant(RESTAURANT_NAME, session),
+            VisitDate=date.today() + timedelta(days=day),
+            PartySize=party_size,
+            ChannelCode="ONLINE",
+            db=session
+        )
+        results.append(result)
+    return results
+
+
+async def ranged(session, days: int, party_size: int, include_slots: bool) -> Dict[str, Any]:
+    """Fill the calendar with a single AvailabilitySearchRange call."""
+    return await availability_search_range(
+        RESTAURANT_NAME,
+        DateFrom=date.today(),
+        DateTo=date.today() + timedelta(days=days - 1),
+        PartySize=party_size,
+        ChannelCode="ONLINE",
+        IncludeSlots=include_slots,
+        restaurant=await get_restaurant(RESTAURANT_NAME, session),
+        db=session
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine)()
+    await session.run_sync(seed, args.days, args.bookings)
+    await restaurant_directory.load(session)
+
+    statements = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda *_: statements.append(1)
+    )
+
+    failures = []
+    for party_size in (2, 6):
+        daily = await per_day(session, args.days, party_size)
+        summary = await ranged(session, args.days, party_size, include_slots=False)
+        detail = await ranged(session, args.days, party_size, include_slots=True)
+        for single, day_summary, day_detail in zip(daily, summary["days"], detail["days"]):
+            open_times = [slot["time"] for slot in single["available_slots"] if slot["available"]]
+            expected = (single["total_slots"], len(open_times), open_times[0] if open_times else None)
+            for day in (day_summary, day_detail):
+                got = (day["total_slots"], day["available_slots"], day["first_available_time"])
+                if got != expected:
+                    failures.append(f"party {party_size} {single['visit_date']}: {got} != {expected}")
+            if day_detail["slots"] != single["available_slots"]:
+                failures.append(f"party {party_size} {single['visit_date']}: slot detail differs")
+        session.expire_all()
+
+    modes = {
+        f"{args.days} x AvailabilitySearch": lambda: per_day(session, args.days, 2),
+        "AvailabilitySearchRange": lambda: ranged(session, args.days, 2, False),
+        "AvailabilitySearchRange+slots": lambda: ranged(session, args.days, 2, True),
+    }
+    print(f"{'mode':>32} {'queries':>8} {'mean ms':>9}")
+    query_counts = {}
+    for name, call in modes.items():
+        statements.clear()
+        started = timer.perf_counter()
+        for _ in range(args.repeat):
+            await call()
+            session.expire_all()
+        elapsed = timer.perf_counter() - started
+        query_counts[name] = len(statements) / args.repeat
+        print(f"{name:>32} {query_counts[name]:>8.1f} {elapsed / args.repeat * 1000:>9.2f}")
+
+    await session.close()
+    await engine.dispose()
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if query_counts["AvailabilitySearchRange"] > 1 or query_counts["AvailabilitySearchRange+slots"] > 1:
+        print("FAIL: range search needs more than one query", file=sys.stderr)
+        return 1
+    if failures:
+        return 1
+    print("OK: range search matches per-day searches")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--bookings", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    # Measure the database path, not the per-day cache
+    availability_cache.enabled = False
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Batch vs Single-Item Booking Ingestion Benchmark.
+
+Imports the same set of partner bookings into two fresh databases: once
+through the batch ingestion path (``ingest_bookings``, chunked bulk inserts)
+and once through ``BookingWithStripeToken`` one booking at a time, and reports
+wall time and bookings/sec for each. The single-item path sends one request
+at a time by default, as a partner replaying its feed would.
+
+Usage:
+    python -m benchmarks.batch_ingest [--bookings 10000] [--chunk-size 500]
+        [--concurrency 1]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Dict, List
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import build_async_engine
+from app.models import Base, Restaurant, AvailabilitySlot
+from app.routers.batch import ingest_bookings
+from app.restaurants import get_restaurant
+from app.routers.booking import create_booking_with_stripe
+from benchmarks.booking_race import OPTIONAL_FIELDS
+
+RESTAURANT_NAME = "BatchBrasserie"
+SLOT_TIMES = [time(h, m) for h in range(10, 23) for m in (0, 15, 30, 45)]
+
+
+def make_items(count: int) -> List[Dict[str, Any]]:
+    """Build ``count`` partner bookings, each on its own slot, sharing customers."""
+    return [
+        {
+            "VisitDate": (date.today() + timedelta(days=n // len(SLOT_TIMES))).isoformat(),
+            "VisitTime": SLOT_TIMES[n % len(SLOT_TIMES)].isoformat(),
+            "PartySize": 2 + n % 4,
+            "ChannelCode": "PARTNER",
+            "Customer": {
+                "FirstName": "Guest",
+                "Surname": str(n),
+                "Email": f"guest{n % (count // 2 or 1)}@example.com",
+            },
+        }
+        for n in range(count)
+    ]
+
+
+async def prepare(database_url: str, count: int):
+    """Create and seed a database with enough slots for ``count`` bookings."""
+    engine = build_async_engine(database_url, settings.sqlite_profile)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        restaurant = Restaurant(name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME)
+        db.add(restaurant)
+        await db.flush()
+        db.add_all([
+            AvailabilitySlot(
+                restaurant_id=restaurant.id,
+                date=date.today() + timedelta(days=day),
+                time=slot_time
+            )
+            for day in range(count // len(SLOT_TIMES) + 1)
+            for slot_time in SLOT_TIMES
+        ])
+        await db.commit()
+    return engine, session_factory
+
+
+async def run_batch(database_url: str, items: List[Dict[str, Any]], chunk_size: int) -> int:
+    engine, session_factory = await prepare(database_url, len(items))
+    async with session_factory() as db:
+        restaurant = await get_restaurant(RESTAURANT_NAME, db)
+        results = await ingest_bookings(db, restaurant, items, chunk_size)
+    await engine.dispose()
+    return sum(1 for result in results if result["status"] == "created")
+
+
+async def run_single(database_url: str, items: List[Dict[str, Any]], concurrency: int) -> int:
+    engine, session_factory = await prepare(database_url, len(items))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def book(item: Dict[str, Any]) -> bool:
+        fields = {name: None for name in OPTIONAL_FIELDS}
+        fields.update(FirstName=item["Customer"]["FirstName"],
+                      Surname=item["Customer"]["Surname"])
+        async with semaphore, session_factory() as db:
+            try:
+                await create_booking_with_stripe(
+                    RESTAURANT_NAME,
+                    restaurant=await get_restaurant(RESTAURANT_NAME, db),
+                    VisitDate=date.fromisoformat(item["VisitDate"]),
+                    VisitTime=time.fromisoformat(item["VisitTime"]),
+                    PartySize=item["PartySize"],
+                    ChannelCode=item["ChannelCode"],
+                    Email=item["Customer"]["Email"],
+                    db=db,
+                    **fields
+                )
+                return True
+            except HTTPException:
+                return False
+
+    outcomes = await asyncio.gather(*(book(item) for item in items))
+    await engine.dispose()
+    return sum(outcomes)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    items = make_items(args.bookings)
+
+    print(f"{'path':>7} {'created':>8} {'seconds':>8} {'bookings/s':>11}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, runner, option in (
+            ("batch", run_batch, args.chunk_size),
+            ("single", run_single, args.concurrency),
+        ):
+            database_url = f"sqlite:///{os.path.join(workdir, f'{name}.db')}"
+            started = timer.perf_counter()
+            created = asyncio.run(runner(database_url, items, option))
+            elapsed = timer.perf_counter() - started
+            print(f"{name:>7} {created:>8} {elapsed:>8.2f} {created / elapsed:>11.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
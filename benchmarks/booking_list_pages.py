@@ -0,0 +1,180 @@
+"""
+Owner Booking List Pagination Benchmark.
+
+Seeds a restaurant with a long booking history and times fetching page 1 and a
+deep page of ``GET /{restaurant}/Bookings`` with legacy OFFSET pagination and
+with keyset cursors, plus the number of SQL statements per page (customers are
+eager-loaded and the restaurant comes from the in-memory directory, so it must
+be the page query plus the booking-version lookup behind the ETag). It finally streams the full history as NDJSON and checks
+every booking is exported once.
+
+Usage:
+    python -m benchmarks.booking_list_pages [--bookings 120000] [--page-size 100]
+        [--deep-page 1000]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import Response
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import build_async_engine
+from app.models import Base, Restaurant, Customer, Booking
+from app.restaurants import get_restaurant
+from app.routers.booking import list_bookings
+
+RESTAURANT_NAME = "HistoryHouse"
+SLOT_TIMES = [time(h, m) for h in range(10, 23) for m in (0, 15, 30, 45)]
+CUSTOMERS = 5000
+REPEATS = 5
+
+
+async def seed(session_factory, count: int) -> None:
+    """Insert one restaurant, its customers and ``count`` bookings in bulk."""
+    async with session_factory() as db:
+        restaurant = Restaurant(name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME)
+        db.add(restaurant)
+        await db.flush()
+        await db.execute(insert(Customer), [
+            {"first_name": "Guest", "surname": str(n), "email": f"guest{n}@example.com"}
+            for n in range(CUSTOMERS)
+        ])
+        start = date.today() - timedelta(days=count // len(SLOT_TIMES))
+        await db.execute(insert(Booking), [
+            {
+                "booking_reference": f"H{n:06d}",
+                "restaurant_id": restaurant.id,
+                "customer_id": 1 + n % CUSTOMERS,
+                "visit_date": start + timedelta(days=n // len(SLOT_TIMES)),
+                "visit_time": SLOT_TIMES[n % len(SLOT_TIMES)],
+                "party_size": 2,
+                "channel_code": "ONLINE",
+                "status": "confirmed",
+            }
+            for n in range(count)
+        ])
+        await db.commit()
+
+
+async def fetch_page(
+    session_factory, page_size: int, offset: int = 0, cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Call the list handler once; return its rows, next cursor and timing."""
+    response = Response()
+    async with session_factory() as db:
+        started = timer.perf_counter()
+        rows = await list_bookings(
+            RESTAURANT_NAME, response, restaurant=await get_restaurant(RESTAURANT_NAME, db),
+            status=None, date_from=None, date_to=None,
+            limit=page_size, offset=offset, cursor=cursor, format="json",
+            if_none_match=None, db=db, token="benchmark"
+        )
+        elapsed = timer.perf_counter() - started
+    return {
+        "rows": rows,
+        "cursor": response.headers.get("X-Next-Cursor"),
+        "ms": elapsed * 1000,
+    }
+
+
+async def best_of(session_factory, page_size: int, **kwargs: Any) -> float:
+    """Best latency in ms over a few repeats, to smooth out noise."""
+    return min([
+        (await fetch_page(session_factory, page_size, **kwargs))["ms"]
+        for _ in range(REPEATS)
+    ])
+
+
+async def run(args: argparse.Namespace, database_url: str) -> int:
+    engine = build_async_engine(database_url, settings.sqlite_profile)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await seed(session_factory, args.bookings)
+
+    statements: List[str] = []
+    event.listen(
+        engine.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *rest: statements.append(statement)
+    )
+
+    # Walk cursors to the deep page; every id must appear exactly once
+    cursors: List[Optional[str]] = [None]
+    seen: List[int] = []
+    for _ in range(args.deep_page):
+        statements.clear()
+        page = await fetch_page(session_factory, args.page_size, cursor=cursors[-1])
+        per_page_statements = len(statements)
+        seen.extend(row["booking_id"] for row in page["rows"])
+        if not page["cursor"]:
+            break
+        cursors.append(page["cursor"])
+    if len(cursors) < args.deep_page:
+        print("FAIL: not enough bookings for the deep page", file=sys.stderr)
+        return 1
+
+    deep_offset = (args.deep_page - 1) * args.page_size
+    results = {
+        "offset": (
+            await best_of(session_factory, args.page_size),
+            await best_of(session_factory, args.page_size, offset=deep_offset),
+        ),
+        "cursor": (
+            await best_of(session_factory, args.page_size),
+            await best_of(session_factory, args.page_size, cursor=cursors[args.deep_page - 1]),
+        ),
+    }
+    print(f"{'mode':>7} {'page 1 ms':>10} {f'page {args.deep_page} ms':>13}")
+    for mode, (first, deep) in results.items():
+        print(f"{mode:>7} {first:>10.2f} {deep:>13.2f}")
+    print(f"SQL statements per page: {per_page_statements}")
+
+    # Full export through the streaming path
+    async with session_factory() as db:
+        export = await list_bookings(
+            RESTAURANT_NAME, Response(), restaurant=await get_restaurant(RESTAURANT_NAME, db),
+            status=None, date_from=None, date_to=None,
+            limit=args.page_size, offset=0, cursor=None, format="ndjson",
+            if_none_match=None, db=db, token="benchmark"
+        )
+        started = timer.perf_counter()
+        exported = 0
+        async for chunk in export.body_iterator:
+            exported += sum(1 for line in chunk.splitlines() if json.loads(line))
+        elapsed = timer.perf_counter() - started
+    print(f"export: {exported} bookings streamed in {elapsed:.2f}s")
+
+    await engine.dispose()
+    if len(seen) != len(set(seen)) or exported != args.bookings or per_page_statements > 2:
+        print("FAIL: pagination or export returned the wrong rows", file=sys.stderr)
+        return 1
+    print("OK")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=120000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--deep-page", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'history.db')}"
+        return asyncio.run(run(args, database_url))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Concurrent Booking Stress Test and Write Throughput Benchmark.
+
+Fires hundreds of concurrent ``BookingWithStripeToken`` requests at a single
+slot and checks that exactly ``table_capacity`` of them succeed, that the same
+number of confirmed bookings exists afterwards and that the slot's maintained
+``booked_tables`` counter agrees. Bookings for a party of zero or fewer,
+which would take a table for nobody or hand covers back to the slot, must
+all be rejected even when the handler is called directly without form
+validation. It then books distinct slots concurrently to report write
+throughput of the single-commit booking path.
+
+Usage:
+    python -m benchmarks.booking_race [--contenders 300] [--bookings 500]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import build_async_engine
+from app.models import Base, Restaurant, Booking, AvailabilitySlot
+from app.restaurants import get_restaurant
+from app.routers.booking import create_booking_with_stripe
+
+RESTAURANT_NAME = "RaceRoom"
+SLOT_TIMES = [time(h, m) for h in range(10, 23) for m in (0, 15, 30, 45)]
+
+# Form defaults are FieldInfo objects when a handler is called directly, so
+# every optional field is passed explicitly.
+OPTIONAL_FIELDS = [
+    "SpecialRequests", "IsLeaveTimeConfirmed", "RoomNumber", "Title", "FirstName",
+    "Surname", "MobileCountryCode", "Mobile", "PhoneCountryCode", "Phone",
+    "ReceiveEmailMarketing", "ReceiveSmsMarketing", "GroupEmailMarketingOptInText",
+    "GroupSmsMarketingOptInText", "ReceiveRestaurantEmailMarketing",
+    "ReceiveRestaurantSmsMarketing", "RestaurantEmailMarketingOptInText",
+    "RestaurantSmsMarketingOptInText",
+]
+
+
+async def book(
+    session_factory, visit_date: date, visit_time: time, email: str, party_size: int = 2
+) -> Tuple[bool, Any]:
+    """Call the booking handler in its own session; return (succeeded, result)."""
+    fields: Dict[str, Any] = {name: None for name in OPTIONAL_FIELDS}
+    async with session_factory() as db:
+        try:
+            result = await create_booking_with_stripe(
+                RESTAURANT_NAME,
+                restaurant=await get_restaurant(RESTAURANT_NAME, db),
+                VisitDate=visit_date,
+                VisitTime=visit_time,
+                PartySize=party_size,
+                ChannelCode="ONLINE",
+                Email=email,
+                db=db,
+                **fields
+            )
+            return True, result
+        except HTTPException as exc:
+            return False, exc.detail
+
+
+async def run(args: argparse.Namespace, database_url: str) -> int:
+    engine = build_async_engine(database_url, settings.sqlite_profile)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    days = args.bookings // len(SLOT_TIMES) + 2
+    async with session_factory() as db:
+        restaurant = Restaurant(name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME)
+        db.add(restaurant)
+        await db.flush()
+        db.add_all([
+            AvailabilitySlot(
+                restaurant_id=restaurant.id,
+                date=date.today() + timedelta(days=day),
+                time=slot_time
+            )
+            for day in range(days)
+            for slot_time in SLOT_TIMES
+        ])
+        await db.commit()
+
+    # 1. Race: every contender targets the same slot
+    race_date, race_time = date.today(), SLOT_TIMES[0]
+    started = timer.perf_counter()
+    outcomes = await asyncio.gather(*(
+        book(session_factory, race_date, race_time, f"racer{n}@example.com")
+        for n in range(args.contenders)
+    ))
+    race_elapsed = timer.perf_counter() - started
+    winners = [result for succeeded, result in outcomes if succeeded]
+    async with session_factory() as db:
+        table_capacity, booked_tables = (await db.execute(
+            select(AvailabilitySlot.table_capacity, AvailabilitySlot.booked_tables).where(
+                AvailabilitySlot.date == race_date,
+                AvailabilitySlot.time == race_time
+            )
+        )).one()
+        confirmed = await db.scalar(
+            select(func.count()).select_from(Booking).where(
+                Booking.visit_date == race_date,
+                Booking.visit_time == race_time,
+                Booking.status == "confirmed"
+            )
+        )
+    print(
+        f"race: {args.contenders} contenders, {len(winners)} succeeded, "
+        f"{confirmed} confirmed booking(s), booked_tables={booked_tables}/{table_capacity} "
+        f"in {race_elapsed:.2f}s"
+    )
+
+    # 2. Parties of zero or fewer on an empty slot: none may touch its counters
+    empty_date, empty_time = date.today(), SLOT_TIMES[1]
+    outcomes = await asyncio.gather(*(
+        book(session_factory, empty_date, empty_time, f"nobody{n}@example.com", party_size)
+        for n, party_size in enumerate((0, -1, -50) * 10)
+    ))
+    empty_accepted = sum(1 for succeeded, _ in outcomes if succeeded)
+    async with session_factory() as db:
+        empty_counters = tuple((await db.execute(
+            select(AvailabilitySlot.booked_tables, AvailabilitySlot.booked_covers).where(
+                AvailabilitySlot.date == empty_date,
+                AvailabilitySlot.time == empty_time
+            )
+        )).one())
+    print(
+        f"non-positive party sizes: {empty_accepted}/{len(outcomes)} accepted, "
+        f"booked_tables/booked_covers={empty_counters[0]}/{empty_counters[1]}"
+    )
+
+    # 3. Throughput: concurrent bookings on distinct slots
+    targets: List[Tuple[date, time]] = [
+        (date.today() + timedelta(days=1 + n // len(SLOT_TIMES)),
+         SLOT_TIMES[n % len(SLOT_TIMES)])
+        for n in range(args.bookings)
+    ]
+    started = timer.perf_counter()
+    outcomes = await asyncio.gather(*(
+        book(session_factory, visit_date, visit_time, f"guest{n}@example.com")
+        for n, (visit_date, visit_time) in enumerate(targets)
+    ))
+    elapsed = timer.perf_counter() - started
+    succeeded = sum(1 for ok, _ in outcomes if ok)
+    print(
+        f"throughput: {succeeded}/{args.bookings} bookings in {elapsed:.2f}s "
+        f"({succeeded / elapsed:.0f} bookings/s)"
+    )
+
+    await engine.dispose()
+    if not len(winners) == confirmed == booked_tables == table_capacity:
+        print("FAIL: slot capacity was not claimed exactly", file=sys.stderr)
+        return 1
+    if empty_accepted or empty_counters != (0, 0):
+        print("FAIL: a party of zero or fewer changed a slot", file=sys.stderr)
+        return 1
+    print(f"OK: exactly {table_capacity} bookings won the slot, none for an empty party")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contenders", type=int, default=300)
+    parser.add_argument("--bookings", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'race.db')}"
+        return asyncio.run(run(args, database_url))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
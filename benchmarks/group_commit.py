@@ -0,0 +1,203 @@
+"""
+Group Commit Write Throughput Benchmark.
+
+Sends bursts of concurrent booking writes through the in-process app on a
+fresh scratch database, once with per-request commits (the default) and once
+with the write queue (WRITE_QUEUE=on), for each SQLite tuning profile, and
+reports writes per second for creating bookings on distinct slots, changing
+their party size and cancelling them, with the writer's mean batch size.
+
+Writes that fail with a server error (SQLite answering "database is locked"
+to concurrent transactions) are counted, and only successful writes count
+towards the throughput. Group commit must not fail any write, a slot
+contended by many requests must take exactly its table capacity (at most
+that many on the per-request path) and the slot counters must match the
+bookings afterwards. The script exits non-zero if an outcome is wrong or if
+group commit moves fewer writes per second than per-request commits.
+
+Usage:
+    python -m benchmarks.group_commit [--writes 400] [--concurrency 32]
+        [--batch-size 32] [--max-linger-ms 0] [--profiles production,baseline]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import os
+import sys
+import tempfile
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Dict, List, Tuple
+
+import httpx
+from sqlalchemy import insert, select
+
+from app.config import Settings
+from app.main import create_app
+from app.models import DEFAULT_TABLE_CAPACITY
+
+RESTAURANT_NAME = "TheHungryUnicorn"
+PREFIX = f"/api/ConsumerApi/v1/Restaurant/{RESTAURANT_NAME}"
+SLOT_TIMES = [time(h, m) for h in range(10, 23) for m in (0, 15, 30, 45)]
+# Past the 30 days of sample slots
+FIRST_DAY = 40
+CONTENDERS = 50
+
+
+def add_slots(count: int) -> List[Dict[str, str]]:
+    """Add ``count`` empty slots plus one to contend for; return their forms."""
+    from app.database import get_engine
+    from app.models import AvailabilitySlot, Restaurant
+
+    slots = [
+        (date.today() + timedelta(days=FIRST_DAY + n // len(SLOT_TIMES)),
+         SLOT_TIMES[n % len(SLOT_TIMES)])
+        for n in range(count + 1)
+    ]
+    with get_engine().begin() as connection:
+        restaurant_id = connection.scalar(
+            select(Restaurant.id).where(Restaurant.name == RESTAURANT_NAME)
+        )
+        connection.execute(insert(AvailabilitySlot), [
+            {"restaurant_id": restaurant_id, "date": slot_date, "time": slot_time,
+             "max_party_size": 8, "available": True}
+            for slot_date, slot_time in slots
+        ])
+    return [
+        {"VisitDate": slot_date.isoformat(), "VisitTime": slot_time.strftime("%H:%M:%S"),
+         "PartySize": 2, "ChannelCode": "ONLINE", "Customer[Email]": f"burst{n}@example.com"}
+        for n, (slot_date, slot_time) in enumerate(slots)
+    ]
+
+
+async def burst(concurrency: int, calls) -> Tuple[List[httpx.Response], float]:
+    """Run request factories ``concurrency`` at a time; return responses and seconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(call):
+        async with semaphore:
+            return await call()
+
+    started = timer.perf_counter()
+    responses = await asyncio.gather(*[limited(call) for call in calls])
+    return responses, timer.perf_counter() - started
+
+
+async def run_path(
+    args: argparse.Namespace, database_url: str, profile: str, queued: bool
+) -> Dict[str, Any]:
+    from app.capacity import find_counter_drift
+    from app.database import get_engine
+    from app.write_queue import write_queue
+
+    app = create_app(dataclasses.replace(
+        Settings.from_env(),
+        database_url=database_url,
+        sqlite_profile=profile,
+        slot_horizon_enabled=False,
+        write_queue_enabled=queued,
+        write_queue_batch_size=args.batch_size,
+        write_queue_max_linger_ms=args.max_linger_ms,
+    ), migrate=True)
+    result: Dict[str, Any] = {"failures": [], "errors": 0}
+    failures = result["failures"]
+    async with app.router.lifespan_context(app):
+        forms = add_slots(args.writes)
+        contended = forms.pop()
+        # Server errors become 500 responses instead of raising here
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://writes") as client:
+            async def create(form):
+                return await client.post(f"{PREFIX}/BookingWithStripeToken", data=form)
+
+            def phase(name: str, responses: List[httpx.Response], elapsed: float) -> None:
+                """Record a burst's throughput and count its failed writes."""
+                succeeded = sum(response.status_code == 200 for response in responses)
+                result[name] = succeeded / elapsed
+                result["errors"] += sum(response.status_code >= 500 for response in responses)
+                if succeeded != len(responses) and queued:
+                    failures.append(f"{len(responses) - succeeded} writes failed to {name}")
+
+            created, elapsed = await burst(
+                args.concurrency, [lambda form=form: create(form) for form in forms]
+            )
+            phase("create", created, elapsed)
+            references = [response.json()["booking_reference"]
+                          for response in created if response.status_code == 200]
+
+            updated, elapsed = await burst(args.concurrency, [
+                lambda reference=reference: client.patch(
+                    f"{PREFIX}/Booking/{reference}", data={"PartySize": 3}
+                )
+                for reference in references
+            ])
+            phase("update", updated, elapsed)
+
+            cancelled, elapsed = await burst(args.concurrency, [
+                lambda reference=reference: client.post(
+                    f"{PREFIX}/Booking/{reference}/Cancel",
+                    data={"micrositeName": RESTAURANT_NAME, "bookingReference": reference,
+                          "cancellationReasonId": 1},
+                )
+                for reference in references
+            ])
+            phase("cancel", cancelled, elapsed)
+
+            race, _ = await burst(args.concurrency, [
+                lambda: create(contended) for _ in range(CONTENDERS)
+            ])
+            won = sum(response.status_code == 200 for response in race)
+            if won > DEFAULT_TABLE_CAPACITY or (queued and won != DEFAULT_TABLE_CAPACITY):
+                failures.append(
+                    f"{won} of {CONTENDERS} contenders booked a {DEFAULT_TABLE_CAPACITY}-table slot"
+                )
+
+        with get_engine().connect() as connection:
+            drift = find_counter_drift(connection)
+        if drift:
+            failures.append(f"{len(drift)} slot counters drifted")
+        result["batch"] = write_queue.stats()["mean_batch_size"] if queued else 1.0
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=400,
+                        help="Bookings per burst (each is then updated and cancelled)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-linger-ms", type=float, default=0.0)
+    parser.add_argument("--profiles", default="production,baseline",
+                        help="Comma-separated SQLite profiles (see app.database)")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{args.writes} writes per burst, {args.concurrency} in flight; writes/s")
+    print(f"{'profile':>11} {'path':>12} {'create':>8} {'update':>8} {'cancel':>8} {'batch':>6} {'errors':>7}")
+    for profile in args.profiles.split(","):
+        results = {}
+        for path, queued in (("per-request", False), ("group", True)):
+            with tempfile.TemporaryDirectory() as workdir:
+                database_url = f"sqlite:///{os.path.join(workdir, 'writes.db')}"
+                result = asyncio.run(run_path(args, database_url, profile, queued))
+            results[path] = result
+            failures.extend(f"{profile} {path}: {failure}" for failure in result["failures"])
+            print(f"{profile:>11} {path:>12} {result['create']:>8.0f} {result['update']:>8.0f} "
+                  f"{result['cancel']:>8.0f} {result['batch']:>6.1f} {result['errors']:>7}")
+        for phase in ("create", "update", "cancel"):
+            if results["group"][phase] < results["per-request"][phase]:
+                failures.append(f"{profile}: group commit is slower for {phase}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: group commit keeps every outcome and raises write throughput")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
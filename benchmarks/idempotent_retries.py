@@ -0,0 +1,198 @@
+"""
+Idempotent Retry Benchmark.
+
+Replays what a channel partner does on timeouts against the in-process app on
+a scratch database: every booking and cancellation is sent with an
+``Idempotency-Key`` and then retried, both while the first attempt is still
+in flight (concurrent duplicates) and after it finished (replays). One more
+booking is sent as multipart form data and retried with a new boundary and
+its fields in another order, as a client rebuilding the request would. It
+reports the latency of first attempts and replays and the SQL each replay
+runs.
+
+It exits non-zero if a retry creates a second booking, a replay answers
+differently from the first attempt, a multipart retry is not replayed, or a
+replay reads the restaurants, availability slots or customers.
+
+Usage:
+    python -m benchmarks.idempotent_retries [--bookings 50] [--duplicates 3]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import os
+import statistics
+import sys
+import tempfile
+import time as timer
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+import httpx
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+
+from app.config import Settings
+from app.main import create_app
+
+PREFIX = "/api/ConsumerApi/v1/Restaurant/TheHungryUnicorn"
+# Tables a replay must not read
+UNTOUCHED_TABLES = ("restaurants", "availability_slots", "customers")
+
+
+async def timed(call) -> Tuple[httpx.Response, float]:
+    started = timer.perf_counter()
+    response = await call
+    return response, (timer.perf_counter() - started) * 1000
+
+
+def multipart(fields: List[Tuple[str, str]], boundary: str) -> Tuple[bytes, Dict[str, str]]:
+    """Encode form fields as a multipart body with the given boundary."""
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+        for name, value in fields
+    ]
+    body = ("".join(parts) + f"--{boundary}--\r\n").encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+async def run(args: argparse.Namespace, database_url: str) -> List[str]:
+    from app.database import get_async_session_factory
+    from app.models import Booking
+
+    app = create_app(
+        dataclasses.replace(
+            Settings.from_env(), database_url=database_url, slot_horizon_enabled=False
+        ),
+        migrate=True,
+    )
+    failures = []
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://retries") as client:
+            forms = []
+            for offset in range(1, 31):
+                day = (date.today() + timedelta(days=offset)).isoformat()
+                search = await client.post(f"{PREFIX}/AvailabilitySearch", data={
+                    "VisitDate": day, "PartySize": 2, "ChannelCode": "ONLINE"
+                })
+                forms.extend(
+                    {"VisitDate": day, "VisitTime": slot["time"], "PartySize": 2,
+                     "ChannelCode": "PARTNER", "Customer[Email]": f"guest{offset}@example.com"}
+                    for slot in search.json()["available_slots"] if slot["available"]
+                )
+            multipart_form = forms[args.bookings]
+            forms = forms[:args.bookings]
+
+            firsts: List[float] = []
+            replays: List[float] = []
+            replay_statements: List[int] = []
+            references = []
+            for number, form in enumerate(forms):
+                headers = {"Idempotency-Key": f"booking-{number}"}
+                # The first attempt and its duplicates, sent together
+                attempts = await asyncio.gather(*[
+                    timed(client.post(f"{PREFIX}/BookingWithStripeToken",
+                                      data=form, headers=headers))
+                    for _ in range(args.duplicates)
+                ])
+                bodies = {response.content for response, _ in attempts}
+                if len(bodies) != 1 or attempts[0][0].status_code != 200:
+                    failures.append(f"booking {number}: duplicates answered differently")
+                firsts.append(attempts[0][1])
+                references.append(attempts[0][0].json()["booking_reference"])
+
+                statements.clear()
+                event.listen(Engine, "before_cursor_execute", record)
+                try:
+                    replay, elapsed = await timed(client.post(
+                        f"{PREFIX}/BookingWithStripeToken", data=form, headers=headers
+                    ))
+                finally:
+                    event.remove(Engine, "before_cursor_execute", record)
+                replays.append(elapsed)
+                replay_statements.append(len(statements))
+                replayed = replay.headers.get("idempotent-replayed") == "true"
+                if replay.content not in bodies or not replayed:
+                    failures.append(f"booking {number}: replay differs from the first answer")
+                touched = [
+                    table for table in UNTOUCHED_TABLES
+                    if any(f" {table}" in statement for statement in statements)
+                ]
+                if touched:
+                    failures.append(f"booking {number}: replay read {', '.join(touched)}")
+
+            # A multipart retry: new boundary, fields in another order
+            fields = [(name, str(value)) for name, value in multipart_form.items()]
+            headers = {"Idempotency-Key": "booking-multipart"}
+            attempts = []
+            for boundary, ordered in (("first-attempt", fields), ("retry-7f3a", fields[::-1])):
+                body, content_type = multipart(ordered, boundary)
+                attempts.append(await client.post(
+                    f"{PREFIX}/BookingWithStripeToken", content=body,
+                    headers={**headers, **content_type},
+                ))
+            first, retry = attempts
+            if first.status_code != 200 or retry.content != first.content or (
+                retry.headers.get("idempotent-replayed") != "true"
+            ):
+                failures.append(
+                    f"multipart retry with a new boundary answered {retry.status_code} "
+                    f"instead of replaying {first.status_code}"
+                )
+
+            cancels = []
+            for number, reference in enumerate(references):
+                form = {"micrositeName": "TheHungryUnicorn", "bookingReference": reference,
+                        "cancellationReasonId": 1}
+                attempts = await asyncio.gather(*[
+                    client.post(f"{PREFIX}/Booking/{reference}/Cancel", data=form,
+                                headers={"Idempotency-Key": f"cancel-{number}"})
+                    for _ in range(args.duplicates)
+                ])
+                cancels.extend(response.status_code for response in attempts)
+            if any(status != 200 for status in cancels):
+                failures.append("a duplicate cancellation was not answered like the first")
+
+        async with get_async_session_factory()() as db:
+            created = await db.scalar(select(func.count()).select_from(Booking))
+    # Plus the multipart booking
+    if created != len(forms) + 1:
+        failures.append(f"{created} bookings created for {len(forms) + 1} keys")
+
+    print(f"{len(forms)} bookings and cancellations, each sent {args.duplicates}x at once "
+          f"and replayed once; {created} bookings created")
+    print(f"  first attempt  p50 {statistics.median(firsts):7.2f} ms")
+    print(f"  replay         p50 {statistics.median(replays):7.2f} ms   "
+          f"{max(replay_statements)} SQL statements")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bookings", type=int, default=50)
+    parser.add_argument("--duplicates", type=int, default=3,
+                        help="Copies of each request sent at the same time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{os.path.join(workdir, 'retries.db')}"
+        failures = asyncio.run(run(args, database_url))
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: retries never repeat a write and replays skip restaurants, slots and customers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+Import-Time Budget Check.
+
+Runs each entry point in fresh interpreters under ``python -X importtime`` and
+reports what it imports: the total import time (interpreter startup imports
+excluded), the time spent in the app's own modules and the most expensive
+modules. The entry points are:
+
+- ``import app.main``: what a test module, ``uvicorn app.main:app`` before it
+  builds the app, or any tool touching the app package pays;
+- ``import app.migrate``: the one-shot CLIs (migrate, seed, archive);
+- building the default app (``app.main.app``), i.e. what a worker imports
+  before it can serve.
+
+It exits non-zero if ``import app.main`` takes longer than
+``--import-budget-ms``, if the app's own modules take longer than
+``--app-budget-ms`` to import when the app is built, or if an entry point
+imports a heavy package it should only load lazily (FastAPI, SQLAlchemy or
+pydantic for ``app.main``; FastAPI or Alembic for the CLIs).
+
+Usage:
+    python -m benchmarks.import_time [--runs 5] [--import-budget-ms 50]
+        [--app-budget-ms 250] [--top 10]
+
+Author: AI Assistant
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Most time ``import app.main`` may take, and the app's own modules when the
+# app is built
+IMPORT_BUDGET_MS = 50.0
+APP_BUDGET_MS = 250.0
+
+# name -> (code run with -X importtime, top-level packages it must not import)
+ENTRY_POINTS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "import app.main": ("import app.main", ("fastapi", "sqlalchemy", "pydantic")),
+    "import app.migrate": ("import app.migrate", ("fastapi", "alembic")),
+    "create app": ("import app.main; app.main.app", ()),
+}
+
+
+def import_times(code: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Run code in a fresh interpreter under ``-X importtime``.
+
+    Returns:
+        dict: Module name -> (self, cumulative) import time in microseconds
+    """
+    env = dict(os.environ, SLOT_HORIZON="off")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def measure(code: str, startup: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, float]]:
+    """Self and cumulative import times in ms of the modules code imports beyond startup."""
+    return {
+        module: {"self": self_us / 1000, "cumulative": cumulative_us / 1000}
+        for module, (self_us, cumulative_us) in import_times(code).items()
+        if module not in startup
+    }
+
+
+def total_ms(modules: Dict[str, Dict[str, float]]) -> float:
+    return sum(times["self"] for times in modules.values())
+
+
+def app_ms(modules: Dict[str, Dict[str, float]]) -> float:
+    return sum(
+        times["self"] for module, times in modules.items()
+        if module == "app" or module.startswith("app.")
+    )
+
+
+def heavy_imports(modules: Dict[str, Dict[str, float]], forbidden: Tuple[str, ...]) -> List[str]:
+    """Return the forbidden top-level packages among the imported modules."""
+    return sorted({module.split(".")[0] for module in modules} & set(forbidden))
+
+
+def check_import_times(
+    runs: int = 5,
+    import_budget_ms: float = IMPORT_BUDGET_MS,
+    app_budget_ms: float = APP_BUDGET_MS
+) -> Tuple[Dict[str, List[Dict[str, Dict[str, float]]]], List[str]]:
+    """
+    Measure every entry point in fresh interpreters and check the budgets.
+
+    Args:
+        runs: Fresh processes per entry point (the medians are compared)
+        import_budget_ms: Most time ``import app.main`` may take
+        app_budget_ms: Most time the app's own modules may take to import
+
+    Returns:
+        tuple: The measurements of each run by entry point, and the failures
+    """
+    startup = import_times("pass")
+    failures = []
+    results = {}
+    for name, (code, forbidden) in ENTRY_POINTS.items():
+        results[name] = [measure(code, startup) for _ in range(runs)]
+        heavy = heavy_imports(results[name][0], forbidden)
+        if heavy:
+            failures.append(f"{name} imports {', '.join(heavy)}")
+
+    import_main = statistics.median(map(total_ms, results["import app.main"]))
+    if import_main > import_budget_ms:
+        failures.append(
+            f"import app.main took {import_main:.1f} ms (budget {import_budget_ms:.0f} ms)"
+        )
+    app_code = statistics.median(map(app_ms, results["create app"]))
+    if app_code > app_budget_ms:
+        failures.append(
+            f"app modules took {app_code:.1f} ms to import (budget {app_budget_ms:.0f} ms)"
+        )
+    return results, failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="Most time `import app.main` may take")
+    parser.add_argument("--app-budget-ms", type=float, default=APP_BUDGET_MS,
+                        help="Most time the app's own modules may take to import")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of most expensive modules to list")
+    args = parser.parse_args()
+
+    results, failures = check_import_times(args.runs, args.import_budget_ms, args.app_budget_ms)
+
+    print(f"median of {args.runs} fresh processes (ms):")
+    print(f"{'entry point':>20} {'modules':>8} {'total':>9} {'app code':>9}")
+    for name, runs in results.items():
+        print(f"{name:>20} {len(runs[0]):>8} {statistics.median(map(total_ms, runs)):>9.1f} "
+              f"{statistics.median(map(app_ms, runs)):>9.1f}")
+
+    # Most expensive modules when building the app, by median self time
+    built = results["create app"]
+    self_times = {
+        module: statistics.median(run[module]["self"] for run in built if module in run)
+        for module in built[0]
+    }
+    print(f"\nslowest modules to build the app (self ms):")
+    for module, elapsed in sorted(self_times.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {module:<40} {elapsed:8.1f}")
+    print("app modules (self ms):")
+    for module, elapsed in sorted(self_times.items(), key=lambda item: -item[1]):
+        if module == "app" or module.startswith("app."):
+            print(f"  {module:<40} {elapsed:8.1f}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: imports within budget and heavy packages loaded lazily")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,538 @@
+"""
+In-Process HTTP Load Test for the Booking API.
+
+Drives the real FastAPI app through httpx's ASGI transport (no sockets, no
+server process) with realistic request mixes and reports, per scenario and
+per endpoint, throughput, p50/p95/p99 latency, status codes and SQL
+statements per request. Results can be written as JSON and compared against a
+stored baseline so regressions fail the run.
+
+Scenarios (run in this order on one database):
+    search-heavy        availability searches with the occasional booking
+    booking-burst       many concurrent bookings on free slots
+    cancellation-storm  mass cancellation of existing bookings
+    dashboard           owner listing pages and booking lookups
+    dashboard-poll      dashboard polls revalidating with If-None-Match (mostly 304)
+
+Usage:
+    python -m benchmarks.load_test [--scenario NAME ...] [--requests 500]
+        [--concurrency 10] [--output results.json]
+        [--baseline benchmarks/baseline.json] [--tolerance 0.5]
+        [--save-baseline]
+
+The app reads DATABASE_URL at import time, so the harness points it at a
+throwaway database before importing ``app.main``.
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time as timer
+from dataclasses import dataclass, field
+from datetime import date, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+API_PREFIX = "/api/ConsumerApi/v1/Restaurant"
+RESTAURANT_NAME = "TheHungryUnicorn"
+SLOT_TIMES = [time(12, 0), time(12, 30), time(13, 0), time(13, 30),
+              time(19, 0), time(19, 30), time(20, 0), time(20, 30)]
+
+# Statement counter of the request a worker task currently has in flight;
+# the SQL hook increments it to attribute queries to endpoints
+_current_request: contextvars.ContextVar[Optional[Dict[str, int]]] = contextvars.ContextVar(
+    "current_request", default=None
+)
+
+
+@dataclass
+class Scenario:
+    """
+    A weighted mix of operations.
+
+    Attributes:
+        name (str): Scenario name used on the command line and in results
+        description (str): One-line summary
+        mix (dict): Operation name -> relative weight
+        prepare_bookings (int): Bookings created through the batch endpoint
+            before the scenario starts, for operations that need existing ones
+    """
+
+    name: str
+    description: str
+    mix: Dict[str, int]
+    prepare_bookings: int = 0
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario("search-heavy", "availability searches with the occasional booking",
+                 {"search": 90, "create": 10}),
+        Scenario("booking-burst", "many concurrent bookings on free slots",
+                 {"create": 100}),
+        Scenario("cancellation-storm", "mass cancellation of existing bookings",
+                 {"cancel": 80, "get": 20}, prepare_bookings=500),
+        Scenario("dashboard", "owner listing pages and booking lookups",
+                 {"list": 60, "list_next": 20, "get": 20}),
+        Scenario("dashboard-poll", "dashboard polls revalidating with If-None-Match",
+                 {"poll_list": 70, "poll_get": 20, "reasons": 8, "create": 2}),
+    ]
+}
+
+
+@dataclass
+class LoadState:
+    """Shared data the operations draw from while a scenario runs."""
+
+    headers: Dict[str, str]
+    dates: List[date]
+    free_slots: List[Tuple[date, time]]
+    references: List[str] = field(default_factory=list)
+    cancellable: List[str] = field(default_factory=list)
+    cursors: List[str] = field(default_factory=list)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class EndpointStats:
+    """Raw measurements for one endpoint within a scenario."""
+
+    latencies: List[float] = field(default_factory=list)
+    statuses: Dict[int, int] = field(default_factory=dict)
+    statements: int = 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def op_search(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return "POST AvailabilitySearch", await client.post(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/AvailabilitySearch",
+        data={
+            "VisitDate": rng.choice(state.dates).isoformat(),
+            "PartySize": rng.randint(1, 8),
+            "ChannelCode": "ONLINE",
+        },
+        headers=state.headers,
+    )
+
+
+async def op_create(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    if state.free_slots:
+        visit_date, visit_time = state.free_slots.pop(rng.randrange(len(state.free_slots)))
+    else:
+        visit_date, visit_time = rng.choice(state.dates), rng.choice(SLOT_TIMES)
+    response = await client.post(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/BookingWithStripeToken",
+        data={
+            "VisitDate": visit_date.isoformat(),
+            "VisitTime": visit_time.isoformat(),
+            "PartySize": rng.randint(1, 6),
+            "ChannelCode": "ONLINE",
+            "FirstName": "Load",
+            "Surname": "Test",
+            "Email": f"load{rng.randrange(1000)}@example.com",
+        },
+        headers=state.headers,
+    )
+    if response.status_code == 200:
+        state.references.append(response.json()["booking_reference"])
+    return "POST BookingWithStripeToken", response
+
+
+async def op_cancel(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    reference = (
+        state.cancellable.pop(rng.randrange(len(state.cancellable)))
+        if state.cancellable else rng.choice(state.references)
+    )
+    return "POST Booking/{ref}/Cancel", await client.post(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/Booking/{reference}/Cancel",
+        data={
+            "micrositeName": RESTAURANT_NAME,
+            "bookingReference": reference,
+            "cancellationReasonId": rng.randint(1, 5),
+        },
+        headers=state.headers,
+    )
+
+
+async def op_get(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    return "GET Booking/{ref}", await client.get(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/Booking/{rng.choice(state.references)}",
+        headers=state.headers,
+    )
+
+
+async def op_list(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    response = await client.get(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/Bookings",
+        params={"limit": 50},
+        headers=state.headers,
+    )
+    if "X-Next-Cursor" in response.headers:
+        state.cursors.append(response.headers["X-Next-Cursor"])
+    return "GET Bookings", response
+
+
+async def op_list_next(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    params: Dict[str, Any] = {"limit": 50}
+    if state.cursors:
+        params["cursor"] = rng.choice(state.cursors)
+    response = await client.get(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/Bookings", params=params, headers=state.headers
+    )
+    if "X-Next-Cursor" in response.headers:
+        state.cursors.append(response.headers["X-Next-Cursor"])
+    return "GET Bookings?cursor", response
+
+
+async def revalidate(client: httpx.AsyncClient, state: LoadState, url: str) -> httpx.Response:
+    """GET a URL with the ETag of its last 200 response, like a browser cache."""
+    headers = dict(state.headers)
+    if url in state.etags:
+        headers["If-None-Match"] = state.etags[url]
+    response = await client.get(url, headers=headers)
+    if response.status_code == 200 and "ETag" in response.headers:
+        state.etags[url] = response.headers["ETag"]
+    return response
+
+
+async def op_poll_list(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    url = f"{API_PREFIX}/{RESTAURANT_NAME}/Bookings?limit=50"
+    return "GET Bookings (revalidate)", await revalidate(client, state, url)
+
+
+async def op_poll_get(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    # Polls come back to a few bookings, as a dashboard detail view would
+    url = f"{API_PREFIX}/{RESTAURANT_NAME}/Booking/{rng.choice(state.references[:20])}"
+    return "GET Booking/{ref} (revalidate)", await revalidate(client, state, url)
+
+
+async def op_reasons(client: httpx.AsyncClient, state: LoadState, rng: random.Random):
+    url = f"{API_PREFIX}/{RESTAURANT_NAME}/CancellationReasons"
+    return "GET CancellationReasons", await revalidate(client, state, url)
+
+
+OPERATIONS: Dict[str, Callable] = {
+    "search": op_search,
+    "create": op_create,
+    "cancel": op_cancel,
+    "get": op_get,
+    "list": op_list,
+    "list_next": op_list_next,
+    "poll_list": op_poll_list,
+    "poll_get": op_poll_get,
+    "reasons": op_reasons,
+}
+
+
+async def prepare_bookings(
+    client: httpx.AsyncClient, state: LoadState, count: int, rng: random.Random
+) -> None:
+    """Create ``count`` bookings through the batch endpoint for later cancellation."""
+    count = min(count, len(state.free_slots))
+    targets = [state.free_slots.pop(rng.randrange(len(state.free_slots))) for _ in range(count)]
+    response = await client.post(
+        f"{API_PREFIX}/{RESTAURANT_NAME}/Bookings/Batch",
+        json=[
+            {
+                "VisitDate": visit_date.isoformat(),
+                "VisitTime": visit_time.isoformat(),
+                "PartySize": 2,
+                "ChannelCode": "PARTNER",
+                "Customer": {"FirstName": "Prepared", "Email": f"prep{n}@example.com"},
+            }
+            for n, (visit_date, visit_time) in enumerate(targets)
+        ],
+        headers=state.headers,
+    )
+    response.raise_for_status()
+    created = [
+        result["booking_reference"]
+        for result in response.json()["results"] if result["status"] == "created"
+    ]
+    state.references.extend(created)
+    state.cancellable.extend(created)
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    state: LoadState,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    rng: random.Random,
+) -> Dict[str, Any]:
+    """
+    Run ``requests`` operations drawn from a scenario's mix with a fixed number
+    of concurrent clients.
+
+    Returns:
+        dict: Scenario summary with per-endpoint statistics
+    """
+    if scenario.prepare_bookings:
+        await prepare_bookings(client, state, scenario.prepare_bookings, rng)
+
+    names = list(scenario.mix)
+    plan = rng.choices(names, weights=[scenario.mix[name] for name in names], k=requests)
+    stats: Dict[str, EndpointStats] = {}
+    queue = iter(plan)
+
+    async def worker() -> None:
+        for name in queue:
+            if name in ("get", "poll_get", "cancel") and not (state.references or state.cancellable):
+                name = "search"
+            counter = {"statements": 0}
+            token = _current_request.set(counter)
+            started = timer.perf_counter()
+            label, response = await OPERATIONS[name](client, state, rng)
+            elapsed = timer.perf_counter() - started
+            _current_request.reset(token)
+
+            endpoint = stats.setdefault(label, EndpointStats())
+            endpoint.latencies.append(elapsed * 1000)
+            endpoint.statuses[response.status_code] = (
+                endpoint.statuses.get(response.status_code, 0) + 1
+            )
+            endpoint.statements += counter["statements"]
+
+    started = timer.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = timer.perf_counter() - started
+
+    endpoints = {}
+    for label, endpoint in sorted(stats.items()):
+        latencies = sorted(endpoint.latencies)
+        count = len(latencies)
+        endpoints[label] = {
+            "requests": count,
+            "statuses": {str(code): n for code, n in sorted(endpoint.statuses.items())},
+            "errors": sum(n for code, n in endpoint.statuses.items() if code >= 500),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "queries_per_request": round(endpoint.statements / count, 3),
+        }
+    return {
+        "description": scenario.description,
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "endpoints": endpoints,
+    }
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Attribute a SQL statement to the request currently in flight, if any."""
+    counter = _current_request.get()
+    if counter is not None:
+        counter["statements"] += 1
+
+
+def add_slots(days: int) -> List[Tuple[date, time]]:
+    """
+    Extend the sample restaurant's availability to ``days`` days.
+
+    Returns:
+        list: Every (date, time) slot still available
+    """
+    # Imported here: the app modules read DATABASE_URL at import time
+    from sqlalchemy import insert, select
+    from app.database import get_session_factory
+    from app.models import AvailabilitySlot, Restaurant
+
+    with get_session_factory()() as db:
+        restaurant_id = db.scalar(
+            select(Restaurant.id).where(Restaurant.name == RESTAURANT_NAME)
+        )
+        existing = set(db.execute(
+            select(AvailabilitySlot.date, AvailabilitySlot.time)
+            .where(AvailabilitySlot.restaurant_id == restaurant_id)
+        ).all())
+        new_rows = [
+            {"restaurant_id": restaurant_id, "date": slot_date, "time": slot_time,
+             "max_party_size": 8, "available": True}
+            for offset in range(days)
+            for slot_date in [date.today() + timedelta(days=offset)]
+            for slot_time in SLOT_TIMES
+            if (slot_date, slot_time) not in existing
+        ]
+        if new_rows:
+            db.execute(insert(AvailabilitySlot), new_rows)
+        db.commit()
+        return [
+            (slot_date, slot_time) for slot_date, slot_time in db.execute(
+                select(AvailabilitySlot.date, AvailabilitySlot.time).where(
+                    AvailabilitySlot.restaurant_id == restaurant_id,
+                    AvailabilitySlot.available.is_(True),
+                    AvailabilitySlot.booked_tables < AvailabilitySlot.table_capacity
+                )
+            )
+        ]
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # Imported here: the app modules read DATABASE_URL at import time
+    from app.config import settings
+    from app.main import app
+    from app.migrate import migrate
+    from app.routers.booking import MOCK_BEARER_TOKEN
+
+    migrate()
+    async with app.router.lifespan_context(app):
+        rng = random.Random(args.seed)
+        free_slots = add_slots(args.days)
+        state = LoadState(
+            headers={"Authorization": f"Bearer {MOCK_BEARER_TOKEN}"},
+            dates=sorted({slot_date for slot_date, _ in free_slots}),
+            free_slots=free_slots,
+        )
+        event.listen(Engine, "before_cursor_execute", _count_statement)
+
+        results: Dict[str, Any] = {
+            "meta": {
+                "python": platform.python_version(),
+                "sqlite_profile": settings.sqlite_profile,
+                "availability_cache": settings.availability_cache_enabled,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+            },
+            "scenarios": {},
+        }
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for name in args.scenario:
+                results["scenarios"][name] = await run_scenario(
+                    client, state, SCENARIOS[name], args.requests, args.concurrency, rng
+                )
+        event.remove(Engine, "before_cursor_execute", _count_statement)
+    return results
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    for name, scenario in results["scenarios"].items():
+        print(
+            f"\n{name}: {scenario['requests']} requests in {scenario['seconds']:.2f}s "
+            f"({scenario['throughput_rps']:.0f} req/s, {scenario['concurrency']} clients)"
+        )
+        print(
+            f"  {'endpoint':<28} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'sql/req':>8}  statuses"
+        )
+        for label, endpoint in scenario["endpoints"].items():
+            print(
+                f"  {label:<28} {endpoint['requests']:>5} {endpoint['p50_ms']:>8.2f} "
+                f"{endpoint['p95_ms']:>8.2f} {endpoint['p99_ms']:>8.2f} "
+                f"{endpoint['queries_per_request']:>8.2f}  {endpoint['statuses']}"
+            )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline run.
+
+    A regression is: throughput lower than the baseline by more than
+    ``tolerance``, median latency higher by more than ``tolerance``, any
+    extra SQL statement per request, or server errors. Tail percentiles are
+    reported but not gated: SQLite's busy-wait lock makes them too noisy.
+
+    Returns:
+        list: Human-readable regression descriptions (empty if none)
+    """
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        if scenario["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {scenario['throughput_rps']} req/s "
+                f"< baseline {base['throughput_rps']}"
+            )
+        for label, endpoint in scenario["endpoints"].items():
+            if endpoint["errors"]:
+                regressions.append(f"{name} {label}: {endpoint['errors']} server errors")
+            base_endpoint = base["endpoints"].get(label)
+            if base_endpoint is None:
+                continue
+            if endpoint["p50_ms"] > base_endpoint["p50_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name} {label}: p50 {endpoint['p50_ms']} ms "
+                    f"> baseline {base_endpoint['p50_ms']}"
+                )
+            if endpoint["queries_per_request"] > base_endpoint["queries_per_request"] + 0.5:
+                regressions.append(
+                    f"{name} {label}: {endpoint['queries_per_request']} SQL/request "
+                    f"> baseline {base_endpoint['queries_per_request']}"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS),
+                        default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365,
+                        help="days of availability slots to seed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="baseline JSON to compare against, if it exists")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative throughput/p50 regression")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'load.db')}"
+        results = asyncio.run(run(args))
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as output:
+            json.dump(results, output, indent=2)
+        print(f"\nbaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.tolerance)
+    if regressions:
+        print("\nFAIL: regressions against baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  {regression}", file=sys.stderr)
+        return 1
+    print("\nOK: no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""
+Query Plan Regression Check.
+
+Drives every router endpoint (and the background jobs that run in the API
+process) through the real app on a scratch database, records each distinct
+SQL statement it executes, and runs ``EXPLAIN QUERY PLAN`` on it. The script
+exits non-zero if a hot path reads one of the large tables with a full SCAN
+(of the table or of a whole index) or sorts its rows in a temporary B-tree
+instead of reading them in index order.
+
+Only ``python -m app.capacity``, which checks every slot by design, may scan;
+its plans are printed but not judged. Pass ``--verbose`` to print every plan.
+``check_query_plans()`` runs the same check for the test suite
+(``tests/test_query_plans.py``).
+
+Usage:
+    python -m benchmarks.query_plans [--verbose]
+
+Author: AI Assistant
+"""
+
+import argparse
+import asyncio
+import contextvars
+import dataclasses
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+API_PREFIX = "/api/ConsumerApi/v1/Restaurant"
+RESTAURANT_NAME = "TheHungryUnicorn"
+
+# Tables that grow with traffic: reading one of them in full is a regression
+LARGE_TABLES = {
+    "bookings", "bookings_archive", "availability_slots", "availability_slots_archive",
+    "customers", "cache_invalidations", "booking_versions", "idempotency_keys",
+}
+# Work that reads whole tables on purpose
+UNJUDGED = {"capacity check"}
+
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF |LAST TERM OF )?ORDER BY")
+
+# Label of the operation currently running; the SQL hook files statements under it
+_current_label: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_label", default=None
+)
+# (label, statement) -> first parameters seen
+_statements: Dict[Tuple[str, str], Any] = {}
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    label = _current_label.get()
+    verb = statement.lstrip()[:6].upper()
+    if label is None or verb not in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH"):
+        return
+    if verb == "INSERT" and " SELECT " not in statement.upper():
+        # Plain inserts read nothing
+        return
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    _statements.setdefault((label, statement), parameters)
+
+
+async def labelled(label: str, call) -> Any:
+    """
+    Run an awaitable with its SQL statements filed under ``label``.
+
+    A response rejected before reaching its handler's queries (422) or a
+    server error fails the run, so no query path goes unchecked silently.
+    """
+    token = _current_label.set(label)
+    try:
+        result = await call
+    finally:
+        _current_label.reset(token)
+    if isinstance(result, httpx.Response) and (
+        result.status_code == 422 or result.status_code >= 500
+    ):
+        raise RuntimeError(f"{label}: HTTP {result.status_code} {result.text[:200]}")
+    return result
+
+
+async def exercise(client: httpx.AsyncClient, headers: Dict[str, str]) -> None:
+    """Call every endpoint and job once or more, covering their query variants."""
+    from app.archive import run_archive
+    from app.capacity import find_counter_drift
+    from app.database import get_async_session_factory, get_engine
+    from app.invalidation import invalidation_bus
+    from app.slot_horizon import run_slot_horizon
+
+    base = f"{API_PREFIX}/{RESTAURANT_NAME}"
+    day = date.today() + timedelta(days=3)
+    search_form = {"VisitDate": day.isoformat(), "PartySize": 2, "ChannelCode": "ONLINE"}
+
+    search = await labelled("POST AvailabilitySearch", client.post(
+        f"{base}/AvailabilitySearch", data=search_form, headers=headers
+    ))
+    for include_slots in (False, True):
+        await labelled("POST AvailabilitySearchRange", client.post(
+            f"{base}/AvailabilitySearchRange",
+            data={"DateFrom": day.isoformat(), "DateTo": (day + timedelta(days=6)).isoformat(),
+                  "PartySize": 2, "ChannelCode": "ONLINE", "IncludeSlots": include_slots},
+            headers=headers,
+        ))
+    free = [slot["time"] for slot in search.json()["available_slots"] if slot["available"]]
+
+    references: List[str] = []
+    for slot_time in free[:2]:
+        created = await labelled("POST BookingWithStripeToken", client.post(
+            f"{base}/BookingWithStripeToken",
+            data={**search_form, "VisitTime": slot_time, "FirstName": "Plan",
+                  "Surname": "Check", "Email": "plan@example.com"},
+            headers=headers,
+        ))
+        references.append(created.json()["booking_reference"])
+    # A keyed booking and its replay
+    for _ in range(2):
+        await labelled("POST BookingWithStripeToken (Idempotency-Key)", client.post(
+            f"{base}/BookingWithStripeToken",
+            data={**search_form, "VisitTime": free[-1], "Email": "plan@example.com"},
+            headers={**headers, "Idempotency-Key": "plan-check"},
+        ))
+    # A full slot takes the failure-reason path
+    for _ in range(4):
+        await labelled("POST BookingWithStripeToken", client.post(
+            f"{base}/BookingWithStripeToken",
+            data={**search_form, "VisitTime": free[0]}, headers=headers,
+        ))
+
+    await labelled("POST Bookings/Batch", client.post(
+        f"{base}/Bookings/Batch",
+        json=[
+            {"VisitDate": (day + timedelta(days=1)).isoformat(), "VisitTime": slot_time,
+             "PartySize": 2, "ChannelCode": "PARTNER",
+             "Customer": {"FirstName": "Batch", "Email": "batch@example.com"}}
+            for slot_time in free[:3]
+        ],
+        headers=headers,
+    ))
+
+    reference = references[0]
+    booking = await labelled("GET Booking/{ref}", client.get(
+        f"{base}/Booking/{reference}", headers=headers
+    ))
+    await labelled("GET Booking/{ref}", client.get(
+        f"{base}/Booking/{reference}",
+        headers={**headers, "If-None-Match": booking.headers["ETag"]},
+    ))
+    await labelled("GET Booking/{ref}", client.get(f"{base}/Booking/ARCHIVED1", headers=headers))
+    await labelled("PATCH Booking/{ref}", client.patch(
+        f"{base}/Booking/{reference}", json={"party_size": 3}, headers=headers
+    ))
+    await labelled("POST Booking/{ref}/Update", client.post(
+        f"{base}/Booking/{reference}/Update",
+        data={"VisitDate": day.isoformat(), "VisitTime": free[-1], "PartySize": 2},
+        headers=headers,
+    ))
+
+    first_page = await labelled("GET Bookings", client.get(
+        f"{base}/Bookings", params={"limit": 2}, headers=headers
+    ))
+    for params in (
+        {"limit": 2, "cursor": first_page.headers.get("X-Next-Cursor")},
+        {"limit": 2, "offset": 2},
+        {"limit": 50, "offset": 1000},
+        {"status": "confirmed", "date_from": day.isoformat(),
+         "date_to": (day + timedelta(days=7)).isoformat()},
+        {"format": "ndjson"},
+    ):
+        await labelled("GET Bookings", client.get(
+            f"{base}/Bookings", params={k: v for k, v in params.items() if v}, headers=headers
+        ))
+    await labelled("GET Bookings", client.get(
+        f"{base}/Bookings", headers={**headers, "If-None-Match": first_page.headers["ETag"]}
+    ))
+
+    await labelled("POST Booking/{ref}/Cancel", client.post(
+        f"{base}/Booking/{reference}/Cancel",
+        data={"micrositeName": RESTAURANT_NAME, "bookingReference": reference,
+              "cancellationReasonId": 1},
+        headers=headers,
+    ))
+    await labelled("GET CancellationReasons", client.get(
+        f"{base}/CancellationReasons", headers=headers
+    ))
+
+    sessions = get_async_session_factory()
+    async with sessions() as db:
+        await labelled("invalidation poll", invalidation_bus.poll(db))
+        await labelled("invalidation prune", invalidation_bus.prune(db))
+    await labelled("slot horizon job", run_slot_horizon(sessions))
+    await labelled("archive job", run_archive(
+        sessions, booking_retention_days=0, slot_retention_days=0
+    ))
+
+    async def capacity_check() -> None:
+        with get_engine().connect() as connection:
+            find_counter_drift(connection)
+    await labelled("capacity check", capacity_check())
+
+
+def plan_of(connection: sqlite3.Connection, statement: str, parameters: Any) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines of a statement."""
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[3] for row in rows]
+
+
+def judge(plan: List[str]) -> List[str]:
+    """Return the plan lines that read a large table in full or sort it."""
+    problems = []
+    for line in plan:
+        scan = FULL_SCAN.match(line)
+        if scan and scan.group(1) in LARGE_TABLES:
+            problems.append(line)
+        elif TEMP_SORT.search(line):
+            problems.append(line)
+    return problems
+
+
+async def run(database_path: str) -> None:
+    from app.config import Settings
+    from app.main import create_app
+    from app.routers.booking import MOCK_BEARER_TOKEN
+
+    app = create_app(dataclasses.replace(
+        Settings.from_env(),
+        database_url=f"sqlite:///{database_path}",
+        availability_cache_enabled=False,
+        invalidation_bus_enabled=True,
+        slot_horizon_enabled=False,
+    ), migrate=True)
+    async with app.router.lifespan_context(app):
+        event.listen(Engine, "before_cursor_execute", _record_statement)
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://plans") as client:
+                await exercise(client, {"Authorization": f"Bearer {MOCK_BEARER_TOKEN}"})
+        finally:
+            event.remove(Engine, "before_cursor_execute", _record_statement)
+
+
+def check_query_plans(verbose: bool = False) -> Tuple[int, List[str]]:
+    """
+    Exercise the app on a scratch database and judge every statement's plan.
+
+    Args:
+        verbose: Print every plan, not only the failing and unjudged ones
+
+    Returns:
+        tuple: Number of statements checked, and one line per statement
+        that scans or sorts a large table on a hot path
+    """
+    _statements.clear()
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        database_path = os.path.join(workdir, "plans.db")
+        asyncio.run(run(database_path))
+
+        connection = sqlite3.connect(database_path)
+        for (label, statement), parameters in sorted(_statements.items()):
+            plan = plan_of(connection, statement, parameters)
+            problems = judge(plan)
+            judged = label not in UNJUDGED
+            summary = f"{label}: {' '.join(statement.split())[:160]}"
+            if problems and judged:
+                failures.append(f"{summary} ({'; '.join(problems)})")
+            if verbose or problems:
+                status = "FAIL" if problems and judged else "ok" if not problems else "not judged"
+                print(f"[{status}] {summary}")
+                for line in plan:
+                    print(f"    {line}")
+        connection.close()
+    return len(_statements), failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    checked, failures = check_query_plans(args.verbose)
+    print(f"{checked} statements checked, {len(failures)} with a full scan or sort")
+    if failures:
+        print("FAIL: hot paths must use an index", file=sys.stderr)
+        return 1
+    print("OK: every hot path uses an index")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Booking Reference Collision Check.
+
+Encodes millions of consecutive sequence numbers with
+``app.references.encode_reference`` and checks that every reference is unique,
+7 characters long, decodes back to its sequence number, and that changing any
+single character is caught by the check character.
+
+Usage:
+    python -m benchmarks.reference_collisions [--count 2000000] [--start 0]
+
+Author: AI Assistant
+"""
+
+import argparse
+import sys
+import time as timer
+
+from app.references import ALPHABET, SPACE, decode_reference, encode_reference
+
+# Number of references whose single-character substitutions are all tried
+SUBSTITUTION_SAMPLE = 2000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2_000_000)
+    parser.add_argument("--start", type=int, default=0)
+    args = parser.parse_args()
+    stop = min(args.start + args.count, SPACE)
+
+    failures = 0
+    seen = set()
+    started = timer.perf_counter()
+    for n in range(args.start, stop):
+        reference = encode_reference(n)
+        if len(reference) != 7 or reference in seen:
+            failures += 1
+            print(f"FAIL: {n} -> {reference!r} is a duplicate or wrong length", file=sys.stderr)
+        seen.add(reference)
+        if decode_reference(reference) != n:
+            failures += 1
+            print(f"FAIL: {reference} does not decode to {n}", file=sys.stderr)
+    elapsed = timer.perf_counter() - started
+    print(
+        f"encoded {stop - args.start} references in {elapsed:.2f}s "
+        f"({(stop - args.start) / elapsed:.0f}/s), {len(seen)} unique"
+    )
+
+    undetected = 0
+    for n in range(args.start, min(args.start + SUBSTITUTION_SAMPLE, stop)):
+        reference = encode_reference(n)
+        for position in range(len(reference)):
+            for char in ALPHABET:
+                if char == reference[position]:
+                    continue
+                typo = reference[:position] + char + reference[position + 1:]
+                if decode_reference(typo) is not None:
+                    undetected += 1
+    print(f"single-character typos undetected: {undetected}")
+
+    if failures or undetected:
+        print("FAIL", file=sys.stderr)
+        return 1
+    print("OK: no collisions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
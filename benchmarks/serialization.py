@@ -0,0 +1,199 @@
+"""
+Response Serialization Micro-Benchmark.
+
+Measures the cost per 1,000 rows of turning owner-list bookings and
+availability slots into a JSON body, along the paths a response can take:
+
+- ORM entities (with their customer eager-loaded) serialized by FastAPI's
+  default path, ``jsonable_encoder`` plus stdlib ``json`` (the old list path);
+- plain Core rows with the same default encoding;
+- plain Core rows encoded by ``FastJSONResponse`` (FAST_JSON), with orjson
+  and with the stdlib fallback;
+
+plus the encoding step alone for prebuilt dicts. It exits non-zero if the
+fast path produces a different body than FastAPI would, or is not faster.
+
+Usage:
+    python -m benchmarks.serialization [--rows 1000] [--repeat 20]
+
+Author: AI Assistant
+"""
+
+import argparse
+import sys
+import time as timer
+from datetime import date, time, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.pool import StaticPool
+
+import app.responses as responses
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.routers.availability import slot_availability_query, slot_detail
+from app.routers.booking import booking_list_query, booking_list_row
+
+RESTAURANT_NAME = "EncoderKitchen"
+
+
+def seed(session: Session, rows: int) -> None:
+    """Insert ``rows`` bookings (each with a customer) and ``rows`` slots on one day."""
+    session.add(Restaurant(id=1, name=RESTAURANT_NAME, microsite_name=RESTAURANT_NAME))
+    session.execute(insert(Customer), [
+        {"id": n + 1, "first_name": "Zoë", "surname": f"Guest{n}", "email": f"g{n}@example.com",
+         "mobile": "07700900000"}
+        for n in range(rows)
+    ])
+    session.execute(insert(Booking), [
+        {
+            "booking_reference": f"E{n:07d}",
+            "restaurant_id": 1,
+            "customer_id": n + 1,
+            "visit_date": date.today() + timedelta(days=n % 30),
+            "visit_time": time(12 + n % 10, 15 * (n % 4)),
+            "party_size": 2,
+            "channel_code": "ONLINE",
+            "status": "confirmed",
+        }
+        for n in range(rows)
+    ])
+    session.execute(insert(AvailabilitySlot), [
+        {
+            "restaurant_id": 1,
+            "date": date.today(),
+            "time": time(n // 60 % 24, n % 60, n // 1440 % 60),
+            "booked_tables": n % 4,
+        }
+        for n in range(rows)
+    ])
+    session.commit()
+
+
+def orm_list_row(b: Booking) -> Dict[str, Any]:
+    """The owner list row as it was built from ORM entities."""
+    return {
+        "booking_reference": b.booking_reference,
+        "booking_id": b.id,
+        "restaurant": RESTAURANT_NAME,
+        "visit_date": b.visit_date,
+        "visit_time": b.visit_time,
+        "party_size": b.party_size,
+        "status": b.status,
+        "customer": {
+            "id": b.customer.id if b.customer else None,
+            "first_name": b.customer.first_name if b.customer else None,
+            "surname": b.customer.surname if b.customer else None,
+            "email": b.customer.email if b.customer else None,
+            "mobile": b.customer.mobile if b.customer else None,
+        },
+        "created_at": b.created_at,
+        "updated_at": b.updated_at,
+    }
+
+
+def default_body(content: Any) -> bytes:
+    """Encode content the way FastAPI does for a returned dict or list."""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_body(content: Any) -> bytes:
+    return responses.FastJSONResponse(content).body
+
+
+def stdlib_fast_body(content: Any) -> bytes:
+    """FastJSONResponse as it behaves without orjson installed."""
+    orjson, responses.orjson = responses.orjson, None
+    try:
+        return responses.FastJSONResponse(content).body
+    finally:
+        responses.orjson = orjson
+
+
+def best_of(repeat: int, call: Callable[[], bytes]) -> float:
+    """Best wall time in ms over ``repeat`` runs."""
+    timings = []
+    for _ in range(repeat):
+        started = timer.perf_counter()
+        call()
+        timings.append((timer.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.rows)
+
+    orm_query = (
+        select(Booking).options(joinedload(Booking.customer))
+        .where(Booking.restaurant_id == 1)
+        .order_by(Booking.visit_date.desc(), Booking.visit_time.desc(), Booking.id.desc())
+    )
+    list_query = booking_list_query(Booking, 1)
+    slot_query = slot_availability_query(1, date.today(), 2)
+
+    def orm_list() -> List[Dict[str, Any]]:
+        with Session(engine) as session:
+            return [orm_list_row(b) for b in session.scalars(orm_query).unique()]
+
+    def core_list() -> List[Dict[str, Any]]:
+        with Session(engine) as session:
+            return [booking_list_row(b, RESTAURANT_NAME) for b in session.execute(list_query)]
+
+    def core_slots() -> List[Dict[str, Any]]:
+        with Session(engine) as session:
+            return [slot_detail(slot, 2) for slot in session.execute(slot_query)]
+
+    bookings = core_list()
+    slots = core_slots()
+    paths: Dict[str, Callable[[], bytes]] = {
+        "list: ORM + jsonable_encoder": lambda: default_body(orm_list()),
+        "list: rows + jsonable_encoder": lambda: default_body(core_list()),
+        "list: rows + FastJSONResponse": lambda: fast_body(core_list()),
+        "encode list: jsonable_encoder": lambda: default_body(bookings),
+        "encode list: fast (stdlib)": lambda: stdlib_fast_body(bookings),
+        "encode list: fast": lambda: fast_body(bookings),
+        "encode slots: jsonable_encoder": lambda: default_body(slots),
+        "encode slots: fast": lambda: fast_body(slots),
+    }
+
+    failures = []
+    expected_list = default_body(orm_list())
+    for name in ("list: rows + jsonable_encoder", "list: rows + FastJSONResponse",
+                 "encode list: fast (stdlib)", "encode list: fast"):
+        if paths[name]() != expected_list:
+            failures.append(f"{name}: body differs from FastAPI's encoding")
+    if fast_body(slots) != default_body(slots):
+        failures.append("encode slots: body differs from FastAPI's encoding")
+
+    per_thousand = 1000 / args.rows
+    results = {name: best_of(args.repeat, call) * per_thousand for name, call in paths.items()}
+    encoder = "orjson" if responses.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"fast path encoder: {encoder}")
+    print(f"{'path':>32} {'ms per 1k rows':>15}")
+    for name, elapsed in results.items():
+        print(f"{name:>32} {elapsed:>15.3f}")
+
+    if results["list: rows + FastJSONResponse"] >= results["list: ORM + jsonable_encoder"]:
+        failures.append("fast list path is not faster than the ORM path")
+    if results["encode list: fast"] >= results["encode list: jsonable_encoder"]:
+        failures.append("fast encoding is not faster than jsonable_encoder")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: fast path matches FastAPI's JSON and is faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
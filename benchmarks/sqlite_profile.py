@@ -0,0 +1,164 @@
+"""
+SQLite Engine Profile Load Test.
+
+Runs concurrent reader and writer threads against a file database for each
+SQLite tuning profile in ``app.database.SQLITE_PROFILES`` and reports read and
+write throughput plus "database is locked" failures. Readers run the
+availability search query; writers insert a booking and toggle its slot in one
+transaction, like the booking endpoints do.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--readers 8] [--writers 4] [--seconds 5]
+
+Author: AI Assistant
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time as timer
+from datetime import date, time, timedelta
+from typing import Dict
+
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import SQLITE_PROFILES, build_engine
+from app.models import Base, Restaurant, Customer, Booking, AvailabilitySlot
+from app.routers.availability import slot_availability_query
+
+DAYS = 30
+SLOT_TIMES = [time(h, m) for h in (12, 13, 19, 20) for m in (0, 30)]
+
+
+def seed(session_factory) -> Dict[str, int]:
+    """Seed one restaurant with a month of slots and return the ids writers need."""
+    with session_factory() as session:
+        restaurant = Restaurant(name="ProfileBistro", microsite_name="ProfileBistro")
+        customer = Customer(first_name="Load", surname="Test", email="load@example.com")
+        session.add_all([restaurant, customer])
+        session.flush()
+        session.add_all([
+            AvailabilitySlot(
+                restaurant_id=restaurant.id,
+                date=date.today() + timedelta(days=day),
+                time=slot_time
+            )
+            for day in range(DAYS)
+            for slot_time in SLOT_TIMES
+        ])
+        session.commit()
+        return {"restaurant_id": restaurant.id, "customer_id": customer.id}
+
+
+def run_profile(profile: str, args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Load-test one profile on a fresh database file.
+
+    Returns:
+        dict: Reads/sec, writes/sec and lock error count
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        url = f"sqlite:///{os.path.join(workdir, 'profile.db')}"
+        engine = build_engine(url, profile)
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        ids = seed(session_factory)
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = timer.perf_counter() + args.seconds
+
+        def record(key: str) -> None:
+            with lock:
+                counts[key] += 1
+
+        def reader(worker: int) -> None:
+            n = 0
+            while timer.perf_counter() < deadline:
+                visit_date = date.today() + timedelta(days=(worker + n) % DAYS)
+                try:
+                    with session_factory() as session:
+                        session.execute(
+                            slot_availability_query(ids["restaurant_id"], visit_date, 2)
+                        ).all()
+                    record("reads")
+                except OperationalError:
+                    record("locked")
+                n += 1
+
+        def writer(worker: int) -> None:
+            n = 0
+            while timer.perf_counter() < deadline:
+                visit_date = date.today() + timedelta(days=(worker + n) % DAYS)
+                slot_time = SLOT_TIMES[n % len(SLOT_TIMES)]
+                try:
+                    with session_factory() as session:
+                        session.add(Booking(
+                            booking_reference=f"W{worker:02d}{n:07d}",
+                            restaurant_id=ids["restaurant_id"],
+                            customer_id=ids["customer_id"],
+                            visit_date=visit_date,
+                            visit_time=slot_time,
+                            party_size=2,
+                            channel_code="ONLINE",
+                            status="confirmed"
+                        ))
+                        session.execute(
+                            update(AvailabilitySlot)
+                            .where(
+                                AvailabilitySlot.restaurant_id == ids["restaurant_id"],
+                                AvailabilitySlot.date == visit_date,
+                                AvailabilitySlot.time == slot_time
+                            )
+                            .values(
+                                booked_tables=AvailabilitySlot.booked_tables + 1,
+                                booked_covers=AvailabilitySlot.booked_covers + 2
+                            )
+                        )
+                        session.commit()
+                    record("writes")
+                except OperationalError:
+                    record("locked")
+                n += 1
+
+        threads = [
+            threading.Thread(target=reader, args=(i,)) for i in range(args.readers)
+        ] + [
+            threading.Thread(target=writer, args=(i,)) for i in range(args.writers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+    return {
+        "reads_per_sec": counts["reads"] / args.seconds,
+        "writes_per_sec": counts["writes"] / args.seconds,
+        "locked": counts["locked"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':>12} {'reads/s':>9} {'writes/s':>9} {'locked':>7}")
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, args)
+        print(
+            f"{profile:>12} {result['reads_per_sec']:>9.0f} "
+            f"{result['writes_per_sec']:>9.0f} {result['locked']:>7}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+API Worker Startup Benchmark and Migration Check.
+
+Measures what every API worker pays when it boots, in fresh processes on a
+migrated scratch database: importing ``app.main`` and building the app, then
+running its lifespan startup, with the SQL statements they execute. For
+comparison it also times the work workers used to do on every boot before
+migrations existed (creating the schema with ``create_all``, checking every
+index and probing for sample data), which now runs once in ``python -m
+app.migrate``.
+
+It also checks the migrations themselves: the schema they build, on an empty
+database and on one created by ``create_all`` before migrations existed, must
+match the models, and ``app.migrate.SCHEMA_REVISION`` must be the newest
+revision. It exits non-zero if a check fails or a worker boot executes more
+than ``--max-statements`` statements.
+
+Usage:
+    python -m benchmarks.startup_time [--runs 5] [--max-statements 5]
+
+Author: AI Assistant
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+# Run in a fresh interpreter per measurement, so imports are not cached
+WORKER_BOOT = """
+import asyncio, json, time
+started = time.perf_counter()
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+statements = []
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+from app.main import app
+imported = time.perf_counter()
+async def boot():
+    async with app.router.lifespan_context(app):
+        return time.perf_counter()
+ready = asyncio.run(boot())
+print(json.dumps({"import_ms": (imported - started) * 1000,
+                  "startup_ms": (ready - imported) * 1000,
+                  "statements": len(statements)}))
+"""
+
+# What app.main ran on import and at startup before migrations existed
+LEGACY_BOOT = """
+import json, time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.database import Base, engine
+from app.init_db import init_sample_data
+statements = []
+event.listen(Engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+started = time.perf_counter()
+Base.metadata.create_all(bind=engine)
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+init_sample_data()
+print(json.dumps({"startup_ms": (time.perf_counter() - started) * 1000,
+                  "statements": len(statements)}))
+"""
+
+SCHEMA_DIFF = """
+import json
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from app.database import Base, engine
+import app.models
+with engine.connect() as connection:
+    diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+print(json.dumps([str(change) for change in diff]))
+"""
+
+
+def run_python(code: str, database_url: str) -> str:
+    """Run a snippet in a fresh interpreter against a database; return its last line."""
+    env = dict(os.environ, DATABASE_URL=database_url, SLOT_HORIZON="off")
+    completed = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+    )
+    return completed.stdout.strip().splitlines()[-1]
+
+
+def migrate(database_url: str) -> None:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    subprocess.run(
+        [sys.executable, "-m", "app.migrate"], env=env, check=True, capture_output=True
+    )
+
+
+def median_of(runs: List[Dict[str, float]], key: str) -> float:
+    return statistics.median(run[key] for run in runs)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-statements", type=int, default=5,
+                        help="Most SQL statements a worker boot may execute")
+    args = parser.parse_args()
+
+    from app.migrate import SCHEMA_REVISION, head_revision
+
+    failures = []
+    if head_revision() != SCHEMA_REVISION:
+        failures.append(f"SCHEMA_REVISION {SCHEMA_REVISION} is not the head {head_revision()}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        migrated_url = f"sqlite:///{os.path.join(workdir, 'migrated.db')}"
+        legacy_url = f"sqlite:///{os.path.join(workdir, 'legacy.db')}"
+
+        migrate(migrated_url)
+        # A database as create_all built it, adopted by the first migration
+        run_python(LEGACY_BOOT, legacy_url)
+        migrate(legacy_url)
+        for name, url in (("migrated", migrated_url), ("adopted legacy", legacy_url)):
+            diff = json.loads(run_python(SCHEMA_DIFF, url))
+            if diff:
+                failures.append(f"{name} schema differs from the models: {diff}")
+
+        boots = [json.loads(run_python(WORKER_BOOT, migrated_url)) for _ in range(args.runs)]
+        legacy = [json.loads(run_python(LEGACY_BOOT, migrated_url)) for _ in range(args.runs)]
+
+    print(f"worker boot, median of {args.runs} fresh processes:")
+    print(f"  import + create app {median_of(boots, 'import_ms'):8.1f} ms")
+    print(f"  lifespan startup    {median_of(boots, 'startup_ms'):8.1f} ms"
+          f"   {max(run['statements'] for run in boots)} SQL statements")
+    print(f"schema work each boot used to repeat (now in python -m app.migrate):")
+    print(f"  create_all + probe  {median_of(legacy, 'startup_ms'):8.1f} ms"
+          f"   {max(run['statements'] for run in legacy)} SQL statements")
+
+    statements = max(run["statements"] for run in boots)
+    if statements > args.max_statements:
+        failures.append(f"worker boot ran {statements} SQL statements")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: migrations match the models and workers boot without schema work")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Multi-Worker Scaling Benchmark.
+
+Starts the production server (``python -m app --workers N``) on a scratch
+database for each worker count, drives it over real HTTP keep-alive
+connections from several client processes with a read-heavy mix
+(availability searches and booking lookups) and reports requests per second
+and the scaling efficiency against one worker.
+
+With more than one worker it also checks cross-worker invalidation: it warms
+the availability cache of every worker, fills a slot through the API and then
+checks that no worker still serves the slot as available once the poll
+interval has passed.
+
+It exits non-zero if a worker serves a stale slot, or if throughput scales
+worse than ``--min-efficiency`` for worker counts the machine has cores for
+(counts above the core count are reported but not judged). Clients need spare
+cores too, so run it on a machine with roughly twice as many cores as workers.
+
+Usage:
+    python -m benchmarks.worker_scaling [--workers 1,2,4] [--clients 8]
+        [--duration 5] [--min-efficiency 0.7]
+
+Author: AI Assistant
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time as timer
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+from urllib.parse import urlencode
+
+PREFIX = "/api/ConsumerApi/v1/Restaurant/TheHungryUnicorn"
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+HOST = "127.0.0.1"
+POLL_SECONDS = 0.2
+
+
+def request(
+    connection: http.client.HTTPConnection, method: str, path: str, form: Dict = None
+) -> Tuple[int, bytes]:
+    """Send one request on a connection and read the whole response."""
+    if form is None:
+        connection.request(method, path)
+    else:
+        connection.request(method, path, body=urlencode(form), headers=FORM_HEADERS)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def search_form(day: date) -> Dict:
+    return {"VisitDate": day.isoformat(), "PartySize": 2, "ChannelCode": "ONLINE"}
+
+
+def client(port: int, duration: float, references: List[str], seed: int, results) -> None:
+    """Run the request mix on one keep-alive connection for ``duration`` seconds."""
+    rng = random.Random(seed)
+    connection = http.client.HTTPConnection(HOST, port)
+    done = errors = 0
+    deadline = timer.perf_counter() + duration
+    while timer.perf_counter() < deadline:
+        if rng.random() < 0.8:
+            day = date.today() + timedelta(days=rng.randrange(1, 28))
+            status, _ = request(
+                connection, "POST", f"{PREFIX}/AvailabilitySearch", search_form(day)
+            )
+        else:
+            status, _ = request(connection, "GET", f"{PREFIX}/Booking/{rng.choice(references)}")
+        done += 1
+        errors += status != 200
+    connection.close()
+    results.put((done, errors))
+
+
+def start_server(workers: int, port: int, database_url: str) -> subprocess.Popen:
+    """Start the production server and wait until it answers."""
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        SLOT_HORIZON="off",
+        INVALIDATION_POLL_SECONDS=str(POLL_SECONDS),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app", "--workers", str(workers), "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = timer.monotonic() + 60
+    while timer.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection(HOST, port, timeout=1)
+            if request(connection, "GET", "/")[0] == 200:
+                connection.close()
+                # Every worker must be up before measuring
+                timer.sleep(1 + workers * 0.5)
+                return server
+        except OSError:
+            timer.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def create_bookings(port: int, count: int) -> List[str]:
+    """Create a few bookings to look up, on whichever slots have room."""
+    connection = http.client.HTTPConnection(HOST, port)
+    references = []
+    for day in range(1, 28):
+        visit_date = date.today() + timedelta(days=day)
+        status, body = request(
+            connection, "POST", f"{PREFIX}/AvailabilitySearch", search_form(visit_date)
+        )
+        for slot in json.loads(body)["available_slots"]:
+            if not slot["available"] or len(references) >= count:
+                continue
+            status, body = request(connection, "POST", f"{PREFIX}/BookingWithStripeToken", {
+                "VisitDate": visit_date.isoformat(), "VisitTime": slot["time"],
+                "PartySize": 2, "ChannelCode": "ONLINE",
+            })
+            if status == 200:
+                references.append(json.loads(body)["booking_reference"])
+    connection.close()
+    return references
+
+
+def measure(port: int, clients: int, duration: float, references: List[str]) -> Tuple[float, int]:
+    """Run the clients in parallel; return requests per second and errors."""
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client, args=(port, duration, references, n, results))
+        for n in range(clients)
+    ]
+    started = timer.perf_counter()
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = timer.perf_counter() - started
+    return sum(done for done, _ in totals) / elapsed, sum(errors for _, errors in totals)
+
+
+def stale_searches(port: int, workers: int) -> int:
+    """Fill a cached slot through one worker; count searches still offering it."""
+    visit_date = date.today() + timedelta(days=29)
+    probes = 10 * workers
+
+    def search() -> List[Dict]:
+        # A new connection per probe lands on any worker
+        connection = http.client.HTTPConnection(HOST, port)
+        _, body = request(
+            connection, "POST", f"{PREFIX}/AvailabilitySearch", search_form(visit_date)
+        )
+        connection.close()
+        return json.loads(body)["available_slots"]
+
+    slot_time = next(slot["time"] for slot in search() if slot["available"])
+    for _ in range(probes):
+        search()
+
+    connection = http.client.HTTPConnection(HOST, port)
+    while request(connection, "POST", f"{PREFIX}/BookingWithStripeToken", {
+        "VisitDate": visit_date.isoformat(), "VisitTime": slot_time,
+        "PartySize": 2, "ChannelCode": "ONLINE",
+    })[0] == 200:
+        pass
+    connection.close()
+
+    timer.sleep(POLL_SECONDS * 5)
+    return sum(
+        1
+        for _ in range(probes)
+        for slot in search()
+        if slot["time"] == slot_time and slot["available"]
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", default="1,2,4",
+                        help="Comma-separated worker counts; the first is the baseline")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--min-efficiency", type=float, default=0.7)
+    parser.add_argument("--port", type=int, default=8561)
+    args = parser.parse_args()
+
+    counts = [int(count) for count in args.workers.split(",")]
+    cores = os.cpu_count() or 1
+    throughput: Dict[int, float] = {}
+    failures = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for workers in counts:
+            database_url = f"sqlite:///{os.path.join(workdir, f'workers{workers}.db')}"
+            server = start_server(workers, args.port, database_url)
+            try:
+                references = create_bookings(args.port, 50)
+                throughput[workers], errors = measure(
+                    args.port, args.clients, args.duration, references
+                )
+                if errors:
+                    failures.append(f"{workers} workers: {errors} failed requests")
+                if workers > 1:
+                    stale = stale_searches(args.port, workers)
+                    if stale:
+                        failures.append(f"{workers} workers: {stale} searches served a full slot")
+            finally:
+                stop_server(server)
+
+    baseline = counts[0]
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'efficiency':>11}")
+    for workers in counts:
+        speedup = throughput[workers] / throughput[baseline]
+        efficiency = speedup / (workers / baseline)
+        judged = workers <= cores
+        note = "" if judged else f"  (not judged: {cores} core(s))"
+        print(f"{workers:>8} {throughput[workers]:>10.1f} {speedup:>8.2f} {efficiency:>11.2f}{note}")
+        if judged and efficiency < args.min_efficiency:
+            failures.append(f"{workers} workers: efficiency {efficiency:.2f}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        return 1
+    print("OK: workers scale and share cache invalidations")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Booking Race Test.
+
+Many guests booking the last table of a slot at once, through the app: exactly
+one of them may get it, and the slot's counters must still match its
+bookings. A smaller, per-test version of ``benchmarks.booking_race``.
+
+Author: AI Assistant
+"""
+
+import asyncio
+import dataclasses
+from datetime import date, time, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.config import Settings
+from app.main import create_app
+
+RESTAURANT_NAME = "TheHungryUnicorn"
+PREFIX = f"/api/ConsumerApi/v1/Restaurant/{RESTAURANT_NAME}"
+# Past the 30 days of sample slots
+VISIT_DATE = date.today() + timedelta(days=40)
+VISIT_TIME = time(19, 0)
+TABLE_CAPACITY = 3
+CONTENDERS = 40
+
+
+def booking_form(email: str) -> dict:
+    return {
+        "VisitDate": VISIT_DATE.isoformat(), "VisitTime": VISIT_TIME.strftime("%H:%M:%S"),
+        "PartySize": 2, "ChannelCode": "ONLINE", "Customer[Email]": email,
+    }
+
+
+async def race(settings: Settings):
+    """Fill all but one table, then book the last one concurrently."""
+    from app.capacity import find_counter_drift
+    from app.database import get_engine
+    from app.models import AvailabilitySlot, Booking, Restaurant
+
+    app = create_app(settings, migrate=True)
+    async with app.router.lifespan_context(app):
+        with get_engine().begin() as connection:
+            restaurant_id = connection.scalar(
+                select(Restaurant.id).where(Restaurant.name == RESTAURANT_NAME)
+            )
+            connection.execute(insert(AvailabilitySlot), [{
+                "restaurant_id": restaurant_id, "date": VISIT_DATE, "time": VISIT_TIME,
+                "max_party_size": 8, "available": True, "table_capacity": TABLE_CAPACITY,
+            }])
+
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://race") as client:
+            for n in range(TABLE_CAPACITY - 1):
+                response = await client.post(
+                    f"{PREFIX}/BookingWithStripeToken", data=booking_form(f"early{n}@example.com")
+                )
+                assert response.status_code == 200, response.text
+            responses = await asyncio.gather(*(
+                client.post(
+                    f"{PREFIX}/BookingWithStripeToken", data=booking_form(f"racer{n}@example.com")
+                )
+                for n in range(CONTENDERS)
+            ))
+
+        with get_engine().connect() as connection:
+            slot = connection.execute(
+                select(AvailabilitySlot.booked_tables, AvailabilitySlot.booked_covers,
+                       AvailabilitySlot.covers_capacity)
+                .where(AvailabilitySlot.date == VISIT_DATE, AvailabilitySlot.time == VISIT_TIME)
+            ).one()
+            confirmed = connection.scalar(
+                select(func.count()).select_from(Booking).where(
+                    Booking.visit_date == VISIT_DATE,
+                    Booking.visit_time == VISIT_TIME,
+                    Booking.status == "confirmed"
+                )
+            )
+            drift = find_counter_drift(connection)
+    return [response.status_code for response in responses], slot, confirmed, drift
+
+
+@pytest.mark.parametrize("write_queue", [False, True], ids=["per-request", "write-queue"])
+def test_last_table_goes_to_exactly_one_booking(tmp_path, write_queue):
+    settings = dataclasses.replace(
+        Settings.from_env(),
+        database_url=f"sqlite:///{tmp_path / 'race.db'}",
+        sqlite_profile="production",
+        slot_horizon_enabled=False,
+        write_queue_enabled=write_queue,
+    )
+    statuses, slot, confirmed, drift = asyncio.run(race(settings))
+
+    assert statuses.count(200) == 1
+    # The others are told the slot is no longer available, not a server error
+    assert statuses.count(400) == CONTENDERS - 1, statuses
+    assert slot.booked_tables == confirmed == TABLE_CAPACITY
+    assert slot.booked_covers <= slot.covers_capacity
+    assert drift == []
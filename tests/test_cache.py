@@ -0,0 +1,36 @@
+"""
+Availability Cache Tests.
+
+Author: AI Assistant
+"""
+
+from datetime import date
+
+from app.cache import AvailabilityCache
+
+DAY = date(2030, 1, 1)
+
+
+def test_result_read_before_an_invalidation_is_not_stored():
+    cache = AvailabilityCache()
+    generation = cache.generation(1, DAY)
+    # A booking commits and invalidates the date while the search queries
+    cache.invalidate(1, DAY)
+    cache.set(1, DAY, 2, ["stale"], generation)
+    assert cache.get(1, DAY, 2) is None
+
+    cache.set(1, DAY, 2, ["fresh"], cache.generation(1, DAY))
+    assert cache.get(1, DAY, 2) == ["fresh"]
+
+
+def test_invalidation_of_another_date_or_a_clear():
+    cache = AvailabilityCache()
+    generation = cache.generation(1, DAY)
+    cache.invalidate(2, DAY)
+    cache.set(1, DAY, 2, ["kept"], generation)
+    assert cache.get(1, DAY, 2) == ["kept"]
+
+    generation = cache.generation(1, DAY)
+    cache.clear()
+    cache.set(1, DAY, 4, ["stale"], generation)
+    assert cache.get(1, DAY, 4) is None
@@ -0,0 +1,19 @@
+"""
+Import-Time Budget Test.
+
+Runs ``benchmarks.import_time`` under pytest: each entry point is imported in
+fresh interpreters, so ``import app.main`` must stay within its budget and
+load FastAPI, SQLAlchemy and pydantic lazily whatever the test run imported.
+
+Author: AI Assistant
+"""
+
+import statistics
+
+from benchmarks.import_time import IMPORT_BUDGET_MS, check_import_times, total_ms
+
+
+def test_imports_stay_within_budget():
+    results, failures = check_import_times(runs=3)
+    assert statistics.median(map(total_ms, results["import app.main"])) <= IMPORT_BUDGET_MS
+    assert failures == []
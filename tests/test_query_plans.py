@@ -0,0 +1,16 @@
+"""
+Query Plan Regression Test.
+
+Runs ``benchmarks.query_plans`` under pytest, so a hot query that falls back
+to a full table scan or a temporary sort fails the test suite.
+
+Author: AI Assistant
+"""
+
+from benchmarks.query_plans import check_query_plans
+
+
+def test_hot_paths_use_an_index():
+    checked, failures = check_query_plans()
+    assert checked > 0
+    assert failures == []
@@ -0,0 +1,69 @@
+"""
+Booking Reference Tests.
+
+References are the only thing needed to read or cancel a booking, so the
+references issued so far must not reveal the next ones. The uniqueness
+checks are a smaller run of ``benchmarks.reference_collisions``.
+
+Author: AI Assistant
+"""
+
+import pytest
+
+from app.config import settings
+from app.references import ALPHABET, BASE, SPACE, decode_reference, encode_reference
+
+SAMPLE = 2000
+# Sequence numbers encoded by the collision check, from the start and the end
+# of the reference space
+COLLISION_COUNT = 20_000
+
+
+@pytest.fixture
+def secret(monkeypatch):
+    monkeypatch.setattr(settings, "booking_reference_secret", "test-secret-7f3a9c")
+
+
+def scrambled(reference: str) -> int:
+    """The permuted value behind a reference (its payload read as base 36)."""
+    value = 0
+    for char in reversed(reference[:-1]):
+        value = value * BASE + ALPHABET.index(char)
+    return value
+
+
+def test_consecutive_references_do_not_predict_the_next(secret):
+    values = [scrambled(encode_reference(n)) for n in range(SAMPLE)]
+    # An affine map gives a constant step: two references reveal the rest
+    steps = {(b - a) % SPACE for a, b in zip(values, values[1:])}
+    assert len(steps) > SAMPLE * 0.99
+    predicted = sum(
+        (2 * b - a) % SPACE == c for a, b, c in zip(values, values[1:], values[2:])
+    )
+    assert predicted == 0
+
+
+def test_references_depend_on_the_secret(secret, monkeypatch):
+    with_secret = [encode_reference(n) for n in range(SAMPLE)]
+    monkeypatch.setattr(settings, "booking_reference_secret", "another-secret")
+    with_other = [encode_reference(n) for n in range(SAMPLE)]
+    assert sum(a == b for a, b in zip(with_secret, with_other)) == 0
+    assert all(decode_reference(reference) == n for n, reference in enumerate(with_other))
+
+
+@pytest.mark.parametrize("start", [0, SPACE - COLLISION_COUNT])
+def test_references_are_unique_and_decode(secret, start):
+    numbers = range(start, start + COLLISION_COUNT)
+    references = [encode_reference(n) for n in numbers]
+    assert len(set(references)) == COLLISION_COUNT
+    assert {len(reference) for reference in references} == {7}
+    assert [decode_reference(reference) for reference in references] == list(numbers)
+
+
+def test_single_character_typos_are_detected(secret):
+    for n in range(100):
+        reference = encode_reference(n)
+        for position in range(len(reference)):
+            for char in ALPHABET.replace(reference[position], ""):
+                typo = reference[:position] + char + reference[position + 1:]
+                assert decode_reference(typo) is None, typo